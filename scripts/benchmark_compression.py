@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the throughput and ratio of the codecs of the results backend on result
+sets serialized the way SQL Lab stores them.
+
+    python scripts/benchmark_compression.py --rows 100000 --columns 20
+"""
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import simplejson as json
+
+from superset.utils.compression import compress, decompress
+
+
+def build_df(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    words = np.array(["foo", "bar", "baz", "qux", "quux"], dtype=object)
+    generators: List[Callable[[], Any]] = [
+        lambda: rng.integers(0, 1000, rows),
+        lambda: rng.random(rows),
+        lambda: rng.choice(words, rows),
+        lambda: pd.date_range("2020-01-01", periods=rows, freq="s"),
+        lambda: np.arange(rows),
+    ]
+    return pd.DataFrame(
+        {f"col_{i}": generators[i % len(generators)]() for i in range(columns)}
+    )
+
+
+def serialize(df: pd.DataFrame, use_msgpack: bool) -> bytes:
+    if use_msgpack:
+        return (
+            pa.default_serialization_context()
+            .serialize(pa.Table.from_pandas(df))
+            .to_buffer()
+            .to_pybytes()
+        )
+    return json.dumps(
+        df.to_dict(orient="records"), default=str, ignore_nan=True
+    ).encode("utf-8")
+
+
+def timeit(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rows", default=100_000, help="Number of rows in the result set.")
+@click.option("--columns", default=20, help="Number of columns in the result set.")
+@click.option("--json", "use_json", is_flag=True, help="Serialize results as JSON.")
+@click.option("--level", type=int, help="Compression level of the codecs.")
+def main(rows: int, columns: int, use_json: bool, level: Optional[int]) -> None:
+    data = serialize(build_df(rows, columns), use_msgpack=not use_json)
+    size = len(data) / 1024**2
+    print(f"Compressing {rows} rows ({columns} columns): {size:.1f} MiB")
+    print(f"{'codec':<6} {'ratio':>6} {'compress':>14} {'decompress':>14}")
+
+    for codec in ("zlib", "lz4", "zstd"):
+        blob, compress_time = timeit(compress, data, codec=codec, level=level)
+        result, decompress_time = timeit(decompress, blob, decode=False)
+        assert result == data
+        print(
+            f"{codec:<6} {len(data) / len(blob):>6.1f} "
+            f"{size / compress_time:>9.0f} MiB/s "
+            f"{size / decompress_time:>9.0f} MiB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,83 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the vectorized CSV-injection escaping in ``superset.utils.csv`` against
+the original cell-by-cell implementation.
+
+    python scripts/benchmark_csv_escaping.py --rows 1000000
+"""
+import time
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.utils import csv
+
+
+def legacy_escape_df(df: pd.DataFrame) -> pd.DataFrame:
+    escape_values = lambda v: csv.escape_value(v) if isinstance(v, str) else v
+    df = df.rename(columns=escape_values)
+    for name, column in df.items():
+        if column.dtype == np.dtype(object):
+            for idx, value in enumerate(column.values):
+                if isinstance(value, str):
+                    df.at[idx, name] = csv.escape_value(value)
+    return df
+
+
+def build_df(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    # mostly regular values, with ~2% of them needing escaping
+    words = np.array(["foo", "bar", "baz", "-10", "=SUM(A1)", "@user", " =cmd|x"])
+    weights = [0.33, 0.33, 0.22, 0.1, 0.01, 0.005, 0.005]
+    return pd.DataFrame(
+        {
+            "name": rng.choice(words, rows, p=weights).astype(object),
+            "city": rng.choice(words, rows, p=weights).astype(object),
+            "num": rng.random(rows),
+            "cnt": rng.integers(0, 1000, rows),
+        }
+    )
+
+
+def timeit(func: Callable[..., Any], *args: Any) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, help="Number of rows in the DataFrame.")
+@click.option("--skip-legacy", is_flag=True, help="Only time the new implementation.")
+def main(rows: int, skip_legacy: bool = False) -> None:
+    df = build_df(rows)
+    print(f"Escaping {rows} rows ({len(df.columns)} columns)")
+
+    vectorized = timeit(csv.escape_df, df)
+    print(f"vectorized: {vectorized:.2f}s")
+
+    if not skip_legacy:
+        legacy = timeit(legacy_escape_df, df)
+        print(f"legacy:     {legacy:.2f}s ({legacy / vectorized:.1f}x slower)")
+        pd.testing.assert_frame_equal(csv.escape_df(df), legacy_escape_df(df))
+
+
+if __name__ == "__main__":
+    # pylint: disable=no-value-for-parameter
+    main()
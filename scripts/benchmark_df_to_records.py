@@ -0,0 +1,81 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the column oriented ``superset.dataframe.df_to_records`` against the
+original cell-by-cell implementation.
+
+    python scripts/benchmark_df_to_records.py --rows 100000 --columns 50
+"""
+import time
+from typing import Any, Callable, Dict, List
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset import dataframe
+
+
+def legacy_df_to_records(dframe: pd.DataFrame) -> List[Dict[str, Any]]:
+    columns = dframe.columns
+    return list(
+        dict(zip(columns, map(dataframe._convert_big_integers, row)))
+        for row in zip(*[dframe[col] for col in columns])
+    )
+
+
+def build_df(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    words = np.array(["foo", "bar", "baz", "qux"], dtype=object)
+    generators: List[Callable[[], Any]] = [
+        lambda: rng.integers(0, 1000, rows),
+        lambda: rng.random(rows),
+        lambda: rng.choice(words, rows),
+        lambda: pd.date_range("2020-01-01", periods=rows, freq="s"),
+        # ~1% of the values are larger than the largest integer of JavaScript
+        lambda: np.where(rng.random(rows) < 0.01, 2**60, rng.integers(0, 1000, rows)),
+    ]
+    return pd.DataFrame(
+        {f"col_{i}": generators[i % len(generators)]() for i in range(columns)}
+    )
+
+
+def timeit(func: Callable[..., Any], *args: Any) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rows", default=100_000, help="Number of rows in the DataFrame.")
+@click.option("--columns", default=50, help="Number of columns in the DataFrame.")
+@click.option("--skip-legacy", is_flag=True, help="Only time the new implementation.")
+def main(rows: int, columns: int, skip_legacy: bool = False) -> None:
+    df = build_df(rows, columns)
+    print(f"Converting {rows} rows ({columns} columns)")
+
+    columnar = timeit(dataframe.df_to_records, df)
+    print(f"columnar: {columnar:.2f}s")
+
+    if not skip_legacy:
+        legacy = timeit(legacy_df_to_records, df)
+        print(f"legacy:   {legacy:.2f}s ({legacy / columnar:.1f}x slower)")
+        assert dataframe.df_to_records(df) == legacy_df_to_records(df)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
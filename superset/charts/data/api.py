@@ -367,7 +367,31 @@ class ChartDataRestApi(ChartRestApi):
                 mimetype="application/zip",
             )
 
-        if result_format == ChartDataResultFormat.JSON:
+        if result_format == ChartDataResultFormat.ARROW:
+            if not result["queries"]:
+                return self.response_400(_("Empty query result"))
+
+            if len(result["queries"]) == 1:
+                return Response(
+                    result["queries"][0]["data"],
+                    mimetype="application/vnd.apache.arrow.stream",
+                )
+
+            # return multi-query arrow results bundled as a zip file
+            files = {
+                f"query_{idx + 1}.arrow": result["data"]
+                for idx, result in enumerate(result["queries"])
+            }
+            return Response(
+                create_zip(files),
+                headers=generate_download_headers("zip"),
+                mimetype="application/zip",
+            )
+
+        if result_format in (
+            ChartDataResultFormat.JSON,
+            ChartDataResultFormat.JSON_COLUMNAR,
+        ):
             response_data = simplejson.dumps(
                 {"result": result["queries"]},
                 default=json_int_dttm_ser,
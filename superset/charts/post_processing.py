@@ -324,7 +324,10 @@ def apply_post_process(
     post_processor = post_processors[viz_type]
 
     for query in result["queries"]:
-        if query["result_format"] not in (rf.value for rf in ChartDataResultFormat):
+        if query["result_format"] not in (
+            ChartDataResultFormat.JSON,
+            ChartDataResultFormat.CSV,
+        ):
             raise Exception(f"Result format {query['result_format']} not supported")
 
         if not query["data"]:
@@ -1277,6 +1277,11 @@ class ChartDataResponseResult(Schema):
         required=True,
         allow_none=None,
     )
+    is_stale = fields.Boolean(
+        description="Is the cached result past its cache timeout, and being "
+        "refreshed in the background",
+        allow_none=True,
+    )
     query = fields.String(
         description="The executed query statement",
         required=True,
@@ -1322,6 +1327,12 @@ class ChartDataResponseResult(Schema):
     to_dttm = fields.Integer(
         desciption="End timestamp of time range", required=False, allow_none=True
     )
+    timing = fields.Dict(
+        keys=fields.String(),
+        values=fields.Float(),
+        description="Time in milliseconds the query waited for a worker "
+        "(`queued_ms`) and took to run (`duration_ms`)",
+    )
 
 
 class ChartDataResponseSchema(Schema):
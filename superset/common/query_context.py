@@ -88,7 +88,7 @@ class QueryContext:
     def get_data(
         self,
         df: pd.DataFrame,
-    ) -> Union[str, List[Dict[str, Any]]]:
+    ) -> Union[str, bytes, List[Dict[str, Any]], Dict[str, List[Any]]]:
         return self._processor.get_data(df)
 
     def get_payload(
@@ -19,7 +19,9 @@ from __future__ import annotations
 import copy
 import logging
 import re
-from typing import Any, ClassVar, Dict, List, Optional, TYPE_CHECKING, Union
+from functools import partial
+from timeit import default_timer
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import numpy as np
 import pandas as pd
@@ -37,16 +39,18 @@ from superset.common.utils import dataframe_utils
 from superset.common.utils.query_cache_manager import QueryCacheManager
 from superset.connectors.base.models import BaseDatasource
 from superset.constants import CacheRegion
+from superset.dataframe import df_to_arrow_stream, df_to_columns
 from superset.exceptions import (
     InvalidPostProcessingError,
     QueryObjectValidationError,
     SupersetException,
 )
-from superset.extensions import cache_manager, security_manager
+from superset.extensions import cache_manager, db, security_manager
 from superset.models.helpers import QueryResult
 from superset.models.sql_lab import Query
 from superset.utils import csv
 from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.concurrency import run_concurrently, runs_concurrently
 from superset.utils.core import (
     DatasourceType,
     DateColumn,
@@ -56,6 +60,7 @@ from superset.utils.core import (
     get_column_names_from_columns,
     get_column_names_from_metrics,
     get_metric_names,
+    get_user_id,
     normalize_dttm_col,
     TIME_COMPARISON,
 )
@@ -112,39 +117,22 @@ class QueryContextProcessor:
         )
 
         if query_obj and cache_key and not cache.is_loaded:
-            try:
-                invalid_columns = [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]
-
-                if invalid_columns:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in datasource: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
-                        )
-                    )
-
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
-                    key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=self._query_context.force,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
-                    region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+            # concurrent requests for the same result wait for it to be loaded
+            with QueryCacheManager.single_flight(
+                cache_key, CacheRegion.DATA, self._query_context.force
+            ) as loaded_cache:
+                if loaded_cache:
+                    cache = loaded_cache
+                else:
+                    self._load_query_result(query_obj, cache_key, cache)
+        elif query_obj and cache_key and cache.is_stale:
+            if security_manager.is_guest_user():
+                # the roles and RLS filters of guest users only exist in their token,
+                # so the refresh task can't run as them: refresh in the request
+                cache = QueryCacheManager()
+                self._load_query_result(query_obj, cache_key, cache)
+            else:
+                self._refresh_stale_result(cache_key)
 
         # the N-dimensional DataFrame has converteds into flat DataFrame
         # by `flatten operator`, "comma" in the column is escaped by `escape_separator`
@@ -153,9 +141,11 @@ class QueryContextProcessor:
             unescape_separator(col): [
                 unescape_separator(col) for col in re.split(r"(?<!\\),\s", col)
             ]
-            for col in cache.df.columns.values
+            for col in cache.colnames
         }
-        cache.df.columns = [unescape_separator(col) for col in cache.df.columns.values]
+        colnames = [unescape_separator(col) for col in cache.colnames]
+        if colnames != cache.colnames:
+            cache.df.columns = colnames
 
         return {
             "cache_key": cache_key,
@@ -166,15 +156,85 @@ class QueryContextProcessor:
             "annotation_data": cache.annotation_data,
             "error": cache.error_message,
             "is_cached": cache.is_cached,
+            "is_stale": cache.is_stale,
             "query": cache.query,
             "status": cache.status,
             "stacktrace": cache.stacktrace,
-            "rowcount": len(cache.df.index),
+            "rowcount": cache.rowcount,
             "from_dttm": query_obj.from_dttm,
             "to_dttm": query_obj.to_dttm,
             "label_map": label_map,
         }
 
+    def _load_query_result(
+        self, query_obj: QueryObject, cache_key: str, cache: QueryCacheManager
+    ) -> None:
+        """Runs the query of a query object and caches its result"""
+        try:
+            invalid_columns = [
+                col
+                for col in get_column_names_from_columns(query_obj.columns)
+                + get_column_names_from_metrics(query_obj.metrics or [])
+                if (col not in self._qc_datasource.column_names and col != DTTM_ALIAS)
+            ]
+
+            if invalid_columns:
+                raise QueryObjectValidationError(
+                    _(
+                        "Columns missing in datasource: %(invalid_columns)s",
+                        invalid_columns=invalid_columns,
+                    )
+                )
+
+            query_result = self.get_query_result(query_obj)
+            annotation_data = self.get_annotation_data(query_obj)
+            cache.set_query_result(
+                key=cache_key,
+                query_result=query_result,
+                annotation_data=annotation_data,
+                force_query=self._query_context.force,
+                timeout=self.get_cache_timeout(),
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+            )
+        except QueryObjectValidationError as ex:
+            cache.error_message = str(ex)
+            cache.status = QueryStatus.FAILED
+
+    def _refresh_stale_result(self, cache_key: str) -> None:
+        """Enqueues the refresh of a stale query result, unless it's already enqueued"""
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import load_chart_data_into_cache
+
+        refresh_key = f"{cache_key}__refresh"
+        # the key is deleted once refreshed, the timeout covers failed workers
+        if not QueryCacheManager.add(
+            refresh_key,
+            True,
+            timeout=config["SQLLAB_ASYNC_TIME_LIMIT_SEC"],
+            region=CacheRegion.DATA,
+        ):
+            return
+
+        logger.info("Refreshing stale cache key: %s", cache_key)
+        stats_logger.incr("refreshing_stale_cache")
+        form_data = {
+            **self._query_context.cache_values,
+            "form_data": self._query_context.form_data,
+            "custom_cache_timeout": self._query_context.custom_cache_timeout,
+            "force": True,
+        }
+        try:
+            load_chart_data_into_cache.delay(
+                {"user_id": get_user_id(), "refresh_key": refresh_key}, form_data
+            )
+        except Exception:  # pylint: disable=broad-except
+            # the stale result is served anyway, the next request retries the refresh
+            logger.warning(
+                "Could not refresh stale cache key: %s", cache_key, exc_info=True
+            )
+            QueryCacheManager.delete(refresh_key, region=CacheRegion.DATA)
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> Optional[str]:
         """
         Returns a QueryObject cache key for objects in self.queries
@@ -305,130 +365,195 @@ class QueryContextProcessor:
 
         return df
 
-    def processing_time_offsets(  # pylint: disable=too-many-locals,too-many-statements
+    def processing_time_offsets(
         self,
         df: pd.DataFrame,
         query_object: QueryObject,
     ) -> CachedTimeOffset:
+        """
+        Query the time offsets of a query object and join them onto its dataframe.
+
+        The offsets are looked up in the cache and queried concurrently, on at most
+        ``TIME_OFFSETS_MAX_WORKERS`` worker threads, and are joined once all of them
+        are returned.
+        """
+        time_offsets = query_object.time_offsets
+        if not time_offsets:
+            return CachedTimeOffset(df=df, queries=[], cache_keys=[])
+
+        if not query_object.from_dttm or not query_object.to_dttm:
+            raise QueryObjectValidationError(
+                _(
+                    "An enclosed time range (both start and end) must be specified "
+                    "when using a Time Comparison."
+                )
+            )
+
+        max_workers = config["TIME_OFFSETS_MAX_WORKERS"]
+        concurrent = runs_concurrently(len(time_offsets), max_workers)
+
+        def process_time_offset(offset: str) -> Tuple[pd.DataFrame, str, Optional[str]]:
+            processor, query_obj = self, query_object
+            if concurrent:
+                processor, query_obj = self._copy_to_worker_session(query_object)
+            # pylint: disable=protected-access
+            return processor._process_time_offset(df, query_obj, offset)
+
+        results = run_concurrently(
+            [partial(process_time_offset, offset) for offset in time_offsets],
+            max_workers=max_workers,
+            database_id=self._get_database_id(),
+            max_per_database=config["CHART_DATA_MAX_CONCURRENT_QUERIES_PER_DATABASE"],
+        )
+
+        offset_slices, queries, cache_keys = zip(*results)
+        rv_df = pd.concat([df, *offset_slices], axis=1, copy=False)
+        return CachedTimeOffset(
+            df=rv_df, queries=list(queries), cache_keys=list(cache_keys)
+        )
+
+    def _get_database_id(self) -> Optional[int]:
+        """
+        Return the id of the database of the datasource, loading beforehand the
+        attributes the queries rely on, so that the copies of the datasource made for
+        the worker threads don't need to load them again.
+        """
+        datasource = self._qc_datasource
+        for attr in ("columns", "metrics"):
+            getattr(datasource, attr, None)
+        database = getattr(datasource, "database", None)
+        return database.id if database else None
+
+    def _copy_to_worker_session(
+        self, query_object: QueryObject
+    ) -> Tuple[QueryContextProcessor, QueryObject]:
+        """
+        Copy the query context and a query object to the session of the current
+        worker thread, since the ORM instances they hold are bound to the session of
+        the request, which must not be used by several threads.
+
+        The instances are merged without being loaded again, so that their loaded
+        attributes, eg, the columns of the datasource, are reused.
+
+        :param query_object: The query object
+        :returns: A processor of the copied query context, and the copied query object
+        """
+        query_context = copy.copy(self._query_context)
+        query_context.datasource = db.session.merge(
+            query_context.datasource, load=False
+        )
+        if query_context.slice_:
+            query_context.slice_ = db.session.merge(query_context.slice_, load=False)
+        processor = QueryContextProcessor(query_context)
+        # pylint: disable=protected-access
+        query_context._processor = processor
+
+        query_object = copy.copy(query_object)
+        if query_object.datasource:
+            query_object.datasource = db.session.merge(
+                query_object.datasource, load=False
+            )
+        return processor, query_object
+
+    def _process_time_offset(
+        self,
+        df: pd.DataFrame,
+        query_object: QueryObject,
+        offset: str,
+    ) -> Tuple[pd.DataFrame, str, Optional[str]]:
+        """
+        Query a time offset of a query object, or load it from the cache.
+
+        :returns: The offset metrics aligned with the rows of the dataframe, the
+            query and, if loaded from the cache, the cache key
+        """
         query_context = self._query_context
         # ensure query_object is immutable
         query_object_clone = copy.copy(query_object)
-        queries: List[str] = []
-        cache_keys: List[Optional[str]] = []
-        rv_dfs: List[pd.DataFrame] = [df]
-
-        time_offsets = query_object.time_offsets
         outer_from_dttm = query_object.from_dttm
         outer_to_dttm = query_object.to_dttm
-        for offset in time_offsets:
-            try:
-                query_object_clone.from_dttm = get_past_or_future(
-                    offset,
-                    outer_from_dttm,
-                )
-                query_object_clone.to_dttm = get_past_or_future(offset, outer_to_dttm)
-            except ValueError as ex:
-                raise QueryObjectValidationError(str(ex)) from ex
-            # make sure subquery use main query where clause
-            query_object_clone.inner_from_dttm = outer_from_dttm
-            query_object_clone.inner_to_dttm = outer_to_dttm
-            query_object_clone.time_offsets = []
-            query_object_clone.post_processing = []
-
-            if not query_object.from_dttm or not query_object.to_dttm:
-                raise QueryObjectValidationError(
-                    _(
-                        "An enclosed time range (both start and end) must be specified "
-                        "when using a Time Comparison."
-                    )
-                )
-            # `offset` is added to the hash function
-            cache_key = self.query_cache_key(query_object_clone, time_offset=offset)
-            cache = QueryCacheManager.get(
-                cache_key, CacheRegion.DATA, query_context.force
+        try:
+            query_object_clone.from_dttm = get_past_or_future(
+                offset,
+                outer_from_dttm,
             )
-            # whether hit on the cache
-            if cache.is_loaded:
-                rv_dfs.append(cache.df)
-                queries.append(cache.query)
-                cache_keys.append(cache_key)
-                continue
-
-            query_object_clone_dct = query_object_clone.to_dict()
-            # rename metrics: SUM(value) => SUM(value) 1 year ago
-            metrics_mapping = {
-                metric: TIME_COMPARISON.join([metric, offset])
-                for metric in get_metric_names(
-                    query_object_clone_dct.get("metrics", [])
-                )
-            }
-            join_keys = [col for col in df.columns if col not in metrics_mapping.keys()]
+            query_object_clone.to_dttm = get_past_or_future(offset, outer_to_dttm)
+        except ValueError as ex:
+            raise QueryObjectValidationError(str(ex)) from ex
+        # make sure subquery use main query where clause
+        query_object_clone.inner_from_dttm = outer_from_dttm
+        query_object_clone.inner_to_dttm = outer_to_dttm
+        query_object_clone.time_offsets = []
+        query_object_clone.post_processing = []
+
+        # `offset` is added to the hash function
+        cache_key = self.query_cache_key(query_object_clone, time_offset=offset)
+        cache = QueryCacheManager.get(cache_key, CacheRegion.DATA, query_context.force)
+        # whether hit on the cache
+        if cache.is_loaded:
+            return cache.df, cache.query, cache_key
+
+        query_object_clone_dct = query_object_clone.to_dict()
+        # rename metrics: SUM(value) => SUM(value) 1 year ago
+        metrics_mapping = {
+            metric: TIME_COMPARISON.join([metric, offset])
+            for metric in get_metric_names(query_object_clone_dct.get("metrics", []))
+        }
+        join_keys = [col for col in df.columns if col not in metrics_mapping.keys()]
 
-            if isinstance(self._qc_datasource, Query):
-                result = self._qc_datasource.exc_query(query_object_clone_dct)
-            else:
-                result = self._qc_datasource.query(query_object_clone_dct)
-
-            queries.append(result.query)
-            cache_keys.append(None)
-
-            offset_metrics_df = result.df
-            if offset_metrics_df.empty:
-                offset_metrics_df = pd.DataFrame(
-                    {
-                        col: [np.NaN]
-                        for col in join_keys + list(metrics_mapping.values())
-                    }
-                )
-            else:
-                # 1. normalize df, set dttm column
-                offset_metrics_df = self.normalize_df(
-                    offset_metrics_df, query_object_clone
-                )
+        if isinstance(self._qc_datasource, Query):
+            result = self._qc_datasource.exc_query(query_object_clone_dct)
+        else:
+            result = self._qc_datasource.query(query_object_clone_dct)
 
-                # 2. rename extra query columns
-                offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
-
-                # 3. set time offset for index
-                index = (get_base_axis_labels(query_object.columns) or [DTTM_ALIAS])[0]
-                if not dataframe_utils.is_datetime_series(offset_metrics_df.get(index)):
-                    raise QueryObjectValidationError(
-                        _(
-                            "A time column must be specified "
-                            "when using a Time Comparison."
-                        )
-                    )
+        offset_metrics_df = result.df
+        if offset_metrics_df.empty:
+            offset_metrics_df = pd.DataFrame(
+                {col: [np.NaN] for col in join_keys + list(metrics_mapping.values())}
+            )
+        else:
+            # 1. normalize df, set dttm column
+            offset_metrics_df = self.normalize_df(offset_metrics_df, query_object_clone)
+
+            # 2. rename extra query columns
+            offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
 
-                offset_metrics_df[index] = offset_metrics_df[index] - DateOffset(
-                    **normalize_time_delta(offset)
+            # 3. set time offset for index
+            index = (get_base_axis_labels(query_object.columns) or [DTTM_ALIAS])[0]
+            if not dataframe_utils.is_datetime_series(offset_metrics_df.get(index)):
+                raise QueryObjectValidationError(
+                    _("A time column must be specified when using a Time Comparison.")
                 )
 
-            # df left join `offset_metrics_df`
-            offset_df = dataframe_utils.left_join_df(
-                left_df=df,
-                right_df=offset_metrics_df,
-                join_keys=join_keys,
-            )
-            offset_slice = offset_df[metrics_mapping.values()]
-
-            # set offset_slice to cache and stack.
-            value = {
-                "df": offset_slice,
-                "query": result.query,
-            }
-            cache.set(
-                key=cache_key,
-                value=value,
-                timeout=self.get_cache_timeout(),
-                datasource_uid=query_context.datasource.uid,
-                region=CacheRegion.DATA,
+            offset_metrics_df[index] = offset_metrics_df[index] - DateOffset(
+                **normalize_time_delta(offset)
             )
-            rv_dfs.append(offset_slice)
 
-        rv_df = pd.concat(rv_dfs, axis=1, copy=False) if time_offsets else df
-        return CachedTimeOffset(df=rv_df, queries=queries, cache_keys=cache_keys)
+        # df left join `offset_metrics_df`
+        offset_df = dataframe_utils.left_join_df(
+            left_df=df,
+            right_df=offset_metrics_df,
+            join_keys=join_keys,
+        )
+        offset_slice = offset_df[metrics_mapping.values()]
+
+        # set offset_slice to cache
+        value = {
+            "df": offset_slice,
+            "query": result.query,
+        }
+        cache.set(
+            key=cache_key,
+            value=value,
+            timeout=self.get_cache_timeout(),
+            datasource_uid=query_context.datasource.uid,
+            region=CacheRegion.DATA,
+        )
+        return offset_slice, result.query, None
 
-    def get_data(self, df: pd.DataFrame) -> Union[str, List[Dict[str, Any]]]:
+    def get_data(
+        self, df: pd.DataFrame
+    ) -> Union[str, bytes, List[Dict[str, Any]], Dict[str, List[Any]]]:
         if self._query_context.result_format == ChartDataResultFormat.CSV:
             include_index = not isinstance(df.index, pd.RangeIndex)
             columns = list(df.columns)
@@ -440,6 +565,12 @@ class QueryContextProcessor:
             )
             return result or ""
 
+        if self._query_context.result_format == ChartDataResultFormat.JSON_COLUMNAR:
+            return df_to_columns(df)
+
+        if self._query_context.result_format == ChartDataResultFormat.ARROW:
+            return df_to_arrow_stream(df)
+
         return df.to_dict(orient="records")
 
     def get_payload(
@@ -449,16 +580,43 @@ class QueryContextProcessor:
     ) -> Dict[str, Any]:
         """Returns the query results with both metadata and data"""
 
-        # Get all the payloads from the QueryObjects
-        query_results = [
-            get_query_results(
-                query_obj.result_type or self._query_context.result_type,
-                self._query_context,
+        # Get all the payloads from the QueryObjects, concurrently if enabled
+        queries = self._query_context.queries
+        max_workers = config["CHART_DATA_QUERIES_MAX_WORKERS"]
+        concurrent = runs_concurrently(len(queries), max_workers)
+        database_id = self._get_database_id() if concurrent else None
+        dispatched_at = default_timer()
+
+        def get_timed_query_results(query_obj: QueryObject) -> Dict[str, Any]:
+            started_at = default_timer()
+            query_context = self._query_context
+            if concurrent:
+                processor, query_obj = self._copy_to_worker_session(query_obj)
+                # pylint: disable=protected-access
+                query_context = processor._query_context
+            query_results = get_query_results(
+                query_obj.result_type or query_context.result_type,
+                query_context,
                 query_obj,
                 force_cached,
             )
-            for query_obj in self._query_context.queries
-        ]
+            # only the full results carry the metadata of the query
+            if "status" in query_results:
+                query_results["timing"] = {
+                    # queries run one after another aren't waiting for a worker
+                    "queued_ms": (started_at - dispatched_at) * 1000.0
+                    if concurrent
+                    else 0.0,
+                    "duration_ms": (default_timer() - started_at) * 1000.0,
+                }
+            return query_results
+
+        query_results = run_concurrently(
+            [partial(get_timed_query_results, query_obj) for query_obj in queries],
+            max_workers=max_workers,
+            database_id=database_id,
+            max_per_database=config["CHART_DATA_MAX_CONCURRENT_QUERIES_PER_DATABASE"],
+        )
         return_value = {"queries": query_results}
 
         if cache_query_context:
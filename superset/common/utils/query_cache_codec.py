@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Arrow IPC codec for DataFrames stored in the query cache.
+
+When ``DATA_CACHE_USE_ARROW`` is enabled the ``df`` entry of a cached query result
+is replaced by an "Arrow envelope": a small dict holding the (optionally
+compressed) Arrow IPC stream along with the row count and column names. The
+envelope is decoded lazily, so callers that only need the shape of a cached result
+never build the DataFrame.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from superset import app
+
+config = app.config
+logger = logging.getLogger(__name__)
+
+ARROW_FORMAT = "arrow-ipc"
+
+
+def is_arrow_envelope(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("format") == ARROW_FORMAT
+
+
+def serialize_df(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Serialize a DataFrame into an Arrow envelope.
+
+    :param df: the DataFrame to serialize
+    :returns: the envelope, or ``None`` if the DataFrame can't be represented in
+        Arrow (eg, duplicate column names or mixed-type object columns), in which
+        case the caller should store the DataFrame as-is
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+        options = pa.ipc.IpcWriteOptions(
+            compression=config["DATA_CACHE_ARROW_COMPRESSION"]
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    except (
+        pa.lib.ArrowInvalid,
+        pa.lib.ArrowTypeError,
+        pa.lib.ArrowNotImplementedError,
+        ValueError,
+    ) as ex:
+        logger.debug("Unable to serialize DataFrame to Arrow: %s", ex)
+        return None
+
+    return {
+        "format": ARROW_FORMAT,
+        "data": sink.getvalue().to_pybytes(),
+        "rowcount": len(df.index),
+        "colnames": list(df.columns),
+    }
+
+
+def deserialize_df(envelope: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame from an Arrow envelope.
+
+    Columns are kept in separate blocks so that the Arrow buffers are reused
+    instead of being copied into a consolidated 2D block.
+    """
+    reader = pa.ipc.open_stream(pa.py_buffer(envelope["data"]))
+    table = reader.read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def envelope_rowcount(envelope: Dict[str, Any]) -> int:
+    return int(envelope["rowcount"])
+
+
+def envelope_colnames(envelope: Dict[str, Any]) -> List[Any]:
+    return list(envelope["colnames"])
+
+
+def encode_cache_value(value: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the DataFrame in a cache value by its Arrow envelope, if the Arrow
+    codec is enabled.
+    """
+    df = value.get("df")
+    if not config["DATA_CACHE_USE_ARROW"] or not isinstance(df, pd.DataFrame):
+        return value
+
+    envelope = serialize_df(df)
+    if envelope is None:
+        return value
+    return {**value, "df": envelope}
@@ -17,20 +17,30 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
 from flask_caching import Cache
 from pandas import DataFrame
 
 from superset import app
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_codec import (
+    deserialize_df,
+    encode_cache_value,
+    envelope_colnames,
+    envelope_rowcount,
+    is_arrow_envelope,
+)
 from superset.constants import CacheRegion
 from superset.exceptions import CacheLoadError
 from superset.extensions import cache_manager
 from superset.models.helpers import QueryResult
 from superset.stats_logger import BaseStatsLogger
-from superset.utils.cache import set_and_log_cache
+from superset.utils.cache import set_and_log_cache, single_flight
 from superset.utils.core import error_msg_from_exception, get_stacktrace
+from superset.utils.decorators import stats_timing
 
 config = app.config
 stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
@@ -59,10 +69,11 @@ class QueryCacheManager:
         is_loaded: bool = False,
         stacktrace: Optional[str] = None,
         is_cached: Optional[bool] = None,
+        is_stale: bool = False,
         cache_dttm: Optional[str] = None,
         cache_value: Optional[Dict[str, Any]] = None,
     ) -> None:
-        self.df = df
+        self._df: Any = df
         self.query = query
         self.annotation_data = {} if annotation_data is None else annotation_data
         self.applied_template_filters = applied_template_filters or []
@@ -72,9 +83,36 @@ class QueryCacheManager:
         self.is_loaded = is_loaded
         self.stacktrace = stacktrace
         self.is_cached = is_cached
+        self.is_stale = is_stale
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
 
+    @property
+    def df(self) -> DataFrame:
+        """
+        The cached DataFrame. Results stored with the Arrow codec are only
+        deserialized the first time the DataFrame is accessed.
+        """
+        if is_arrow_envelope(self._df):
+            self._df = deserialize_df(self._df)
+        return self._df
+
+    @df.setter
+    def df(self, df: DataFrame) -> None:
+        self._df = df
+
+    @property
+    def rowcount(self) -> int:
+        if is_arrow_envelope(self._df):
+            return envelope_rowcount(self._df)
+        return len(self._df.index)
+
+    @property
+    def colnames(self) -> List[Any]:
+        if is_arrow_envelope(self._df):
+            return envelope_colnames(self._df)
+        return list(self._df.columns)
+
     # pylint: disable=too-many-arguments
     def set_query_result(
         self,
@@ -109,6 +147,11 @@ class QueryCacheManager:
                 "applied_template_filters": self.applied_template_filters,
                 "annotation_data": self.annotation_data,
             }
+            stale_timeout = config["DATA_CACHE_STALE_TIMEOUT"]
+            if stale_timeout and timeout and region == CacheRegion.DATA:
+                # keep the result past its timeout, to serve it while it's refreshed
+                value["stale_after"] = time.time() + timeout
+                timeout += stale_timeout
             if self.is_loaded and key and self.status != QueryStatus.FAILED:
                 self.set(
                     key=key,
@@ -156,6 +199,8 @@ class QueryCacheManager:
                 query_cache.cache_dttm = (
                     cache_value["dttm"] if cache_value is not None else None
                 )
+                stale_after = cache_value.get("stale_after")
+                query_cache.is_stale = bool(stale_after and time.time() >= stale_after)
                 query_cache.cache_value = cache_value
                 stats_logger.incr("loaded_from_cache")
             except KeyError as ex:
@@ -174,6 +219,32 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @classmethod
+    @contextmanager
+    def single_flight(
+        cls,
+        key: str,
+        region: CacheRegion = CacheRegion.DEFAULT,
+        force_query: Optional[bool] = False,
+    ) -> Iterator[Optional["QueryCacheManager"]]:
+        """
+        Make sure a single worker loads a missing query result at a time, proxy for
+        `single_flight`.
+
+        Yields the query cache once it's been loaded by another worker, or ``None``
+        when the caller should load the query result and set it.
+        """
+        if force_query:
+            yield None
+            return
+
+        def load() -> Optional["QueryCacheManager"]:
+            query_cache = cls.get(key, region)
+            return query_cache if query_cache.is_loaded else None
+
+        with single_flight(_cache[region], key, load) as query_cache:
+            yield query_cache
+
     @staticmethod
     def set(
         key: Optional[str],
@@ -186,7 +257,25 @@ class QueryCacheManager:
         set value to specify cache region, proxy for `set_and_log_cache`
         """
         if key:
-            set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
+            set_and_log_cache(
+                _cache[region],
+                key,
+                encode_cache_value(value),
+                timeout,
+                datasource_uid,
+            )
+
+    @staticmethod
+    def add(
+        key: str,
+        value: Any,
+        timeout: Optional[int] = None,
+        region: CacheRegion = CacheRegion.DEFAULT,
+    ) -> bool:
+        """
+        Set a value to a cache region unless the key exists, returns whether it was set
+        """
+        return bool(_cache[region].add(key, value, timeout=timeout))
 
     @staticmethod
     def delete(
@@ -201,4 +290,17 @@ class QueryCacheManager:
         key: Optional[str],
         region: CacheRegion = CacheRegion.DEFAULT,
     ) -> bool:
-        return bool(_cache[region].get(key)) if key else False
+        """
+        Check whether a key exists in a cache region without loading its value.
+
+        Backends lacking an efficient existence check (``EXISTS`` on Redis, eg)
+        fall back to fetching the value.
+        """
+        if not key:
+            return False
+
+        with stats_timing("query_cache.has", stats_logger):
+            try:
+                return bool(_cache[region].has(key))
+            except NotImplementedError:
+                return bool(_cache[region].get(key))
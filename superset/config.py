@@ -73,6 +73,11 @@ if TYPE_CHECKING:
 
 # Realtime stats logger, a StatsD implementation exists
 STATS_LOGGER = DummyStatsLogger()
+# Logs user actions to the `logs` table of the metadata database. To take the commits
+# out of the request path, buffer the logs and commit them in batches from a
+# background thread instead:
+#   from superset.utils.log import BufferedDBEventLogger
+#   EVENT_LOGGER = BufferedDBEventLogger(batch_size=500, flush_interval=5)
 EVENT_LOGGER = DBEventLogger()
 
 SUPERSET_LOG_VIEW = True
@@ -152,6 +157,18 @@ ROW_LIMIT = 50000
 SAMPLES_ROW_LIMIT = 1000
 # max rows retrieved by filter select auto complete
 FILTER_SELECT_ROW_LIMIT = 10000
+# The time comparison (time offset) queries of a chart are run concurrently, on a
+# pool of at most this many worker threads, each with its own copy of the dataset
+# in its own database session. The default of 1 runs them one after another.
+TIME_OFFSETS_MAX_WORKERS = 1
+# The query objects of a chart data request (e.g. the series of a mixed time-series
+# chart) are run concurrently, on a pool of at most this many worker threads. The
+# default of 1 runs them one after another. Each query reports its timing breakdown
+# in the `timing` of its results.
+CHART_DATA_QUERIES_MAX_WORKERS = 1
+# Maximum number of chart data queries the worker threads of a Superset process run
+# concurrently against a single database
+CHART_DATA_MAX_CONCURRENT_QUERIES_PER_DATABASE = 8
 
 SUPERSET_WEBSERVER_PROTOCOL = "http"
 SUPERSET_WEBSERVER_ADDRESS = "0.0.0.0"
@@ -1054,6 +1071,40 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# Store the DataFrames of cached chart query results as Arrow IPC streams rather
+# than relying on the pickling of the cache backend. Arrow payloads are smaller
+# and much cheaper to load for large results; cached entries written with either
+# format remain readable when toggling this option.
+DATA_CACHE_USE_ARROW = False
+# Compression codec for the Arrow IPC buffers: "lz4", "zstd" or None
+DATA_CACHE_ARROW_COMPRESSION: Optional[str] = "lz4"
+
+# Protect the caches against stampedes: when a missing chart query result or
+# memoized value (eg, the tables of a schema) is requested concurrently, a single
+# worker computes it while the others wait for it to be cached. The lock is stored
+# in the cache itself, and is shared by all workers when it's distributed (Redis).
+CACHE_SINGLE_FLIGHT = False
+# Number of seconds after which the lock expires, should the worker holding it die.
+# Note that some backends, like the filesystem cache, keep expired locks until they
+# are pruned, during which workers compute the value after waiting for it.
+CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT = int(timedelta(minutes=5).total_seconds())
+# Number of seconds waiting workers wait for the value before computing it too
+CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT = 60
+# Number of seconds between checks of waiting workers for the value
+CACHE_SINGLE_FLIGHT_POLL_INTERVAL = 0.1
+
+# Stale-while-revalidate mode of the data cache: when set, cached chart query results
+# are kept this many seconds past their cache timeout. During that time they're
+# still served, flagged as stale, while the `load_chart_data_into_cache` Celery task
+# refreshes them in the background, so that users don't wait on the query.
+DATA_CACHE_STALE_TIMEOUT: Optional[int] = None
+
+# The `cache-warmup` Celery task runs the queries of the charts to warm up in the
+# worker, this many charts at a time
+CACHE_WARMUP_MAX_WORKERS = 4
+# Maximum number of warm up queries running concurrently against a database
+CACHE_WARMUP_MAX_CONCURRENT_QUERIES_PER_DATABASE = 2
+
 # Cache for dashboard filter state (`CACHE_TYPE` defaults to `SimpleCache` when
 #  running in debug mode unless overridden)
 FILTER_STATE_CACHE_CONFIG: CacheConfig = {
@@ -1100,6 +1151,15 @@ CSV_MIN_ROWS = 1
 CSV_EXPORT = {"encoding": "utf-8"}
 EXCEL_EXPORT = {"encoding": "utf-8"}
 
+# Stream SQL Lab CSV exports to the client in chunks of
+# SQLLAB_CSV_EXPORT_CHUNK_SIZE rows instead of building the whole file in memory.
+# When the results are not in the results backend, the query is rerun and the
+# rows are fetched from the cursor in batches of the same size. Results in the
+# results backend are still loaded whole, unless stored as pages, see
+# SQLLAB_RESULTS_PAGE_SIZE.
+SQLLAB_CSV_EXPORT_STREAMING = False
+SQLLAB_CSV_EXPORT_CHUNK_SIZE = 10000
+
 
 # ---------------------------------------------------
 # Time grain configurations
@@ -1348,6 +1408,29 @@ RESULTS_BACKEND: Optional[BaseCache] = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# The codec compressing the payloads written to the results backend: "zlib",
+# "lz4", "zstd" or "none". LZ4 and Zstandard are much cheaper than zlib for large
+# results. Payloads written with any codec remain readable when changing it.
+RESULTS_BACKEND_COMPRESSION = "zlib"
+# The compression level of the codec, the default level of the codec if None. LZ4
+# doesn't have levels and ignores it.
+RESULTS_BACKEND_COMPRESSION_LEVEL: Optional[int] = None
+# Payloads smaller than this many bytes are written uncompressed, as compressing
+# them saves little space for the time it takes
+RESULTS_BACKEND_COMPRESSION_MIN_SIZE = 0
+
+# When set, asynchronous SQL Lab queries fetch their results this many rows at a
+# time, and the first batch of rows is stored in the results backend as soon as
+# it's fetched: the results key of the query is set while it's still running, so
+# that the first rows can be shown before the whole result set is fetched.
+SQLLAB_RESULTS_FETCH_BATCH_SIZE: Optional[int] = None
+
+# When set, the results of asynchronous SQL Lab queries are stored in the results
+# backend as pages of this many rows, next to a manifest holding the columns, the
+# row count and the keys of the pages. Showing the first rows of large results in
+# SQL Lab then reads a single page, and CSV exports read the pages one by one.
+SQLLAB_RESULTS_PAGE_SIZE: Optional[int] = None
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -1498,6 +1581,25 @@ ALLOWED_EXTRA_AUTHENTICATIONS: Dict[str, Dict[str, Callable[..., Any]]] = {}
 # The id of a template dashboard that should be copied to every new user
 DASHBOARD_TEMPLATE_ID = None
 
+# Cache the SQLAlchemy engines of databases, along with a bounded pool of
+# connections, instead of creating an engine without pooling for each query. Engines
+# are keyed by database, schema, impersonated user and connection parameters (after
+# DB_CONNECTION_MUTATOR), and are disposed of when their database is updated.
+SQLALCHEMY_ENGINE_CACHE_ENABLED = False
+# Maximum number of cached engines, per process. The least recently used engines are
+# disposed of beyond this number.
+SQLALCHEMY_ENGINE_CACHE_MAX_SIZE = 64
+# Cached engines unused for this number of seconds are disposed of
+SQLALCHEMY_ENGINE_CACHE_IDLE_TIMEOUT = 600
+# Parameters of the pool of cached engines, overridden by the `engine_params` in the
+# extra of databases
+SQLALCHEMY_ENGINE_POOL_PARAMS: Dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 5,
+    "pool_recycle": 3600,
+    "pool_pre_ping": True,
+}
+
 # A callable that allows altering the database connection URL and params
 # on the fly, at runtime. This allows for things like impersonation or
 # arbitrary logic. For instance you can wire different users to
@@ -1696,6 +1798,19 @@ TALISMAN_CONFIG = {
 # }
 RLS_FORM_QUERY_REL_FIELDS: Optional[Dict[str, List[List[Any]]]] = None
 
+# Timeout of the row level security filters cached by role set and table in the
+# default cache (CACHE_CONFIG). Cached filters are invalidated whenever a filter,
+# or the roles and tables it applies to, change.
+RLS_FILTERS_CACHE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+
+# The access checks use a snapshot of the permissions granted to the role set of the
+# user, loaded once per request. When set, snapshots are also cached in the default
+# cache (CACHE_CONFIG) for this many seconds, and invalidated whenever a role or
+# permission view changes. The cache must be shared by all the Superset processes,
+# eg, Redis: with a per process cache, a revoked permission remains effective in the
+# other processes until their snapshots time out.
+PERMISSIONS_CACHE_TIMEOUT: Optional[int] = None
+
 #
 # Flask session cookie options
 #
@@ -1734,6 +1849,12 @@ SSL_CERT_PATH: Optional[str] = None
 
 SQLA_TABLE_MUTATOR = lambda table: table
 
+# Queries on multi dataset (tmp__) tables only select the columns of the joined
+# datasets that the chart references. When enabled, LEFT joins of datasets that
+# contribute no referenced columns are removed too. Only enable this if those
+# joins match at most one row, otherwise removing them changes the results.
+MULTI_DATASET_PRUNE_JOINS = False
+
 
 # Global async query config options.
 # Requires GLOBAL_ASYNC_QUERIES feature flag to be enabled.
@@ -19,7 +19,18 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Hashable, List, Optional, Set, Type, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+    Union,
+)
 
 from flask_appbuilder.security.sqla.models import User
 from sqlalchemy import and_, Boolean, Column, Integer, String, Text
@@ -243,6 +254,15 @@ class BaseDatasource(
     @property
     def data(self) -> Dict[str, Any]:
         """Data representation of the datasource sent to the frontend"""
+        return self.get_data(self.columns, self.metrics)
+
+    def get_data(
+        self, columns: List["BaseColumn"], metrics: List["BaseMetric"]
+    ) -> Dict[str, Any]:
+        """
+        Data representation of the datasource sent to the frontend, restricted to the
+        given columns and metrics.
+        """
         order_by_choices = []
         # self.column_names return sorted column_names
         for column_name in self.column_names:
@@ -256,10 +276,10 @@ class BaseDatasource(
 
         verbose_map = {"__timestamp": "Time"}
         verbose_map.update(
-            {o.metric_name: o.verbose_name or o.metric_name for o in self.metrics}
+            {o.metric_name: o.verbose_name or o.metric_name for o in metrics}
         )
         verbose_map.update(
-            {o.column_name: o.verbose_name or o.column_name for o in self.columns}
+            {o.column_name: o.verbose_name or o.column_name for o in columns}
         )
         return {
             # simple fields
@@ -284,8 +304,8 @@ class BaseDatasource(
             # sqla-specific
             "sql": self.sql,
             # one to many
-            "columns": [o.data for o in self.columns],
-            "metrics": [o.data for o in self.metrics],
+            "columns": [o.data for o in columns],
+            "metrics": [o.data for o in metrics],
             # TODO deprecate, move logic to JS
             "order_by_choices": order_by_choices,
             "owners": [owner.id for owner in self.owners],
@@ -293,16 +313,41 @@ class BaseDatasource(
             "select_star": self.select_star,
         }
 
-    def data_for_slices(  # pylint: disable=too-many-locals
-        self, slices: List[Slice]
-    ) -> Dict[str, Any]:
+    def data_for_slices(self, slices: List[Slice]) -> Dict[str, Any]:
         """
         The representation of the datasource containing only the required data
         to render the provided slices.
 
         Used to reduce the payload when loading a dashboard.
         """
-        data = self.data
+        return self.data_for_fields(*self.get_slices_field_names(slices))
+
+    def data_for_fields(
+        self, metric_names: Set[str], column_names: Set[str]
+    ) -> Dict[str, Any]:
+        """
+        The representation of the datasource containing only the given metrics and
+        columns, built without serializing the other metrics and columns.
+        """
+        data = self.get_data(
+            [column for column in self.columns if column.column_name in column_names],
+            [metric for metric in self.metrics if metric.metric_name in metric_names],
+        )
+        data["column_types"] = list(
+            {
+                generic_type
+                for column in self.columns
+                if (generic_type := getattr(column, "type_generic", None)) is not None
+            }
+        )
+        del data["description"]
+        return data
+
+    @staticmethod
+    def get_slices_field_names(slices: List[Slice]) -> Tuple[Set[str], Set[str]]:
+        """
+        The names of the metrics and of the columns of a datasource used by slices.
+        """
         metric_names = set()
         column_names = set()
         for slc in slices:
@@ -356,41 +401,7 @@ class BaseDatasource(
                 ]
                 column_names.update(_columns)
 
-        filtered_metrics = [
-            metric
-            for metric in data["metrics"]
-            if metric["metric_name"] in metric_names
-        ]
-
-        filtered_columns: List[Column] = []
-        column_types: Set[GenericDataType] = set()
-        for column in data["columns"]:
-            generic_type = column.get("type_generic")
-            if generic_type is not None:
-                column_types.add(generic_type)
-            if column["column_name"] in column_names:
-                filtered_columns.append(column)
-
-        data["column_types"] = list(column_types)
-        del data["description"]
-        data.update({"metrics": filtered_metrics})
-        data.update({"columns": filtered_columns})
-        verbose_map = {"__timestamp": "Time"}
-        verbose_map.update(
-            {
-                metric["metric_name"]: metric["verbose_name"] or metric["metric_name"]
-                for metric in filtered_metrics
-            }
-        )
-        verbose_map.update(
-            {
-                column["column_name"]: column["verbose_name"] or column["column_name"]
-                for column in filtered_columns
-            }
-        )
-        data["verbose_map"] = verbose_map
-
-        return data
+        return metric_names, column_names
 
     @staticmethod
     def filter_values_handler(  # pylint: disable=too-many-arguments
@@ -0,0 +1,295 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Join plans describe how the datasets of a multi dataset (``tmp__``) table are
+joined, so that the joining query can be built as a SQLAlchemy construct instead
+of being assembled and rewritten as text.
+"""
+import re
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.sql import literal_column, table, text, visitors
+from sqlalchemy.sql.elements import (
+    ClauseElement,
+    ColumnClause,
+    ColumnElement,
+    TextClause,
+)
+from sqlalchemy.sql.expression import Select, TextAsFrom
+from sqlalchemy.sql.selectable import FromClause
+
+# keys of the join plan, and of the checksum of the query it was compiled to, in the
+# ``extra`` of multi dataset tables
+JOIN_PLAN_KEY = "join_plan"
+JOIN_PLAN_CHECKSUM_KEY = "join_plan_checksum"
+
+
+@dataclass
+class JoinedTable:
+    """
+    A dataset taking part in a join, with the columns it contributes.
+    """
+
+    alias: str
+    table_name: str
+    schema: Optional[str] = None
+    # the query of virtual datasets
+    sql: Optional[str] = None
+    # the expressions of the columns, keyed by their label in the joining query
+    columns: Dict[str, str] = field(default_factory=dict)
+
+    def get_from_clause(
+        self, text_clause: Callable[[str], TextClause] = text
+    ) -> FromClause:
+        if self.sql:
+            return TextAsFrom(text_clause(self.sql), []).alias(self.alias)
+        return table(self.table_name, schema=self.schema).alias(self.alias)
+
+
+@dataclass
+class Join:
+    """
+    A join of a dataset to the datasets preceding it.
+    """
+
+    join_type: str
+    table: JoinedTable
+    # pairs of expressions that must be equal
+    on: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def kind(self) -> str:
+        """
+        The kind of join, one of INNER, LEFT, RIGHT or FULL.
+        """
+        kind = self.join_type.strip().upper().split(" ")[0]
+        return kind if kind in {"LEFT", "RIGHT", "FULL"} else "INNER"
+
+    def references(self, alias: str) -> bool:
+        """
+        Whether the join condition references the table with the given alias.
+        """
+        pattern = re.compile(r"(?<![\w.])" + re.escape(alias) + r"\.")
+        return any(
+            pattern.search(expression) for pair in self.on for expression in pair
+        )
+
+    def get_onclause(self) -> ColumnElement:
+        return and_(
+            *[literal_column(left) == literal_column(right) for left, right in self.on]
+        )
+
+
+@dataclass
+class JoinPlan:
+    """
+    The datasets of a multi dataset table and how they're joined.
+    """
+
+    table: JoinedTable
+    joins: List[Join] = field(default_factory=list)
+
+    @property
+    def tables(self) -> List[JoinedTable]:
+        return [self.table] + [join.table for join in self.joins]
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        """
+        The expressions of the columns of the joining query, keyed by label.
+        """
+        return {
+            label: expression
+            for joined_table in self.tables
+            for label, expression in joined_table.columns.items()
+        }
+
+    def get_from_clause(
+        self, text_clause: Callable[[str], TextClause] = text
+    ) -> FromClause:
+        from_clause = self.table.get_from_clause(text_clause)
+        for join in self.joins:
+            right = join.table.get_from_clause(text_clause)
+            onclause = join.get_onclause()
+            if join.kind == "RIGHT":
+                from_clause = right.join(from_clause, onclause, isouter=True)
+            else:
+                from_clause = from_clause.join(
+                    right,
+                    onclause,
+                    isouter=join.kind == "LEFT",
+                    full=join.kind == "FULL",
+                )
+        return from_clause
+
+    def get_select(
+        self,
+        filters: Optional[List[ColumnElement]] = None,
+        text_clause: Callable[[str], TextClause] = text,
+    ) -> Select:
+        """
+        Build the query joining the datasets.
+
+        :param filters: Filters on the expressions of the joined datasets
+        :param text_clause: Factory of the text clauses of virtual datasets
+        :returns: The joining query
+        """
+        qry = select(
+            [
+                literal_column(expression).label(label)
+                for label, expression in self.columns.items()
+            ]
+        ).select_from(self.get_from_clause(text_clause))
+        if filters:
+            qry = qry.where(and_(*filters))
+        return qry
+
+    def prune(self, labels: Set[str], prune_joins: bool = False) -> "JoinPlan":
+        """
+        Return the plan restricted to the columns with the given labels.
+
+        Optionally, LEFT joins of tables that contribute none of the columns, and
+        that no remaining join condition references, are removed too. This is only
+        correct if those joins match at most one row, since otherwise they multiply
+        the rows of the preceding tables.
+
+        :param labels: The labels of the columns to keep
+        :param prune_joins: Whether to remove joins of unused tables
+        :returns: The pruned plan
+        """
+
+        def prune_table(joined_table: JoinedTable) -> JoinedTable:
+            return replace(
+                joined_table,
+                columns={
+                    label: expression
+                    for label, expression in joined_table.columns.items()
+                    if label in labels
+                },
+            )
+
+        joins = [replace(join, table=prune_table(join.table)) for join in self.joins]
+        if prune_joins:
+            kept_joins: List[Join] = []
+            for join in reversed(joins):
+                if (
+                    join.kind == "LEFT"
+                    and not join.table.columns
+                    and not any(
+                        kept_join.references(join.table.alias)
+                        for kept_join in kept_joins
+                    )
+                ):
+                    continue
+                kept_joins.insert(0, join)
+            joins = kept_joins
+
+        pruned = JoinPlan(table=prune_table(self.table), joins=joins)
+        if not pruned.columns and self.columns:
+            # the joining query must select at least one column
+            label, expression = next(iter(self.columns.items()))
+            for joined_table in pruned.tables:
+                if expression.startswith(f"{joined_table.alias}."):
+                    joined_table.columns[label] = expression
+                    break
+            else:
+                pruned.table.columns[label] = expression
+        return pruned
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JoinPlan":
+        return cls(
+            table=JoinedTable(**data["table"]),
+            joins=[
+                Join(
+                    join_type=join["join_type"],
+                    table=JoinedTable(**join["table"]),
+                    on=[(left, right) for left, right in join["on"]],
+                )
+                for join in data.get("joins", [])
+            ],
+        )
+
+
+def get_referenced_columns(
+    elements: Iterable[ClauseElement], labels: Iterable[str]
+) -> Set[str]:
+    """
+    Return the labels of the columns of a joining query referenced by the elements
+    of an outer query, be it as columns or in free form SQL.
+
+    :param elements: The elements of the outer query
+    :param labels: The labels of the columns of the joining query
+    :returns: The labels referenced by the elements
+    """
+    labels = set(labels)
+    referenced: Set[str] = set()
+    sql_fragments: List[str] = []
+    for element in elements:
+        for child in visitors.iterate(element):
+            if isinstance(child, TextClause):
+                sql_fragments.append(child.text)
+            elif isinstance(child, ColumnClause):
+                if child.is_literal:
+                    sql_fragments.append(child.name)
+                elif child.name in labels:
+                    referenced.add(child.name)
+
+    if sql_fragments and labels:
+        pattern = re.compile(
+            r"(?<![\w.])("
+            + "|".join(re.escape(label) for label in labels)
+            + r")(?![\w])"
+        )
+        for fragment in sql_fragments:
+            referenced.update(pattern.findall(fragment))
+    return referenced
+
+
+def qualify_expression(expression: str, column_names: List[str], alias: str) -> str:
+    """
+    Qualify the references to the columns of a dataset in a SQL expression.
+
+        >>> qualify_expression("CASE WHEN id > 0 THEN user_id END", ["id"], "a")
+        'CASE WHEN a.id > 0 THEN user_id END'
+
+    Names within string literals and quoted identifiers are left as is.
+
+    :param expression: The SQL expression
+    :param column_names: The names of the columns of the dataset
+    :param alias: The alias of the dataset
+    :returns: The expression with the column references qualified
+    """
+    if not column_names:
+        return expression
+
+    names = sorted(column_names, key=len, reverse=True)
+    # quoted spans are matched first, so that the names within them are skipped
+    pattern = re.compile(
+        r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`)"
+        + r"|(?<![\w.])("
+        + "|".join(re.escape(name) for name in names)
+        + r")(?![\w])"
+    )
+    return pattern.sub(
+        lambda match: match.group(1) or f"{alias}.{match.group(2)}", expression
+    )
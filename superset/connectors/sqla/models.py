@@ -71,7 +71,7 @@ from sqlalchemy.orm import backref, Query, relationship, RelationshipProperty, S
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
-from sqlalchemy.sql import column, ColumnElement, literal_column, table
+from sqlalchemy.sql import column, ColumnElement, literal_column, table, visitors
 from sqlalchemy.sql.elements import ColumnClause, TextClause
 from sqlalchemy.sql.expression import Label, Select, TextAsFrom
 from sqlalchemy.sql.selectable import Alias, TableClause
@@ -81,6 +81,12 @@ from superset.advanced_data_type.types import AdvancedDataTypeResponse
 from superset.columns.models import Column as NewColumn, UNKOWN_TYPE
 from superset.common.db_query_status import QueryStatus
 from superset.connectors.base.models import BaseColumn, BaseDatasource, BaseMetric
+from superset.connectors.sqla.join_plan import (
+    get_referenced_columns,
+    JOIN_PLAN_CHECKSUM_KEY,
+    JOIN_PLAN_KEY,
+    JoinPlan,
+)
 from superset.connectors.sqla.utils import (
     find_cached_objects_in_session,
     get_columns_description,
@@ -111,6 +117,7 @@ from superset.models.helpers import (
     QueryResult,
 )
 from superset.sql_parse import (
+    extract_column_aliases,
     extract_table_references,
     ParsedQuery,
     sanitize_clause,
@@ -134,17 +141,16 @@ from superset.utils.core import (
     QueryObjectFilterClause,
     remove_duplicates,
 )
+from superset.utils.hashing import md5_sha_from_str
 
 config = app.config
 metadata = Model.metadata  # pylint: disable=no-member
 logger = logging.getLogger(__name__)
 
-TUPLE_QUERY_INDEX = 2
-
 ADVANCED_DATA_TYPES = config["ADVANCED_DATA_TYPES"]
 VIRTUAL_TABLE_ALIAS = "virtual_table"
-
-SQL_CLAUSES = {"order_by": "ORDER BY", "group_by": "GROUP BY"}
+# prefix of the virtual tables joining multiple datasets
+MULTI_DATASET_TABLE_PREFIX = "tmp__"
 
 # a non-exhaustive set of additive metrics
 ADDITIVE_METRIC_TYPES = {
@@ -909,9 +915,10 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         check = config["DATASET_HEALTH_CHECK"]
         return check(self) if check else None
 
-    @property
-    def data(self) -> Dict[str, Any]:
-        data_ = super().data
+    def get_data(
+        self, columns: List[BaseColumn], metrics: List[BaseMetric]
+    ) -> Dict[str, Any]:
+        data_ = super().get_data(columns, metrics)
         if self.type == "table":
             data_["granularity_sqla"] = utils.choicify(self.dttm_cols)
             data_["time_grain_sqla"] = [
@@ -993,61 +1000,23 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
     def get_template_processor(self, **kwargs: Any) -> BaseTemplateProcessor:
         return get_template_processor(table=self, database=self.database, **kwargs)
 
-    def get_multi_dataset_query(
-        self, sql: str
-    ) -> str:  # pylint: disable=too-many-locals,no-self-use
-        changed_sql = sql
-        filtered_list = []
-        colum_expressions = {}
-        sql_filters = sql.partition(VIRTUAL_TABLE_ALIAS)[TUPLE_QUERY_INDEX]
-        sql_filters_list = sql_filters.split("\n")
-        for filter_value in sql_filters_list[1::]:
-            if not (
-                filter_value.startswith(SQL_CLAUSES["group_by"])
-                or filter_value.startswith(SQL_CLAUSES["order_by"])
-            ):
-                filtered_list.append(filter_value)
-                changed_sql = changed_sql.replace("{}".format(filter_value), "")
-                changed_sql = changed_sql.replace("{}{}".format(filter_value, "\n"), "")
-
-        final_filters_string = "\n".join(filtered_list)
-        start_of_query = changed_sql.partition("FROM\n  (SELECT")[TUPLE_QUERY_INDEX]
-        index_of_end = start_of_query.index("FROM")
-        table_expressions_list = start_of_query[:index_of_end].split(",\n")
-
-        for expression in table_expressions_list:
-            format_exp = expression.strip()
-            column = format_exp.split(" ")
-            colum_expressions[column[1]] = column[0]
-
-        for (
-            column_name
-        ) in (
-            colum_expressions.keys()
-        ):  # pylint: disable=consider-using-dict-items,consider-iterating-dictionary
-            expr = colum_expressions[column_name]
-            final_filters_string = final_filters_string.replace(
-                '"{}"'.format(column_name), expr
-            )
-
-        index = changed_sql.find(') AS "virtual_table"')
-        final_sql = (
-            changed_sql[:index]
-            + " {} ".format(final_filters_string)
-            + changed_sql[index:]
-        )
-        return sqlparse.format(final_sql, reindent=True)
+    def get_query_str_extended(
+        self, query_obj: QueryObjectDict, reindent: bool = False, **kwargs: any
+    ) -> QueryStringExtended:
+        """
+        Compile the query object into executable SQL.
 
-    def get_query_str_extended(self, query_obj: QueryObjectDict,**kwargs: any) -> QueryStringExtended:
+        :param query_obj: The query object
+        :param reindent: Whether to pretty print the SQL, which is only useful when
+            the SQL is shown to users, and expensive for wide queries
+        """
         sqlaq = self.get_sqla_query(**query_obj)
         sql = self.database.compile_sqla_query(sqlaq.sqla_query)
         sql = self._apply_cte(sql, sqlaq.cte)
-        sql = sqlparse.format(sql, reindent=True)
+        if reindent:
+            sql = sqlparse.format(sql, reindent=True)
         sql = self.mutate_query_from_config(sql,**kwargs)
 
-        if self.table_name.startswith("tmp__"):
-            sql = self.get_multi_dataset_query(sql)
-
         return QueryStringExtended(
             applied_template_filters=sqlaq.applied_template_filters,
             labels_expected=sqlaq.labels_expected,
@@ -1056,8 +1025,11 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         )
 
     def get_query_str(self, query_obj: QueryObjectDict,**kwargs: any) -> str:
-        query_str_ext = self.get_query_str_extended(query_obj,**kwargs)
-        all_queries = query_str_ext.prequeries + [query_str_ext.sql]
+        query_str_ext = self.get_query_str_extended(query_obj, reindent=True, **kwargs)
+        all_queries = [
+            sqlparse.format(prequery, reindent=True)
+            for prequery in query_str_ext.prequeries
+        ] + [query_str_ext.sql]
         return ";\n\n".join(all_queries) + ";"
 
     def get_sqla_table(self) -> TableClause:
@@ -1096,6 +1068,123 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
 
         return from_clause, cte
 
+    @property
+    def is_multi_dataset(self) -> bool:
+        return bool(self.table_name) and self.table_name.startswith(
+            MULTI_DATASET_TABLE_PREFIX
+        )
+
+    @property
+    def join_plan(self) -> Optional[JoinPlan]:
+        """
+        The join plan of a multi dataset table, unless its query was edited since
+        the table was created.
+        """
+        if not self.is_multi_dataset:
+            return None
+
+        extra = self.extra_dict
+        if JOIN_PLAN_KEY not in extra or extra.get(
+            JOIN_PLAN_CHECKSUM_KEY
+        ) != md5_sha_from_str(self.sql or ""):
+            return None
+        return JoinPlan.from_dict(extra[JOIN_PLAN_KEY])
+
+    def push_down_filters(
+        self,
+        tbl: Union[TableClause, Alias],
+        where_clause_and: List[ColumnElement],
+        template_processor: Optional[BaseTemplateProcessor] = None,
+        qry: Optional[Select] = None,
+        join_plan: Optional[JoinPlan] = None,
+    ) -> Tuple[Union[TableClause, Alias], List[ColumnElement]]:
+        """
+        Push the filters of a query on a multi dataset table down into the query
+        joining the datasets, so that rows are filtered before they're joined.
+
+        Only filters referencing aliased columns of the joining query are pushed
+        down, with the aliases replaced by the column expressions. Other filters,
+        eg, free form SQL, are kept on the outer query.
+
+        The joining query is built from the join plan of the table if it has one,
+        otherwise the filters are appended to the query of the table. When built
+        from the join plan, the joining query can also be pruned to the columns
+        (and joins, see MULTI_DATASET_PRUNE_JOINS) that the outer query references.
+
+        :param tbl: The virtual table
+        :param where_clause_and: The filters of the query
+        :param template_processor: template_processor instance
+        :param qry: The outer query, to prune the joining query to its columns
+        :param join_plan: The join plan of the table, see ``join_plan``
+        :returns: The virtual table with the filters pushed down, and the filters
+            that remain on the outer query
+        """
+        if join_plan:
+            aliases = join_plan.columns
+        else:
+            from_sql = self.get_rendered_sql(template_processor)
+            aliases = extract_column_aliases(from_sql) or {}
+
+        def is_resolvable(element: Any) -> bool:
+            if isinstance(element, TextClause):
+                return False
+            if isinstance(element, ColumnClause):
+                return not element.is_literal and element.name in aliases
+            return True
+
+        def resolve(element: Any) -> Optional[ColumnElement]:
+            if isinstance(element, ColumnClause):
+                return literal_column(aliases[element.name])
+            return None
+
+        pushed_down = []
+        remaining = []
+        for clause in where_clause_and:
+            if all(is_resolvable(element) for element in visitors.iterate(clause)):
+                pushed_down.append(visitors.replacement_traverse(clause, {}, resolve))
+            else:
+                remaining.append(clause)
+
+        if join_plan:
+            if qry is not None:
+                join_plan = join_plan.prune(
+                    get_referenced_columns([qry, *where_clause_and], aliases),
+                    prune_joins=config["MULTI_DATASET_PRUNE_JOINS"],
+                )
+            from_clause = join_plan.get_select(
+                pushed_down,
+                lambda sql: self.text(self.render_template(sql, template_processor)),
+            )
+            return from_clause.alias(VIRTUAL_TABLE_ALIAS), remaining
+
+        if not pushed_down:
+            return tbl, where_clause_and
+
+        where = self.database.compile_sqla_query(and_(*pushed_down))
+        from_clause = TextAsFrom(self.text(f"{from_sql}\nWHERE {where}"), []).alias(
+            VIRTUAL_TABLE_ALIAS
+        )
+        return from_clause, remaining
+
+    @staticmethod
+    def render_template(
+        sql: str, template_processor: Optional[BaseTemplateProcessor] = None
+    ) -> str:
+        """
+        Render the query of a virtual dataset with template engine (Jinja).
+        """
+        if not template_processor:
+            return sql
+        try:
+            return template_processor.process_template(sql)
+        except TemplateError as ex:
+            raise QueryObjectValidationError(
+                _(
+                    "Error while rendering virtual dataset query: %(msg)s",
+                    msg=ex.message,
+                )
+            ) from ex
+
     def get_rendered_sql(
         self, template_processor: Optional[BaseTemplateProcessor] = None
     ) -> str:
@@ -1103,17 +1192,7 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         Render sql with template engine (Jinja).
         """
 
-        sql = self.sql
-        if template_processor:
-            try:
-                sql = template_processor.process_template(sql)
-            except TemplateError as ex:
-                raise QueryObjectValidationError(
-                    _(
-                        "Error while rendering virtual dataset query: %(msg)s",
-                        msg=ex.message,
-                    )
-                ) from ex
+        sql = self.render_template(self.sql, template_processor)
         sql = sqlparse.format(sql.strip("\t\r\n; "), strip_comments=True)
         if not sql:
             raise QueryObjectValidationError(_("Virtual dataset query cannot be empty"))
@@ -1729,6 +1808,14 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
                         )
                     ) from ex
                 having_clause_and += [self.text(having)]
+        multi_dataset_filters: Optional[List[ColumnElement]] = None
+        join_plan: Optional[JoinPlan] = None
+        if self.is_multi_dataset and not cte:
+            multi_dataset_filters = where_clause_and
+            join_plan = self.join_plan
+            tbl, where_clause_and = self.push_down_filters(
+                tbl, where_clause_and, template_processor, join_plan=join_plan
+            )
         if apply_fetch_values_predicate and self.fetch_values_predicate:
             qry = qry.where(self.get_fetch_values_predicate())
         if granularity:
@@ -1759,6 +1846,7 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         if row_offset:
             qry = qry.offset(row_offset)
 
+        series_limit_join: Optional[Tuple[Alias, ColumnElement]] = None
         if series_limit and groupby_series_columns:
             if db_engine_spec.allows_joins and db_engine_spec.allows_subqueries:
                 # some sql dialects require for order by expressions
@@ -1806,7 +1894,8 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
                     col_name = db_engine_spec.make_label_compatible(gby_name + "__")
                     on_clause.append(gby_obj == column(col_name))
 
-                tbl = tbl.join(subq.alias(), and_(*on_clause))
+                series_limit_join = (subq.alias(), and_(*on_clause))
+                tbl = tbl.join(*series_limit_join)
             else:
                 if series_limit_metric:
                     orderby = [
@@ -1848,6 +1937,14 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
                 )
                 qry = qry.where(top_groups)
 
+        if multi_dataset_filters is not None and join_plan:
+            # now that the outer query is complete, prune the joining query to the
+            # columns it references, and join it to the series limit subquery again
+            tbl, _ = self.push_down_filters(
+                tbl, multi_dataset_filters, template_processor, qry, join_plan
+            )
+            if series_limit_join:
+                tbl = tbl.join(*series_limit_join)
         qry = qry.select_from(tbl)
 
         if is_rowcount:
@@ -2658,3 +2755,27 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
         SqlaTable, secondary=RLSFilterTables, backref="row_level_security_filters"
     )
     clause = Column(Text, nullable=False)
+
+
+# Changes to the roles or tables of a filter mark the filter (or the role) as
+# dirty, so these events also cover the `RLSFilterRoles` and `RLSFilterTables`
+# association tables.
+sa.event.listen(
+    RowLevelSecurityFilter, "after_insert", security_manager.on_rls_filter_after_change
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_update", security_manager.on_rls_filter_after_change
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_delete", security_manager.on_rls_filter_after_change
+)
+sa.event.listen(
+    security_manager.role_model,
+    "after_update",
+    security_manager.on_rls_filter_after_change,
+)
+sa.event.listen(
+    security_manager.role_model,
+    "after_delete",
+    security_manager.on_rls_filter_after_change,
+)
@@ -79,7 +79,7 @@ from superset.dashboards.schemas import (
     thumbnail_query_schema,
 )
 from superset.embedded.dao import EmbeddedDAO
-from superset.extensions import event_logger
+from superset.extensions import event_logger, security_manager
 from superset.models.dashboard import Dashboard
 from superset.models.embedded_dashboard import EmbeddedDashboard
 from superset.tasks.thumbnails import cache_dashboard_thumbnail
@@ -342,7 +342,9 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         raise_for_access=lambda _self, id_or_slug: DashboardDAO.get_by_id_or_slug(
             id_or_slug
         ),
-        skip=lambda _self, id_or_slug: not is_feature_enabled("DASHBOARD_CACHE"),
+        get_cache_key_extra=lambda _self, id_or_slug: (
+            security_manager.get_user_permissions_key()
+        ),
     )
     @expose("/<id_or_slug>/datasets", methods=["GET"])
     @protect()
@@ -19,14 +19,16 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 from superset import security_manager
+from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
 from superset.dao.base import BaseDAO
 from superset.dashboards.commands.exceptions import DashboardNotFoundError
 from superset.dashboards.filters import DashboardAccessFilter
 from superset.extensions import db
-from superset.models.core import FavStar, FavStarClassName
+from superset.models.core import Database, FavStar, FavStarClassName
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.utils.core import get_user_id
@@ -107,7 +109,8 @@ class DashboardDAO(BaseDAO):
     ) -> datetime:
         """
         Get latest changed datetime for a dashboard. The change could be a dashboard
-        metadata change, a change to one of its dependent datasets.
+        metadata change, a change to one of its slices, or to one of its dependent
+        datasets, their columns, metrics or databases.
 
         :param id_or_slug_or_dashboard: A dashboard or the ID or slug of the dashboard.
         :returns: The datetime the dashboard was last changed.
@@ -118,14 +121,31 @@ class DashboardDAO(BaseDAO):
             if isinstance(id_or_slug_or_dashboard, str)
             else id_or_slug_or_dashboard
         )
-        dashboard_changed_on = DashboardDAO.get_dashboard_changed_on(dashboard)
-        datasources = dashboard.datasources
-        datasources_changed_on = max(
-            [datasource.changed_on for datasource in datasources]
-            + ([datetime.fromtimestamp(0)] if len(datasources) == 0 else [])
-        )
+        changed_on = [
+            DashboardDAO.get_dashboard_and_slices_changed_on(dashboard),
+        ]
+        datasource_ids = {slc.datasource_id for slc in dashboard.slices}
+        if datasource_ids:
+            changed_on.extend(
+                db.session.query(
+                    *[
+                        db.session.query(func.max(model.changed_on))
+                        .filter(table_id.in_(datasource_ids))
+                        .scalar_subquery()
+                        for model, table_id in (
+                            (SqlaTable, SqlaTable.id),
+                            (TableColumn, TableColumn.table_id),
+                            (SqlMetric, SqlMetric.table_id),
+                        )
+                    ],
+                    db.session.query(func.max(Database.changed_on))
+                    .join(SqlaTable, SqlaTable.database_id == Database.id)
+                    .filter(SqlaTable.id.in_(datasource_ids))
+                    .scalar_subquery(),
+                ).one()
+            )
         # drop microseconds in datetime to match with last_modified header
-        return max(dashboard_changed_on, datasources_changed_on).replace(microsecond=0)
+        return max(dttm for dttm in changed_on if dttm).replace(microsecond=0)
 
     @staticmethod
     def validate_slug_uniqueness(slug: str) -> bool:
@@ -19,7 +19,16 @@
 import logging
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pandas.api.types import (
+    is_datetime64_any_dtype,
+    is_extension_array_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_signed_integer_dtype,
+)
 
 from superset.utils.core import JS_MAX_INTEGER
 
@@ -37,6 +46,32 @@ def _convert_big_integers(val: Any) -> Any:
     return str(val) if isinstance(val, int) and abs(val) > JS_MAX_INTEGER else val
 
 
+def _column_to_list(column: pd.Series) -> List[Any]:
+    """
+    Convert a column to a list of Python objects, casting integers larger than
+    ``JS_MAX_INTEGER`` to strings.
+
+    Only integer and object columns can hold such integers: integer columns are
+    checked with a vectorized mask, object columns value by value.
+
+    :param column: the column to convert
+    :returns: the values of the column
+    """
+    values = column.tolist()
+    dtype = column.dtype
+    if is_integer_dtype(dtype):
+        # `abs` would overflow on the smallest int64
+        mask = column > JS_MAX_INTEGER
+        if is_signed_integer_dtype(dtype):
+            mask |= column < -JS_MAX_INTEGER
+        # nullable integer columns have missing values, which are never big integers
+        for idx in np.flatnonzero(mask.to_numpy(dtype=bool, na_value=False)):
+            values[idx] = str(values[idx])
+    elif is_object_dtype(dtype) or is_extension_array_dtype(dtype):
+        values = [_convert_big_integers(val) for val in values]
+    return values
+
+
 def df_to_records(dframe: pd.DataFrame) -> List[Dict[str, Any]]:
     """
     Convert a DataFrame to a set of records.
@@ -48,8 +83,64 @@ def df_to_records(dframe: pd.DataFrame) -> List[Dict[str, Any]]:
         logger.warning(
             "DataFrame columns are not unique, some columns will be omitted."
         )
-    columns = dframe.columns
-    return list(
-        dict(zip(columns, map(_convert_big_integers, row)))
-        for row in zip(*[dframe[col] for col in columns])
+    # zipping with a list is much faster than with an index
+    columns = dframe.columns.tolist()
+    values = [_column_to_list(dframe.iloc[:, idx]) for idx in range(len(columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def df_to_columns(dframe: pd.DataFrame) -> Dict[str, List[Any]]:
+    """
+    Convert a DataFrame to a mapping of column names to the values of the columns.
+
+    Datetimes are converted to milliseconds since the epoch, as
+    ``json_int_dttm_ser`` does, but a column at a time, so that the values can be
+    encoded to JSON without a ``default`` hook.
+
+    :param dframe: the DataFrame to convert
+    :returns: a dictionary of lists of values, keyed by column name
+    """
+    if not dframe.columns.is_unique:
+        logger.warning(
+            "DataFrame columns are not unique, some columns will be omitted."
+        )
+    columns: Dict[str, List[Any]] = {}
+    for idx, name in enumerate(dframe.columns):
+        column = dframe.iloc[:, idx]
+        if is_datetime64_any_dtype(column.dtype):
+            # like `datetime_to_epoch`, aware datetimes are read as UTC wall time
+            if column.dt.tz is not None:
+                column = column.dt.tz_localize(None)
+            nanos = column.to_numpy(dtype="int64").astype("float64")
+            nanos[column.isna().to_numpy()] = np.nan
+            columns[name] = (nanos / 10**9 * 1000).tolist()
+        else:
+            columns[name] = column.tolist()
+    return columns
+
+
+def _column_to_arrow(column: pd.Series) -> pa.Array:
+    try:
+        return pa.array(column, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        # columns of values of mixed types, e.g. from JSON columns, are sent as strings
+        return pa.array(
+            column.astype(str).where(column.notna(), None), from_pandas=True
+        )
+
+
+def df_to_arrow_stream(dframe: pd.DataFrame) -> bytes:
+    """
+    Convert a DataFrame to an Arrow IPC stream.
+
+    :param dframe: the DataFrame to convert
+    :returns: the Arrow IPC stream of a table holding the columns of the DataFrame
+    """
+    table = pa.Table.from_arrays(
+        [_column_to_arrow(dframe.iloc[:, idx]) for idx in range(len(dframe.columns))],
+        names=[str(name) for name in dframe.columns],
     )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
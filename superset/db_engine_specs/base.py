@@ -24,6 +24,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Match,
     NamedTuple,
@@ -368,6 +369,10 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     # if True, database will be listed as option in the upload file form
     supports_file_upload = True
 
+    # Whether the engines of the database can be cached with a pool of connections
+    # shared by the threads of a process (see SQLALCHEMY_ENGINE_CACHE_ENABLED)
+    allows_connection_pooling = True
+
     @classmethod
     def supports_url(cls, url: URL) -> bool:
         """
@@ -643,6 +648,47 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex)
 
+    @classmethod
+    def fetch_data_in_batches(
+        cls, cursor: Any, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Fetch the result of an executed cursor in batches, so that large result
+        sets never need to be held in memory all at once.
+
+        Engine specs overriding ``fetch_data``, eg, to poll the cursor or convert the
+        rows, fetch the whole result with it instead, and return it in batches.
+
+        :param cursor: Cursor instance
+        :param batch_size: Maximum number of rows in each batch
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator over batches of rows
+        """
+        fetch_data = cls.fetch_data.__func__  # type: ignore
+        if fetch_data is not BaseEngineSpec.fetch_data.__func__:  # type: ignore
+            data = cls.fetch_data(cursor, limit)
+            for start in range(0, len(data), batch_size):
+                yield data[start : start + batch_size]
+            return
+
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        if not cursor.description:
+            return
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            try:
+                rows = cursor.fetchmany(size)
+            except Exception as ex:
+                raise cls.get_dbapi_mapped_exception(ex)
+            if not rows:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            yield cls.pyodbc_rows_to_tuples(rows)
+
     @classmethod
     def expand_data(
         cls, columns: List[ResultSetColumnType], data: List[Dict[Any, Any]]
@@ -36,6 +36,8 @@ COLUMN_DOES_NOT_EXIST_REGEX = re.compile("no such column: (?P<column_name>.+)")
 class SqliteEngineSpec(BaseEngineSpec):
     engine = "sqlite"
     engine_name = "SQLite"
+    # pysqlite connections can't be shared by threads
+    allows_connection_pooling = False
 
     _time_grain_expressions = {
         None: "{col}",
@@ -658,6 +658,7 @@ def dataset_macro(
         "metrics": metrics if include_metrics else None,
         "columns": columns,
     }
-    sqla_query = dataset.get_query_str_extended(query_obj)
+    # the SQL ends up in the query shown to users, so it's pretty printed
+    sqla_query = dataset.get_query_str_extended(query_obj, reindent=True)
     sql = sqla_query.sql
     return f"({sql}) AS dataset_{dataset_id}"
@@ -24,7 +24,7 @@ from ast import literal_eval
 from contextlib import closing
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 import numpy
 import pandas as pd
@@ -48,8 +48,8 @@ from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import ArgumentError, NoSuchModuleError
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Mapper, relationship
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import expression, Select
 
@@ -62,6 +62,7 @@ from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.result_set import SupersetResultSet
 from superset.utils import cache as cache_util, core as utils
 from superset.utils.core import get_username
+from superset.utils.engine_cache import engine_cache, get_engine_key
 from superset.utils.memoized import memoized
 
 config = app.config
@@ -385,7 +386,14 @@ class Database(
         logger.debug("Database.get_sqla_engine(). Masked URL: %s", str(masked_url))
 
         params = extra.get("engine_params", {})
-        if nullpool:
+        cache_engine = (
+            config["SQLALCHEMY_ENGINE_CACHE_ENABLED"]
+            and self.db_engine_spec.allows_connection_pooling
+        )
+        if cache_engine:
+            params = {**config["SQLALCHEMY_ENGINE_POOL_PARAMS"], **params}
+            params.setdefault("poolclass", QueuePool)
+        elif nullpool:
             params["poolclass"] = NullPool
 
         connect_args = params.get("connect_args", {})
@@ -412,10 +420,23 @@ class Database(
                 sqlalchemy_url, params, effective_username, security_manager, source
             )
 
-        try:
-            return create_engine(sqlalchemy_url, **params)
-        except Exception as ex:
-            raise self.db_engine_spec.get_dbapi_mapped_exception(ex)
+        def create_sqla_engine() -> Engine:
+            try:
+                return create_engine(sqlalchemy_url, **params)
+            except Exception as ex:
+                raise self.db_engine_spec.get_dbapi_mapped_exception(ex)
+
+        if not cache_engine:
+            return create_sqla_engine()
+
+        return engine_cache.get(
+            get_engine_key(self.id, sqlalchemy_url, params, schema, effective_username),
+            self.id,
+            create_sqla_engine,
+            max_size=config["SQLALCHEMY_ENGINE_CACHE_MAX_SIZE"],
+            idle_timeout=config["SQLALCHEMY_ENGINE_CACHE_IDLE_TIMEOUT"],
+            stats_logger=stats_logger,
+        )
 
     @property
     def quote_identifier(self) -> Callable[[str], str]:
@@ -425,42 +446,56 @@ class Database(
     def get_reserved_words(self) -> Set[str]:
         return self.get_dialect().preparer.reserved_words
 
-    def get_df(  # pylint: disable=too-many-locals
-        self,
-        sql: str,
-        schema: Optional[str] = None,
-        mutator: Optional[Callable[[pd.DataFrame], None]] = None,
-    ) -> pd.DataFrame:
-        sqls = self.db_engine_spec.parse_sql(sql)
-        engine = self.get_sqla_engine(schema)
-
-        def needs_conversion(df_series: pd.Series) -> bool:
-            return (
-                not df_series.empty
-                and isinstance(df_series, pd.Series)
-                and isinstance(df_series[0], (list, dict))
-            )
-
-        def _log_query(sql: str) -> None:
+    def _execute_sql(
+        self, cursor: Any, sqls: List[str], engine: Engine, schema: Optional[str]
+    ) -> None:
+        """
+        Execute the statements of a query, discarding the results of all but the
+        last one, and log them with ``QUERY_LOGGER``.
+        """
+        for idx, sql_ in enumerate(sqls):
             if log_query:
                 log_query(
                     engine.url,
-                    sql,
+                    sql_,
                     schema,
                     get_username(),
                     __name__,
                     security_manager,
                 )
+            self.db_engine_spec.execute(cursor, sql_)
+            if idx < len(sqls) - 1:
+                cursor.fetchall()
+
+    @staticmethod
+    def _serialize_nested_columns(df: pd.DataFrame) -> None:
+        """
+        Serialize the lists and dicts of the object columns of a DataFrame to JSON.
+        """
+
+        def needs_conversion(df_series: pd.Series) -> bool:
+            return (
+                not df_series.empty
+                and isinstance(df_series, pd.Series)
+                and isinstance(df_series[0], (list, dict))
+            )
+
+        for col, coltype in df.dtypes.to_dict().items():
+            if coltype == numpy.object_ and needs_conversion(df[col]):
+                df[col] = df[col].apply(utils.json_dumps_w_dates)
+
+    def get_df(
+        self,
+        sql: str,
+        schema: Optional[str] = None,
+        mutator: Optional[Callable[[pd.DataFrame], None]] = None,
+    ) -> pd.DataFrame:
+        sqls = self.db_engine_spec.parse_sql(sql)
+        engine = self.get_sqla_engine(schema)
 
         with closing(engine.raw_connection()) as conn:
             cursor = conn.cursor()
-            for sql_ in sqls[:-1]:
-                _log_query(sql_)
-                self.db_engine_spec.execute(cursor, sql_)
-                cursor.fetchall()
-
-            _log_query(sqls[-1])
-            self.db_engine_spec.execute(cursor, sqls[-1])
+            self._execute_sql(cursor, sqls, engine, schema)
 
             data = self.db_engine_spec.fetch_data(cursor)
             result_set = SupersetResultSet(
@@ -470,12 +505,46 @@ class Database(
             if mutator:
                 df = mutator(df)
 
-            for col, coltype in df.dtypes.to_dict().items():
-                if coltype == numpy.object_ and needs_conversion(df[col]):
-                    df[col] = df[col].apply(utils.json_dumps_w_dates)
-
+            self._serialize_nested_columns(df)
             return df
 
+    def get_df_chunks(
+        self,
+        sql: str,
+        schema: Optional[str] = None,
+        chunk_size: int = 10000,
+        limit: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run a query and lazily yield its result as DataFrames of at most
+        ``chunk_size`` rows, fetched from the cursor with ``fetchmany``.
+
+        At least one (possibly empty) DataFrame is always yielded, so that callers
+        can rely on the column names.
+        """
+        sqls = self.db_engine_spec.parse_sql(sql)
+        engine = self.get_sqla_engine(schema)
+
+        with closing(engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            self._execute_sql(cursor, sqls, engine, schema)
+
+            empty = True
+            for data in self.db_engine_spec.fetch_data_in_batches(
+                cursor, chunk_size, limit
+            ):
+                empty = False
+                df = SupersetResultSet(
+                    data, cursor.description, self.db_engine_spec
+                ).to_pandas_df()
+                self._serialize_nested_columns(df)
+                yield df
+
+            if empty:
+                yield SupersetResultSet(
+                    [], cursor.description or [], self.db_engine_spec
+                ).to_pandas_df()
+
     def compile_sqla_query(self, qry: Select, schema: Optional[str] = None) -> str:
         engine = self.get_sqla_engine(schema=schema)
 
@@ -827,10 +896,21 @@ class Database(
         sqla_url = make_url_safe(self.sqlalchemy_uri_decrypted)
         return sqla_url.get_dialect()()
 
+    @staticmethod
+    def invalidate_engine_cache(
+        _mapper: Mapper, _connection: Connection, target: "Database"
+    ) -> None:
+        """
+        Dispose of the cached engines of a database once it's updated or deleted.
+        """
+        engine_cache.invalidate(target.id)
+
 
 sqla.event.listen(Database, "after_insert", security_manager.database_after_insert)
 sqla.event.listen(Database, "after_update", security_manager.database_after_update)
 sqla.event.listen(Database, "after_delete", security_manager.database_after_delete)
+sqla.event.listen(Database, "after_update", Database.invalidate_engine_cache)
+sqla.event.listen(Database, "after_delete", Database.invalidate_engine_cache)
 
 
 class Log(Model):  # pylint: disable=too-few-public-methods
@@ -31,11 +31,13 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    func,
     Integer,
     MetaData,
     String,
     Table,
     Text,
+    union_all,
     UniqueConstraint,
 )
 from sqlalchemy.engine.base import Connection
@@ -50,6 +52,7 @@ from superset.connectors.base.models import BaseDatasource
 from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
 from superset.datasource.dao import DatasourceDAO
 from superset.extensions import cache_manager
+from superset.models.core import Database
 from superset.models.filter_set import FilterSet
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.slice import Slice
@@ -294,23 +297,22 @@ class Dashboard(Model, AuditMixinNullable, ImportExportMixin):
     def datasets_trimmed_for_slices(self) -> List[Dict[str, Any]]:
         # Verbose but efficient database enumeration of dashboard datasources.
         slices_by_datasource: Dict[
-            Tuple[Type["BaseDatasource"], int], Set[Slice]
-        ] = defaultdict(set)
+            Type["BaseDatasource"], Dict[int, Set[Slice]]
+        ] = defaultdict(lambda: defaultdict(set))
 
         for slc in self.slices:
-            slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
+            slices_by_datasource[slc.cls_model][slc.datasource_id].add(slc)
 
         result: List[Dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
+        for cls_model, slices_by_id in slices_by_datasource.items():
+            payloads = get_datasets_trimmed_for_slices(cls_model, slices_by_id)
+            result.extend(
+                payloads[datasource_id]
+                for datasource_id in slices_by_id
+                if datasource_id in payloads
             )
 
-            if datasource:
-                # Filter out unneeded fields from the datasource payload
-                result.append(datasource.data_for_slices(slices))
-
         return result
 
     @property  # type: ignore
@@ -451,6 +453,110 @@ def id_or_slug_filter(id_or_slug: Union[int, str]) -> BinaryExpression:
     return Dashboard.slug == id_or_slug
 
 
+def get_datasets_trimmed_for_slices(
+    cls_model: Type["BaseDatasource"], slices_by_datasource: Dict[int, Set[Slice]]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Return the payloads of datasources of a type trimmed to the fields used by their
+    slices, keyed by datasource id.
+
+    Payloads are cached per datasource and set of fields, keyed by when the datasource,
+    its database, columns and metrics last changed and by its owners, and the
+    datasources missing from the cache are loaded in bulk, along with their columns
+    and metrics.
+
+    :param cls_model: The model of the datasources
+    :param slices_by_datasource: The slices using each datasource
+    :returns: The trimmed payloads of the datasources that exist
+    """
+    datasource_ids = list(slices_by_datasource)
+    versions: Dict[int, List[Any]] = {
+        datasource_id: [str(datasource_changed_on), str(database_changed_on)]
+        for datasource_id, datasource_changed_on, database_changed_on in (
+            db.session.query(cls_model.id, cls_model.changed_on, Database.changed_on)
+            .join(Database, Database.id == cls_model.database_id)
+            .filter(cls_model.id.in_(datasource_ids))
+        )
+    }
+    # editing the columns, metrics or owners of a datasource doesn't change it
+    children = union_all(
+        *[
+            select([model.table_id, model.changed_on]).where(
+                model.table_id.in_(datasource_ids)
+            )
+            for model in (cls_model.column_class, cls_model.metric_class)
+        ]
+    ).subquery()
+    # the number of children accounts for deleted columns and metrics
+    for datasource_id, children_changed_on, children_count in db.session.query(
+        children.c.table_id, func.max(children.c.changed_on), func.count()
+    ).group_by(children.c.table_id):
+        if datasource_id in versions:
+            versions[datasource_id] += [str(children_changed_on), children_count]
+    owner_ids = defaultdict(list)
+    for datasource_id, owner_id in (
+        db.session.query(cls_model.id, cls_model.owner_class.id)
+        .join(cls_model.owners)
+        .filter(cls_model.id.in_(datasource_ids))
+        .order_by(cls_model.owner_class.id)
+    ):
+        owner_ids[datasource_id].append(owner_id)
+
+    field_names = {}
+    cache_keys = {}
+    for datasource_id in versions:
+        metric_names, column_names = BaseDatasource.get_slices_field_names(
+            list(slices_by_datasource[datasource_id])
+        )
+        field_names[datasource_id] = (metric_names, column_names)
+        cache_keys[datasource_id] = "dataset_trimmed_payload_" + md5_sha_from_str(
+            json.dumps(
+                [
+                    cls_model.__name__,
+                    datasource_id,
+                    versions[datasource_id],
+                    owner_ids[datasource_id],
+                    sorted(metric_names, key=str),
+                    sorted(column_names, key=str),
+                ]
+            )
+        )
+
+    payloads = {}
+    if cache_keys:
+        try:
+            cached = cache_manager.cache.get_many(*cache_keys.values())
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to load dataset payloads from cache", exc_info=True)
+            cached = [None] * len(cache_keys)
+        payloads = {
+            datasource_id: payload
+            for datasource_id, payload in zip(cache_keys, cached)
+            if payload is not None
+        }
+
+    missing_ids = [id_ for id_ in cache_keys if id_ not in payloads]
+    if missing_ids:
+        datasources = (
+            db.session.query(cls_model)
+            .options(
+                subqueryload(cls_model.columns),
+                subqueryload(cls_model.metrics),
+                subqueryload(cls_model.owners),
+            )
+            .filter(cls_model.id.in_(missing_ids))
+        )
+        for datasource in datasources:
+            payload = datasource.data_for_fields(*field_names[datasource.id])
+            payloads[datasource.id] = payload
+            try:
+                cache_manager.cache.set(cache_keys[datasource.id], payload)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Failed to cache dataset payload", exc_info=True)
+
+    return payloads
+
+
 OnDashboardChange = Callable[[Mapper, Connection, Dashboard], Any]
 
 if is_feature_enabled("THUMBNAILS_SQLA_LISTENERS"):
@@ -851,11 +851,21 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
 
         return ";\n".join(str(statement) for statement in statements)
 
-    def get_query_str_extended(self, query_obj: QueryObjectDict) -> QueryStringExtended:
+    def get_query_str_extended(
+        self, query_obj: QueryObjectDict, reindent: bool = False
+    ) -> QueryStringExtended:
+        """
+        Compile the query object into executable SQL.
+
+        :param query_obj: The query object
+        :param reindent: Whether to pretty print the SQL, which is only useful when
+            the SQL is shown to users, and expensive for wide queries
+        """
         sqlaq = self.get_sqla_query(**query_obj)
         sql = self.database.compile_sqla_query(sqlaq.sqla_query)  # type: ignore
         sql = self._apply_cte(sql, sqlaq.cte)
-        sql = sqlparse.format(sql, reindent=True)
+        if reindent:
+            sql = sqlparse.format(sql, reindent=True)
         sql = self.mutate_query_from_config(sql)
         return QueryStringExtended(
             applied_template_filters=sqlaq.applied_template_filters,
@@ -1145,8 +1155,11 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
         return values
 
     def get_query_str(self, query_obj: QueryObjectDict) -> str:
-        query_str_ext = self.get_query_str_extended(query_obj)
-        all_queries = query_str_ext.prequeries + [query_str_ext.sql]
+        query_str_ext = self.get_query_str_extended(query_obj, reindent=True)
+        all_queries = [
+            sqlparse.format(prequery, reindent=True)
+            for prequery in query_str_ext.prequeries
+        ] + [query_str_ext.sql]
         return ";\n\n".join(all_queries) + ";"
 
     def _get_series_orderby(
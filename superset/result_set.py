@@ -19,7 +19,19 @@
 import datetime
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
@@ -85,19 +97,19 @@ def convert_to_string(value: Any) -> str:
 
 
 class SupersetResultSet:
+    # the number of rows converted to Arrow at a time
+    batch_size = 65536
+
     def __init__(  # pylint: disable=too-many-locals
         self,
-        data: DbapiResult,
+        data: Union[DbapiResult, pa.Table],
         cursor_description: DbapiDescription,
         db_engine_spec: Type[BaseEngineSpec],
     ):
         self.db_engine_spec = db_engine_spec
-        data = data or []
         column_names: List[str] = []
-        pa_data: List[pa.Array] = []
+        pa_data: List[Union[pa.Array, pa.ChunkedArray]] = []
         deduped_cursor_desc: List[Tuple[Any, ...]] = []
-        numpy_dtype: List[Tuple[str, ...]] = []
-        stringified_arr: np.ndarray
 
         if cursor_description:
             # get deduped list of column names
@@ -111,48 +123,47 @@ class SupersetResultSet:
                 for column_name, description in zip(column_names, cursor_description)
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
+        if isinstance(data, pa.Table):
+            # columnar results of drivers are used as they are
+            if not cursor_description:
+                column_names = dedup(
+                    [convert_to_string(name) for name in data.column_names]
+                )
+            if data.num_rows > 0:
+                pa_data = list(data.columns)
+            data = []
+        else:
+            data = data or []
+            if not isinstance(data, (list, tuple)):
+                data = list(data)
+            if data and column_names:
+                pa_data = self.rows_to_arrow(data, len(column_names))
 
         if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
+            for i in range(len(column_names)):
                 if pa.types.is_nested(pa_data[i].type):
                     # TODO: revisit nested column serialization once nested types
                     #  are added as a natively supported column type in Superset
                     #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
+                    values = (
+                        list(map(itemgetter(i), data))
+                        if data
+                        else pa_data[i].to_pylist()
+                    )
+                    pa_data[i] = pa.array([stringify(value) for value in values])
+
+                elif pa.types.is_temporal(pa_data[i].type) and data:
                     # workaround for bug converting
                     # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
                     # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
+                    sample = self.first_nonempty(map(itemgetter(i), data))
                     if sample and isinstance(sample, datetime.datetime):
                         try:
                             if sample.tzinfo:
                                 tz = sample.tzinfo
                                 series = pd.Series(
-                                    array[column], dtype="datetime64[ns]"
+                                    list(map(itemgetter(i), data)),
+                                    dtype="datetime64[ns]",
                                 )
                                 series = pd.to_datetime(series).dt.tz_localize(tz)
                                 pa_data[i] = pa.Array.from_pandas(
@@ -176,6 +187,74 @@ class SupersetResultSet:
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+    @staticmethod
+    def column_to_arrow(values: Sequence[Any]) -> pa.Array:
+        """
+        Convert the values of a column to an Arrow array, serializing the values as
+        strings if their type isn't supported.
+        """
+        try:
+            return pa.array(values)
+        except (
+            pa.lib.ArrowInvalid,
+            pa.lib.ArrowTypeError,
+            pa.lib.ArrowNotImplementedError,
+            TypeError,  # this is super hackey,
+            # https://issues.apache.org/jira/browse/ARROW-7855
+        ):
+            # attempt serialization of values as strings
+            return pa.array([stringify(value) for value in values])
+
+    @classmethod
+    def rows_to_arrow(
+        cls, data: DbapiResult, num_columns: int
+    ) -> List[Union[pa.Array, pa.ChunkedArray]]:
+        """
+        Convert rows to Arrow columns, ``batch_size`` rows at a time.
+
+        Each batch of rows is transposed and converted to Arrow directly, so that
+        only a batch of values is ever held in intermediate Python lists. The type of
+        a column is inferred from its first batch with values, when a later batch
+        infers another type the whole column is converted at once instead.
+
+        :param data: The rows
+        :param num_columns: The number of columns of the rows
+        :returns: The Arrow columns
+        """
+        chunks: List[List[pa.Array]] = [[] for _ in range(num_columns)]
+        types: List[Optional[pa.DataType]] = [None] * num_columns
+        # columns whose values can't be converted a batch at a time
+        whole_columns: Set[int] = set()
+
+        for start in range(0, len(data), cls.batch_size):
+            batch = data[start : start + cls.batch_size]
+            for i in range(num_columns):
+                if i in whole_columns:
+                    continue
+                chunk = cls.column_to_arrow(list(map(itemgetter(i), batch)))
+                if pa.types.is_null(chunk.type):
+                    chunks[i].append(chunk)
+                elif types[i] is None or types[i] == chunk.type:
+                    types[i] = chunk.type
+                    chunks[i].append(chunk)
+                else:
+                    whole_columns.add(i)
+                    chunks[i] = []
+
+        pa_data: List[Union[pa.Array, pa.ChunkedArray]] = []
+        for i in range(num_columns):
+            if i in whole_columns:
+                pa_data.append(cls.column_to_arrow(list(map(itemgetter(i), data))))
+            else:
+                type_ = types[i] or pa.null()
+                # batches of nulls only are of the null type
+                pa_data.append(
+                    pa.chunked_array(
+                        [chunk.cast(type_) for chunk in chunks[i]], type=type_
+                    )
+                )
+        return pa_data
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
@@ -198,7 +277,7 @@ class SupersetResultSet:
             return table.to_pandas(integer_object_nulls=True, timestamp_as_object=True)
 
     @staticmethod
-    def first_nonempty(items: List[Any]) -> Any:
+    def first_nonempty(items: Iterable[Any]) -> Any:
         return next((i for i in items if i), None)
 
     def is_temporal(self, db_type_str: Optional[str]) -> bool:
@@ -19,21 +19,25 @@
 import logging
 import re
 import time
+import uuid
 from collections import defaultdict
 from typing import (
     Any,
     Callable,
     cast,
     Dict,
+    FrozenSet,
     List,
     NamedTuple,
     Optional,
     Set,
+    Tuple,
     TYPE_CHECKING,
+    TypeVar,
     Union,
 )
 
-from flask import current_app, Flask, g, Request
+from flask import current_app, Flask, g, has_app_context, Request
 from flask_appbuilder import Model
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.sqla.manager import SecurityManager
@@ -56,11 +60,11 @@ from flask_appbuilder.security.views import (
 from flask_appbuilder.widgets import ListWidget
 from flask_login import AnonymousUserMixin, LoginManager
 from jwt.api_jwt import _jwt_global_obj
-from sqlalchemy import and_, inspect, or_
+from sqlalchemy import and_, event, inspect, or_
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import object_session, Session, SessionTransaction
+from sqlalchemy.orm.exc import UnmappedInstanceError
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.query import Query as SqlaQuery
 
 from superset import sql_parse
 from superset.constants import RouteMethod
@@ -83,6 +87,7 @@ from superset.utils.core import (
     get_user_id,
     RowLevelSecurityFilterType,
 )
+from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.urls import get_url_host
 
 if TYPE_CHECKING:
@@ -97,12 +102,156 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_PENDING_INVALIDATIONS = "security_cache_invalidations"
+
+
+def _get_cached_security_lookup(
+    namespace: str, key: str, load: Callable[[], T], timeout: Optional[int]
+) -> T:
+    """
+    Memoize the result of a security lookup against the metadata database for the
+    duration of the request, and, if a timeout is set, cache it across requests in
+    the default cache.
+
+    Cache keys include a version per namespace, so that all the cached lookups of
+    a namespace can be invalidated at once with ``_invalidate_security_cache``.
+
+    :param namespace: The kind of lookup, eg, "rls_filters"
+    :param key: The key of the lookup within the namespace
+    :param load: A callable performing the lookup
+    :param timeout: The timeout of the cached lookup, not cached across requests
+        if None
+    :returns: The result of the lookup
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import cache_manager
+
+    memo = getattr(g, f"{namespace}_memo", None)
+    if not isinstance(memo, dict):
+        memo = {}
+        setattr(g, f"{namespace}_memo", memo)
+    if key in memo:
+        return memo[key]
+
+    if timeout is None:
+        memo[key] = load()
+        return memo[key]
+
+    cache_key = None
+    value = None
+    try:
+        version = cache_manager.cache.get(f"{namespace}/version")
+        if version is None:
+            # the version was evicted or never set: start a new one, unless another
+            # process just did, and skip the cache if the backend doesn't keep it
+            cache_manager.cache.add(f"{namespace}/version", uuid.uuid4().hex, timeout=0)
+            version = cache_manager.cache.get(f"{namespace}/version")
+        if version is not None:
+            cache_key = f"{namespace}/{version}/{key}"
+            value = cache_manager.cache.get(cache_key)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Could not read the %s cache", namespace, exc_info=True)
+
+    if value is None:
+        value = load()
+        if cache_key:
+            try:
+                cache_manager.cache.set(cache_key, value, timeout=timeout)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not write the %s cache", namespace, exc_info=True)
+
+    memo[key] = value
+    return value
+
+
+def _invalidate_security_cache(namespace: str) -> None:
+    """
+    Invalidate all the cached security lookups of a namespace, by bumping the
+    version that is part of their cache keys.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import cache_manager
+
+    try:
+        cache_manager.cache.set(f"{namespace}/version", uuid.uuid4().hex, timeout=0)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Could not invalidate the %s cache", namespace, exc_info=True)
+    if has_app_context():
+        g.pop(f"{namespace}_memo", None)
+
+
+def _invalidate_security_cache_on_commit(namespace: str, target: Any) -> None:
+    """
+    Invalidate all the cached security lookups of a namespace once the session
+    changing ``target`` commits.
+
+    Called from flush-time SQLAlchemy events: bumping the version right away would
+    let a concurrent request cache the not yet committed state under the new
+    version. Targets that don't belong to a session, eg, the ones created by
+    ``set_perm``, are tied to the current session.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import db
+
+    try:
+        session = object_session(target)
+    except UnmappedInstanceError:
+        session = None
+    session = session or db.session
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(namespace)
+    if has_app_context():
+        g.pop(f"{namespace}_memo", None)
+
+
+def _invalidate_permissions_cache_on_change(  # pylint: disable=unused-argument
+    mapper: Mapper, connection: Connection, target: Model
+) -> None:
+    _invalidate_security_cache_on_commit("permissions", target)
+
+
+# The permission snapshots are invalidated by listeners of their own, rather than by
+# the hooks of the security manager that custom security managers override. Changes
+# made with the connection of a flush, eg, the renaming of the view menus of
+# datasets, are covered by the security manager itself.
+event.listen(
+    Role, "after_update", _invalidate_permissions_cache_on_change, propagate=True
+)
+event.listen(
+    PermissionView,
+    "after_delete",
+    _invalidate_permissions_cache_on_change,
+    propagate=True,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending_security_caches(session: Session) -> None:
+    for namespace in session.info.pop(_PENDING_INVALIDATIONS, set()):
+        _invalidate_security_cache(namespace)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_security_caches(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    # savepoints rolling back leave the changes of the outer transaction pending
+    if not session.in_transaction():
+        session.info.pop(_PENDING_INVALIDATIONS, None)
+
 
 class DatabaseAndSchema(NamedTuple):
     database: str
     schema: str
 
 
+class RowLevelSecurityFilterRule(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
+
 class SupersetSecurityListWidget(ListWidget):  # pylint: disable=too-few-public-methods
     """
     Redeclaring to avoid circular imports
@@ -311,6 +460,83 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             return self.is_item_public(permission_name, view_name)
         return self._has_view_access(user, permission_name, view_name)
 
+    def _has_view_access(
+        self, user: object, permission_name: str, view_name: str
+    ) -> bool:
+        """
+        Return True if the user has the FAB permission/view, False otherwise.
+
+        Unlike the FAB implementation this doesn't query the metadata database for
+        every check, but looks the permission up in the snapshot of the permissions
+        of the user's roles.
+        """
+        db_role_ids = []
+        # First check against builtin (statically configured) roles
+        for role in user.roles:  # type: ignore
+            if role.name in self.builtin_roles:
+                if self._has_access_builtin_roles(role, permission_name, view_name):
+                    return True
+            else:
+                db_role_ids.append(role.id)
+
+        return (permission_name, view_name) in self.get_permissions_snapshot(
+            db_role_ids
+        )
+
+    def get_permissions_snapshot(
+        self, role_ids: List[int]
+    ) -> FrozenSet[Tuple[str, str]]:
+        """
+        Return the (permission, view menu) pairs granted to a set of roles.
+
+        Snapshots are memoized for the duration of the request, and cached across
+        requests in the default cache until permissions or roles change.
+
+        :param role_ids: The IDs of the roles
+        :returns: The set of (permission name, view menu name) pairs
+        """
+        if not role_ids:
+            return frozenset()
+
+        role_ids = sorted(set(role_ids))
+        return _get_cached_security_lookup(
+            "permissions",
+            ",".join(str(role_id) for role_id in role_ids),
+            lambda: frozenset(
+                (row.permission_name, row.view_menu_name)
+                for row in self._query_permissions(role_ids)
+            ),
+            current_app.config["PERMISSIONS_CACHE_TIMEOUT"],
+        )
+
+    def _query_permissions(self, role_ids: List[int]) -> List[Any]:
+        """
+        Query the permissions granted to a set of roles from the metadata database.
+
+        :param role_ids: The IDs of the roles
+        :returns: A list of (permission_name, view_menu_name) rows
+        """
+        return (
+            self.get_session.query(
+                self.permission_model.name.label("permission_name"),
+                self.viewmenu_model.name.label("view_menu_name"),
+            )
+            .select_from(self.permissionview_model)
+            .join(self.permission_model)
+            .join(self.viewmenu_model)
+            .join(assoc_permissionview_role)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+            .distinct()
+            .all()
+        )
+
+    @staticmethod
+    def invalidate_permissions_cache() -> None:
+        """
+        Invalidate the cached permission snapshots of all the roles.
+        """
+        _invalidate_security_cache("permissions")
+
     def can_access_all_queries(self) -> bool:
         """
         Return True if the user can access all SQL Lab queries, False otherwise.
@@ -533,35 +759,21 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> Set[str]:
-        base_query = (
-            self.get_session.query(self.viewmenu_model.name)
-            .join(self.permissionview_model)
-            .join(self.permission_model)
-            .join(assoc_permissionview_role)
-            .join(self.role_model)
-        )
-
+        role_ids: List[int] = []
         if not g.user.is_anonymous:
-            # filter by user id
-            view_menu_names = (
-                base_query.join(assoc_user_role)
-                .join(self.user_model)
-                .filter(self.user_model.id == get_user_id())
-                .filter(self.permission_model.name == permission_name)
-            ).all()
-            return {s.name for s in view_menu_names}
-
+            # only users persisted in the metadata database (eg, not guest users)
+            # have roles with permissions
+            if get_user_id() is not None:
+                role_ids = [role.id for role in g.user.roles]
         # Properly treat anonymous user
-        public_role = self.get_public_role()
-        if public_role:
-            # filter by public role
-            view_menu_names = (
-                base_query.filter(self.role_model.id == public_role.id).filter(
-                    self.permission_model.name == permission_name
-                )
-            ).all()
-            return {s.name for s in view_menu_names}
-        return set()
+        elif public_role := self.get_public_role():
+            role_ids = [public_role.id]
+
+        return {
+            view_menu_name
+            for permission, view_menu_name in self.get_permissions_snapshot(role_ids)
+            if permission == permission_name
+        }
 
     def get_schemas_accessible_by_user(
         self, database: "Database", schemas: List[str], hierarchical: bool = True
@@ -1107,6 +1319,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         )
 
         self.on_view_menu_after_update(mapper, connection, new_db_view_menu)
+        _invalidate_security_cache_on_commit("permissions", new_db_view_menu)
         return new_db_view_menu
 
     def _update_vm_datasources_access(  # pylint: disable=too-many-locals
@@ -1178,6 +1391,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                 .values(perm=new_dataset_vm_name)
             )
             self.on_view_menu_after_update(mapper, connection, new_dataset_view_menu)
+            _invalidate_security_cache_on_commit("permissions", new_dataset_view_menu)
             updated_view_menus.append(new_dataset_view_menu)
         return updated_view_menus
 
@@ -1433,6 +1647,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         # VM changed, so call hook
         new_dataset_view_menu = self.find_view_menu(new_permission_name)
         self.on_view_menu_after_update(mapper, connection, new_dataset_view_menu)
+        _invalidate_security_cache_on_commit("permissions", new_dataset_view_menu)
         # Update dataset (SqlaTable perm field)
         connection.execute(
             sqlatable_table.update()
@@ -1492,6 +1707,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             )
         )
         self.on_permission_view_after_delete(mapper, connection, pvm)
+        _invalidate_security_cache_on_commit("permissions", pvm)
         connection.execute(
             view_menu_table.delete().where(view_menu_table.c.id == pvm.view_menu_id)
         )
@@ -1858,11 +2074,37 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource") -> List[SqlaQuery]:
+    def get_user_permissions_key(self) -> str:
+        """
+        Return a key identifying the permissions and the row level security filters of
+        the current user, shared by the users with the same roles, so that responses
+        depending on them can be cached.
+
+        :returns: The key of the permissions of the user
+        """
+        roles_key = ",".join(sorted(str(role.id) for role in self.get_user_roles()))
+        guest_user = self.get_current_guest_user_if_guest()
+        if guest_user:
+            return "guest:" + md5_sha_from_dict(
+                {
+                    "roles": roles_key,
+                    "resources": guest_user.resources,
+                    "rls": guest_user.rls,
+                }
+            )
+        return roles_key
+
+    def get_rls_filters(
+        self, table: "BaseDatasource"
+    ) -> List[RowLevelSecurityFilterRule]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
 
+        Filters are memoized for the duration of the request, and cached across
+        requests by role set and table in the default cache until any row level
+        security filter changes.
+
         :param table: The table to check against
         :returns: A list of filters
         """
@@ -1870,6 +2112,26 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         if not (hasattr(g, "user") and g.user is not None):
             return []
 
+        user_roles = sorted(role.id for role in self.get_user_roles(g.user))
+        return _get_cached_security_lookup(
+            "rls_filters",
+            f"{table.id}/{','.join(str(role_id) for role_id in user_roles)}",
+            lambda: [
+                RowLevelSecurityFilterRule(*row)
+                for row in self._query_rls_filters(user_roles, table.id)
+            ],
+            current_app.config["RLS_FILTERS_CACHE_TIMEOUT"],
+        )
+
+    def _query_rls_filters(self, user_roles: List[int], table_id: int) -> List[Any]:
+        """
+        Query the row level security filters of a set of roles for a table from the
+        metadata database.
+
+        :param user_roles: The role IDs to check against
+        :param table_id: The table ID to check against
+        :returns: A list of (id, group_key, clause) rows
+        """
         # pylint: disable=import-outside-toplevel
         from superset.connectors.sqla.models import (
             RLSFilterRoles,
@@ -1877,7 +2139,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             RowLevelSecurityFilter,
         )
 
-        user_roles = [role.id for role in self.get_user_roles(g.user)]
         regular_filter_roles = (
             self.get_session()
             .query(RLSFilterRoles.c.rls_filter_id)
@@ -1899,7 +2160,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         filter_tables = (
             self.get_session()
             .query(RLSFilterTables.c.rls_filter_id)
-            .filter(RLSFilterTables.c.table_id == table.id)
+            .filter(RLSFilterTables.c.table_id == table_id)
         )
         query = (
             self.get_session()
@@ -1926,6 +2187,19 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         )
         return query.all()
 
+    def on_rls_filter_after_change(  # pylint: disable=unused-argument
+        self, mapper: Mapper, connection: Connection, target: Model
+    ) -> None:
+        """
+        Hook invalidating the cached row level security filters when a filter, or
+        the roles and tables it is associated with, change.
+
+        :param mapper: The table mapper
+        :param connection: The DB-API connection
+        :param target: The mapped instance being changed
+        """
+        _invalidate_security_cache_on_commit("rls_filters", target)
+
     def get_rls_ids(self, table: "BaseDatasource") -> List[int]:
         """
         Retrieves the appropriate row level security filters IDs for the current user
@@ -19,13 +19,15 @@ import logging
 import uuid
 from contextlib import closing
 from datetime import datetime
+from functools import partial
 from sys import getsizeof
-from typing import Any, cast, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, cast, Dict, List, Optional, Tuple, Union
 
 import backoff
 import msgpack
 import pyarrow as pa
 import simplejson as json
+import sqlparse
 from celery import Task
 from celery.exceptions import SoftTimeLimitExceeded
 from flask_babel import gettext as __
@@ -50,12 +52,12 @@ from superset.result_set import SupersetResultSet
 from superset.sql_parse import CtasMethod, insert_rls, ParsedQuery
 from superset.sqllab.limiting_factor import LimitingFactor
 from superset.utils.celery import session_scope
+from superset.utils.compression import compress
 from superset.utils.core import (
     get_username,
     json_iso_dttm_ser,
     override_user,
     QuerySource,
-    zlib_compress,
 )
 from superset.utils.dates import now_as_float
 from superset.utils.decorators import stats_timing
@@ -199,8 +201,15 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
     cursor: Any,
     log_params: Optional[Dict[str, Any]],
     apply_ctas: bool = False,
+    on_first_batch: Optional[Callable[[SupersetResultSet], None]] = None,
 ) -> SupersetResultSet:
-    """Executes a single SQL statement"""
+    """
+    Executes a single SQL statement
+
+    When ``on_first_batch`` is set and ``SQLLAB_RESULTS_FETCH_BATCH_SIZE`` is
+    configured, the results are fetched in batches and ``on_first_batch`` is called
+    with the rows of the first batch as soon as they're fetched.
+    """
     database: Database = query.database
     db_engine_spec = database.db_engine_spec
 
@@ -210,7 +219,9 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
         parsed_query = ParsedQuery(
             str(
                 insert_rls(
-                    parsed_query._parsed[0],  # pylint: disable=protected-access
+                    # parse the statement again, since RLS is inserted inplace and
+                    # parsed statements are shared between instances
+                    sqlparse.parse(parsed_query.stripped())[0],
                     database.id,
                     query.schema,
                 )
@@ -286,7 +297,23 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
                 query.id,
                 str(query.to_dict()),
             )
-            data = db_engine_spec.fetch_data(cursor, increased_limit)
+            batch_size = config["SQLLAB_RESULTS_FETCH_BATCH_SIZE"]
+            if on_first_batch and batch_size:
+                data = []
+                for batch in db_engine_spec.fetch_data_in_batches(
+                    cursor, batch_size, increased_limit
+                ):
+                    if not data:
+                        on_first_batch(
+                            SupersetResultSet(
+                                batch[: query.limit] if query.limit else batch,
+                                cursor.description,
+                                db_engine_spec,
+                            )
+                        )
+                    data.extend(batch)
+            else:
+                data = db_engine_spec.fetch_data(cursor, increased_limit)
             if query.limit is None or len(data) <= query.limit:
                 query.limiting_factor = LimitingFactor.NOT_LIMITED
             else:
@@ -385,6 +412,133 @@ def _serialize_and_expand_data(
     return (data, selected_columns, all_columns, expanded_columns)
 
 
+def _get_results_timeout(database: Database) -> int:
+    if database.cache_timeout is None:
+        return config["CACHE_DEFAULT_TIMEOUT"]
+    return database.cache_timeout
+
+
+def _compress_payload(data: Union[bytes, str]) -> bytes:
+    return compress(
+        data,
+        codec=config["RESULTS_BACKEND_COMPRESSION"],
+        min_size=config["RESULTS_BACKEND_COMPRESSION_MIN_SIZE"],
+        level=config["RESULTS_BACKEND_COMPRESSION_LEVEL"],
+    )
+
+
+def _store_results(key: str, payload: Dict[str, Any], database: Database) -> None:
+    """Serialize, compress and write a results payload to the results backend"""
+    with stats_timing("sqllab.query.results_backend_write", stats_logger):
+        with stats_timing(
+            "sqllab.query.results_backend_write_serialization", stats_logger
+        ):
+            serialized_payload = _serialize_payload(
+                payload, cast(bool, results_backend_use_msgpack)
+            )
+
+        with stats_timing(
+            "sqllab.query.results_backend_write_compression", stats_logger
+        ):
+            compressed = _compress_payload(serialized_payload)
+        logger.debug("*** serialized payload size: %i", getsizeof(serialized_payload))
+        logger.debug("*** compressed payload size: %i", getsizeof(compressed))
+        results_backend.set(key, compressed, _get_results_timeout(database))
+
+
+def _store_paged_results(
+    key: str,
+    payload: Dict[str, Any],
+    result_set: SupersetResultSet,
+    database: Database,
+    page_size: int,
+) -> None:
+    """
+    Write results to the results backend as pages of ``page_size`` rows, each under
+    its own key, and a manifest under ``key``.
+
+    The manifest is the results payload without its data, with the keys of the pages
+    under ``pages``, so that the rows can be read a page at a time.
+    """
+    use_msgpack = cast(bool, results_backend_use_msgpack)
+    num_rows = result_set.size if use_msgpack else len(payload["data"])
+    page_keys: List[str] = []
+    with stats_timing("sqllab.query.results_backend_write_pages", stats_logger):
+        for start in range(0, num_rows, page_size):
+            page: Union[bytes, str]
+            if use_msgpack:
+                page = (
+                    pa.default_serialization_context()
+                    .serialize(result_set.pa_table.slice(start, page_size))
+                    .to_buffer()
+                    .to_pybytes()
+                )
+            else:
+                page = json.dumps(
+                    payload["data"][start : start + page_size],
+                    default=json_iso_dttm_ser,
+                    ignore_nan=True,
+                )
+            page_key = f"{key}-{len(page_keys)}"
+            results_backend.set(
+                page_key, _compress_payload(page), _get_results_timeout(database)
+            )
+            page_keys.append(page_key)
+
+    manifest = {
+        **payload,
+        "data": None,
+        "pages": {"keys": page_keys, "page_size": page_size, "rows": num_rows},
+    }
+    _store_results(key, manifest, database)
+
+
+def _store_first_batch(
+    query: Query,
+    session: Session,
+    expand_data: bool,
+    result_set: SupersetResultSet,
+) -> None:
+    """
+    Store the first batch of rows of a running query in the results backend, under
+    the results key its whole results are stored with once they're fetched.
+    """
+    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
+        result_set,
+        query.database.db_engine_spec,
+        cast(bool, results_backend_use_msgpack),
+        expand_data,
+    )
+    key = str(uuid.uuid4())
+    payload: Dict[str, Any] = {
+        "query_id": query.id,
+        "status": QueryStatus.RUNNING,
+        "data": data,
+        "columns": all_columns,
+        "selected_columns": selected_columns,
+        "expanded_columns": expanded_columns,
+        "query": query.to_dict(),
+    }
+    payload["query"]["resultsKey"] = key
+    logger.info(
+        "Query %s: Storing the first %i rows in results backend, key: %s",
+        str(query.id),
+        result_set.size,
+        key,
+    )
+    _store_results(key, payload, query.database)
+    query.results_key = key
+    session.commit()
+
+
+def _discard_first_batch(query: Query, session: Session) -> None:
+    """Remove the first batch of rows of a query that didn't complete"""
+    if query.results_key and results_backend:
+        results_backend.delete(query.results_key)
+        query.results_key = None
+        session.commit()
+
+
 def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-locals, too-many-statements, too-many-branches
     query_id: int,
     rendered_query: str,
@@ -490,6 +644,16 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
                 or (query.ctas_method == CtasMethod.TABLE and i == len(statements) - 1)
             )
 
+            # The rows of the last statement can be shown while they're fetched
+            on_first_batch = (
+                partial(_store_first_batch, query, session, expand_data)
+                if store_results
+                and results_backend
+                and not query.select_as_cta
+                and i == statement_count - 1
+                else None
+            )
+
             # Run statement
             msg = f"Running statement {i+1} out of {statement_count}"
             logger.info("Query %s: %s", str(query_id), msg)
@@ -503,11 +667,14 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
                     cursor,
                     log_params,
                     apply_ctas,
+                    on_first_batch,
                 )
             except SqlLabQueryStoppedException:
+                _discard_first_batch(query, session)
                 payload.update({"status": QueryStatus.STOPPED})
                 return payload
             except Exception as ex:  # pylint: disable=broad-except
+                _discard_first_batch(query, session)
                 msg = str(ex)
                 prefix_message = (
                     f"[Statement {i+1} out of {statement_count}]"
@@ -537,48 +704,57 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         )
     query.end_time = now_as_float()
 
-    use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
-
-    # TODO: data should be saved separately from metadata (likely in Parquet)
-    payload.update(
-        {
-            "status": QueryStatus.SUCCESS,
-            "data": data,
-            "columns": all_columns,
-            "selected_columns": selected_columns,
-            "expanded_columns": expanded_columns,
-            "query": query.to_dict(),
-        }
-    )
-    payload["query"]["state"] = QueryStatus.SUCCESS
+    try:
+        use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
+        page_size = config["SQLLAB_RESULTS_PAGE_SIZE"]
+        data: Optional[Union[bytes, str]]
+        if use_arrow_data and page_size and results_backend:
+            # the pages are serialized from slices of the arrow table, and the
+            # manifest is stored without data, so don't serialize the whole table
+            data = None
+            selected_columns = all_columns = result_set.columns
+            expanded_columns: List[Any] = []
+        else:
+            (
+                data,
+                selected_columns,
+                all_columns,
+                expanded_columns,
+            ) = _serialize_and_expand_data(
+                result_set, db_engine_spec, use_arrow_data, expand_data
+            )
 
-    if store_results and results_backend:
-        key = str(uuid.uuid4())
-        payload["query"]["resultsKey"] = key
-        logger.info(
-            "Query %s: Storing results in results backend, key: %s", str(query_id), key
+        # TODO: data should be saved separately from metadata (likely in Parquet)
+        payload.update(
+            {
+                "status": QueryStatus.SUCCESS,
+                "data": data,
+                "columns": all_columns,
+                "selected_columns": selected_columns,
+                "expanded_columns": expanded_columns,
+                "query": query.to_dict(),
+            }
         )
-        with stats_timing("sqllab.query.results_backend_write", stats_logger):
-            with stats_timing(
-                "sqllab.query.results_backend_write_serialization", stats_logger
-            ):
-                serialized_payload = _serialize_payload(
-                    payload, cast(bool, results_backend_use_msgpack)
-                )
-            cache_timeout = database.cache_timeout
-            if cache_timeout is None:
-                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
-
-            compressed = zlib_compress(serialized_payload)
-            logger.debug(
-                "*** serialized payload size: %i", getsizeof(serialized_payload)
+        payload["query"]["state"] = QueryStatus.SUCCESS
+
+        if store_results and results_backend:
+            # the first batch of rows may already be stored under a results key
+            key = query.results_key or str(uuid.uuid4())
+            payload["query"]["resultsKey"] = key
+            logger.info(
+                "Query %s: Storing results in results backend, key: %s",
+                str(query_id),
+                key,
             )
-            logger.debug("*** compressed payload size: %i", getsizeof(compressed))
-            results_backend.set(key, compressed, cache_timeout)
-        query.results_key = key
+            if page_size:
+                _store_paged_results(key, payload, result_set, database, page_size)
+            else:
+                _store_results(key, payload, database)
+            query.results_key = key
+    except Exception:
+        # don't leave the first batch of rows behind for a query that failed
+        _discard_first_batch(query, session)
+        raise
 
     query.status = QueryStatus.SUCCESS
     session.commit()
@@ -18,7 +18,8 @@ import logging
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, cast, Iterator, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, cast, Dict, Iterator, List, Optional, Set, Tuple
 from urllib import parse
 
 import sqlparse
@@ -28,6 +29,7 @@ from sqlparse.sql import (
     IdentifierList,
     Parenthesis,
     remove_quotes,
+    Statement,
     Token,
     TokenList,
     Where,
@@ -56,6 +58,22 @@ RESULT_OPERATIONS = {"UNION", "INTERSECT", "EXCEPT", "SELECT"}
 ON_KEYWORD = "ON"
 PRECEDES_TABLE_NAME = {"FROM", "JOIN", "DESCRIBE", "WITH", "LEFT JOIN", "RIGHT JOIN"}
 CTE_PREFIX = "CTE__"
+# Clauses that follow WHERE, ie, a WHERE clause can't be appended after them
+CLAUSES_AFTER_WHERE = {
+    "EXCEPT",
+    "FETCH",
+    "GROUP BY",
+    "HAVING",
+    "INTERSECT",
+    "LIMIT",
+    "OFFSET",
+    "ORDER BY",
+    "UNION",
+    "UNION ALL",
+    "WINDOW",
+}
+# Number of distinct SQL strings whose parsed statements are kept in memory
+PARSE_CACHE_SIZE = 256
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +88,35 @@ sqlparse.keywords.SQL_REGEX.insert(
 )
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(sql: str) -> Tuple[Statement, ...]:
+    """
+    Parse a SQL string into statements, caching the result.
+
+    The same statement is typically parsed several times while it's executed (limit
+    detection, table extraction for access checks, DML checks, etc.), so the parsed
+    statements are kept in a bounded LRU cache. The returned statements are shared
+    and must not be modified; parse the SQL with ``sqlparse.parse`` instead when the
+    token tree is to be changed inplace.
+
+    :param sql: The SQL string
+    :returns: The parsed statements
+    """
+    logger.debug("Parsing with sqlparse statement: %s", sql)
+    return tuple(sqlparse.parse(sql))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _strip_comments(sql: str) -> str:
+    """
+    Strip the comments from a SQL string, caching the result.
+
+    :param sql: The SQL string
+    :returns: The SQL string without comments
+    """
+    return sqlparse.format(sql, strip_comments=True)
+
+
 class CtasMethod(str, Enum):
     TABLE = "TABLE"
     VIEW = "VIEW"
@@ -161,6 +208,53 @@ def strip_comments_from_sql(statement: str) -> str:
     return ParsedQuery(statement).strip_comments() if "--" in statement else statement
 
 
+def extract_column_aliases(sql: str) -> Optional[Dict[str, str]]:
+    """
+    Return the expressions of the aliased columns of a ``SELECT ... FROM ...``
+    statement a WHERE clause can be appended to, keyed by alias.
+
+        >>> extract_column_aliases("SELECT a.x a_x, a.y AS a_y, z FROM a")
+        {'a_x': 'a.x', 'a_y': 'a.y'}
+        >>> extract_column_aliases("SELECT a.x a_x FROM a LIMIT 10") is None
+        True
+
+    :param sql: The SQL statement
+    :returns: The column expressions keyed by alias, or None if the statement isn't
+        a single SELECT, or already has a WHERE, GROUP BY, LIMIT, etc. clause
+    """
+    statements = _parse(sql.strip(" \t\n;"))
+    if len(statements) != 1 or statements[0].get_type() != "SELECT":
+        return None
+
+    statement = statements[0]
+    if any(
+        isinstance(token, Where)
+        or (token.ttype in Keyword and token.normalized in CLAUSES_AFTER_WHERE)
+        for token in statement.tokens
+    ):
+        return None
+
+    idx, _ = statement.token_next_by(m=(DML, "SELECT"))
+    _, columns = statement.token_next(idx)
+    identifiers = (
+        columns.get_identifiers() if isinstance(columns, IdentifierList) else [columns]
+    )
+
+    aliases: Dict[str, str] = {}
+    for identifier in identifiers:
+        if not isinstance(identifier, Identifier) or not identifier.has_alias():
+            continue
+        # drop the alias, and the optional AS keyword preceding it
+        tokens = identifier.tokens[:-1]
+        while tokens and (
+            tokens[-1].is_whitespace or imt(tokens[-1], m=(Keyword, "AS"))
+        ):
+            tokens.pop()
+        aliases[identifier.get_alias()] = "".join(str(token) for token in tokens)
+
+    return aliases
+
+
 @dataclass(eq=True, frozen=True)
 class Table:
     """
@@ -189,21 +283,21 @@ class Table:
 class ParsedQuery:
     def __init__(self, sql_statement: str, strip_comments: bool = False):
         if strip_comments:
-            sql_statement = sqlparse.format(sql_statement, strip_comments=True)
+            sql_statement = _strip_comments(sql_statement)
 
         self.sql: str = sql_statement
-        self._tables: Set[Table] = set()
+        self._tables: Optional[Set[Table]] = None
         self._alias_names: Set[str] = set()
         self._limit: Optional[int] = None
+        self._limit_extracted = False
+        self._is_select: Optional[bool] = None
 
-        logger.debug("Parsing with sqlparse statement: %s", self.sql)
-        self._parsed = sqlparse.parse(self.stripped())
-        for statement in self._parsed:
-            self._limit = _extract_limit_from_query(statement)
+        self._parsed = _parse(self.stripped())
 
     @property
     def tables(self) -> Set[Table]:
-        if not self._tables:
+        if self._tables is None:
+            self._tables = set()
             for statement in self._parsed:
                 self._extract_from_token(statement)
 
@@ -214,11 +308,20 @@ class ParsedQuery:
 
     @property
     def limit(self) -> Optional[int]:
+        if not self._limit_extracted:
+            for statement in self._parsed:
+                self._limit = _extract_limit_from_query(statement)
+            self._limit_extracted = True
         return self._limit
 
     def is_select(self) -> bool:
+        if self._is_select is None:
+            self._is_select = self._is_select_statement()
+        return self._is_select
+
+    def _is_select_statement(self) -> bool:
         # make sure we strip comments; prevents a bug with coments in the CTE
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = _parse(self.strip_comments())
         if parsed[0].get_type() == "SELECT":
             return True
 
@@ -241,27 +344,23 @@ class ParsedQuery:
         )
 
     def is_valid_ctas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = _parse(self.strip_comments())
         return parsed[-1].get_type() == "SELECT"
 
     def is_valid_cvas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = _parse(self.strip_comments())
         return len(parsed) == 1 and parsed[0].get_type() == "SELECT"
 
     def is_explain(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
 
         # Explain statements will only be the first statement
         return statements_without_comments.upper().startswith("EXPLAIN")
 
     def is_with(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
 
         isInsertStatements = statements_without_comments.upper().__contains__(
             "INSERT INTO"
@@ -275,17 +374,13 @@ class ParsedQuery:
 
     def is_show(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
         # Show statements will only be the first statement
         return statements_without_comments.upper().startswith("SHOW")
 
     def is_set(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
         # Set statements will only be the first statement
         return statements_without_comments.upper().startswith("SET")
 
@@ -296,7 +391,7 @@ class ParsedQuery:
         return self.sql.strip(" \t\n;")
 
     def strip_comments(self) -> str:
-        return sqlparse.format(self.stripped(), strip_comments=True)
+        return _strip_comments(self.stripped())
 
     def get_statements(self) -> List[str]:
         """Returns a list of SQL statements as strings, stripped"""
@@ -444,7 +539,7 @@ class ParsedQuery:
         :param new_limit: Limit to be incorporated into returned query
         :return: The original query with new limit
         """
-        if not self._limit:
+        if not self.limit:
             return f"{self.stripped()}\nLIMIT {new_limit}"
         limit_pos = None
         statement = self._parsed[0]
@@ -453,18 +548,21 @@ class ParsedQuery:
             if item.ttype in Keyword and item.value.lower() == "limit":
                 limit_pos = pos
                 break
-        _, limit = statement.token_next(idx=limit_pos)
-        # Override the limit only when it exceeds the configured value.
+        limit_idx, limit = statement.token_next(idx=limit_pos)
+        # Override the limit only when it exceeds the configured value. The parsed
+        # statement is shared with other instances, so the limit token is replaced
+        # in the output rather than modified inplace.
+        limit_value = limit.value
         if limit.ttype == sqlparse.tokens.Literal.Number.Integer and (
             force or new_limit < int(limit.value)
         ):
-            limit.value = new_limit
+            limit_value = new_limit
         elif limit.is_group:
-            limit.value = f"{next(limit.get_identifiers())}, {new_limit}"
+            limit_value = f"{next(limit.get_identifiers())}, {new_limit}"
 
         str_res = ""
-        for i in statement.tokens:
-            str_res += str(i.value)
+        for pos, item in enumerate(statement.tokens):
+            str_res += str(limit_value if pos == limit_idx else item.value)
         return str_res
 
 
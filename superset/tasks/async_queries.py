@@ -59,11 +59,22 @@ def _create_query_context_from_form(form_data: Dict[str, Any]) -> QueryContext:
         raise error
 
 
+def _update_job(job_metadata: Dict[str, Any], status: str, **kwargs: Any) -> None:
+    # the refreshes of stale cached results aren't async query jobs
+    if "job_id" in job_metadata:
+        async_query_manager.update_job(job_metadata, status, **kwargs)
+
+
 @celery_app.task(name="load_chart_data_into_cache", soft_time_limit=query_timeout)
 def load_chart_data_into_cache(
     job_metadata: Dict[str, Any],
     form_data: Dict[str, Any],
 ) -> None:
+    """
+    Load chart data into the cache, for an async query job or to refresh stale
+    cached results, in which case ``job_metadata`` holds the ``refresh_key`` marking
+    the refresh as enqueued instead of a job.
+    """
     # pylint: disable=import-outside-toplevel
     from superset.charts.data.commands.get_data_command import ChartDataCommand
 
@@ -80,7 +91,7 @@ def load_chart_data_into_cache(
             result = command.run(cache=True)
             cache_key = result["cache_key"]
             result_url = f"/api/v1/chart/data/{cache_key}"
-            async_query_manager.update_job(
+            _update_job(
                 job_metadata,
                 async_query_manager.STATUS_DONE,
                 result_url=result_url,
@@ -92,10 +103,11 @@ def load_chart_data_into_cache(
             # TODO: QueryContext should support SIP-40 style errors
             error = ex.message if hasattr(ex, "message") else str(ex)  # type: ignore # pylint: disable=no-member
             errors = [{"message": error}]
-            async_query_manager.update_job(
-                job_metadata, async_query_manager.STATUS_ERROR, errors=errors
-            )
+            _update_job(job_metadata, async_query_manager.STATUS_ERROR, errors=errors)
             raise ex
+        finally:
+            if refresh_key := job_metadata.get("refresh_key"):
+                cache_manager.data_cache.delete(refresh_key)
 
 
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
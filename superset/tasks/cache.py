@@ -14,23 +14,30 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from collections import Counter
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib import request
 from urllib.error import URLError
 
-from celery.beat import SchedulingError
 from celery.utils.log import get_task_logger
+from flask import g
 from sqlalchemy import and_, func
 
 from superset import app, db, security_manager
+from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.exceptions import SupersetVizException
 from superset.extensions import celery_app
 from superset.models.core import Log
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.tags.models import Tag, TaggedObject
+from superset.utils.concurrency import database_slot, run_concurrently
+from superset.utils.core import override_user
 from superset.utils.date_parser import parse_human_datetime
-from superset.utils.machine_auth import MachineAuthProvider
+from superset.views.utils import get_dashboard_extra_filters, get_viz
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.INFO)
@@ -50,8 +57,8 @@ class Strategy:  # pylint: disable=too-few-public-methods
     """
     A cache warm up strategy.
 
-    Each strategy defines a `get_urls` method that returns a list of URLs to
-    be fetched from the `/superset/warm_up_cache/` endpoint.
+    Each strategy defines a `get_targets` method that returns a list of charts to
+    be warmed up, along with the dashboard whose default filters are applied.
 
     Strategies can be configured in `superset/config.py`:
 
@@ -72,8 +79,15 @@ class Strategy:  # pylint: disable=too-few-public-methods
     def __init__(self) -> None:
         pass
 
+    def get_targets(self) -> List[Tuple[Slice, Optional[Dashboard]]]:
+        raise NotImplementedError("Subclasses must implement get_targets!")
+
     def get_urls(self) -> List[str]:
-        raise NotImplementedError("Subclasses must implement get_urls!")
+        """
+        Return the URLs of the `/superset/warm_up_cache/` endpoint warming up the
+        charts.
+        """
+        return [get_url(chart, dashboard) for chart, dashboard in self.get_targets()]
 
 
 class DummyStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -94,11 +108,11 @@ class DummyStrategy(Strategy):  # pylint: disable=too-few-public-methods
 
     name = "dummy"
 
-    def get_urls(self) -> List[str]:
+    def get_targets(self) -> List[Tuple[Slice, Optional[Dashboard]]]:
         session = db.create_scoped_session()
         charts = session.query(Slice).all()
 
-        return [get_url(chart) for chart in charts]
+        return [(chart, None) for chart in charts]
 
 
 class TopNDashboardsStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -126,8 +140,8 @@ class TopNDashboardsStrategy(Strategy):  # pylint: disable=too-few-public-method
         self.top_n = top_n
         self.since = parse_human_datetime(since) if since else None
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_targets(self) -> List[Tuple[Slice, Optional[Dashboard]]]:
+        targets: List[Tuple[Slice, Optional[Dashboard]]] = []
         session = db.create_scoped_session()
 
         records = (
@@ -142,9 +156,9 @@ class TopNDashboardsStrategy(Strategy):  # pylint: disable=too-few-public-method
         dashboards = session.query(Dashboard).filter(Dashboard.id.in_(dash_ids)).all()
         for dashboard in dashboards:
             for chart in dashboard.slices:
-                urls.append(get_url(chart, dashboard))
+                targets.append((chart, dashboard))
 
-        return urls
+        return targets
 
 
 class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -169,8 +183,8 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         super().__init__()
         self.tags = tags or []
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_targets(self) -> List[Tuple[Slice, Optional[Dashboard]]]:
+        targets: List[Tuple[Slice, Optional[Dashboard]]] = []
         session = db.create_scoped_session()
 
         tags = session.query(Tag).filter(Tag.name.in_(self.tags)).all()
@@ -191,7 +205,7 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         tagged_dashboards = session.query(Dashboard).filter(Dashboard.id.in_(dash_ids))
         for dashboard in tagged_dashboards:
             for chart in dashboard.slices:
-                urls.append(get_url(chart))
+                targets.append((chart, None))
 
         # add charts that are tagged
         tagged_objects = (
@@ -207,9 +221,9 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         chart_ids = [tagged_object.object_id for tagged_object in tagged_objects]
         tagged_charts = session.query(Slice).filter(Slice.id.in_(chart_ids))
         for chart in tagged_charts:
-            urls.append(get_url(chart))
+            targets.append((chart, None))
 
-        return urls
+        return targets
 
 
 strategies = [DummyStrategy, TopNDashboardsStrategy, DashboardTagsStrategy]
@@ -239,14 +253,95 @@ def fetch_url(url: str, headers: Dict[str, str]) -> Dict[str, str]:
     return result
 
 
+def _warm_up_query_context(chart: Slice) -> None:
+    # pylint: disable=import-outside-toplevel
+    from superset.charts.data.commands.get_data_command import ChartDataCommand
+
+    form_data = json.loads(chart.query_context)
+    command = ChartDataCommand(
+        ChartDataQueryContextSchema().load({**form_data, "force": True})
+    )
+    command.validate()
+    command.run()
+
+
+def _warm_up_viz(chart: Slice, extra_filters: List[Dict[str, Any]]) -> None:
+    form_data = chart.form_data
+    if extra_filters:
+        form_data["extra_filters"] = extra_filters
+    viz_obj = get_viz(
+        datasource_type=chart.datasource.type,
+        datasource_id=chart.datasource.id,
+        form_data=form_data,
+        force=True,
+    )
+    # pylint: disable=assigning-non-slot
+    g.form_data = form_data
+    try:
+        payload = viz_obj.get_payload()
+    finally:
+        delattr(g, "form_data")
+    if payload["errors"]:
+        raise SupersetVizException(errors=payload["errors"])
+
+
+def warm_up_chart(
+    chart_id: int, dashboard_id: Optional[int] = None, username: Optional[str] = None
+) -> str:
+    """
+    Warm up the cache of a chart by running its queries.
+
+    Charts whose query context is saved are run through the chart data API command,
+    as saved: the default filters of dashboards are applied by the legacy viz only,
+    and would produce cache keys the dashboards never request for the others.
+
+    :param chart_id: The id of the chart
+    :param dashboard_id: The id of the dashboard whose default filters are applied
+    :param username: The name of the user the queries are run as
+    :returns: "warmed", "failed", or "skipped" if the chart or its datasource
+        doesn't exist
+    """
+    # the user is loaded in the thread of the worker, along with the chart, as the
+    # objects of the session of a thread can't be used by the others
+    user = security_manager.get_user_by_username(username) if username else None
+    with override_user(user):
+        chart = db.session.query(Slice).filter_by(id=chart_id).one_or_none()
+        if not chart or not chart.datasource:
+            logger.warning("Skipping the warm up of chart %s", chart_id)
+            return "skipped"
+
+        database_id = getattr(chart.datasource, "database_id", None)
+        try:
+            with database_slot(
+                ("cache_warmup", database_id),
+                app.config["CACHE_WARMUP_MAX_CONCURRENT_QUERIES_PER_DATABASE"],
+            ):
+                if chart.query_context:
+                    _warm_up_query_context(chart)
+                else:
+                    _warm_up_viz(
+                        chart,
+                        get_dashboard_extra_filters(chart.id, dashboard_id)
+                        if dashboard_id
+                        else [],
+                    )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Error warming up the cache of chart %s", chart_id)
+            return "failed"
+
+    logger.info("Warmed up the cache of chart %s", chart_id)
+    return "warmed"
+
+
 @celery_app.task(name="cache-warmup")
 def cache_warmup(
     strategy_name: str, *args: Any, **kwargs: Any
-) -> Union[Dict[str, List[str]], str]:
+) -> Union[Dict[str, int], str]:
     """
     Warm up cache.
 
-    This task periodically hits charts to warm up the cache.
+    This task periodically runs the queries of charts to warm up the cache, in the
+    worker, and returns the number of charts warmed up, failed and skipped.
 
     """
     logger.info("Loading strategy")
@@ -268,18 +363,28 @@ def cache_warmup(
         logger.exception(message)
         return message
 
-    user = security_manager.get_user_by_username(app.config["THUMBNAIL_SELENIUM_USER"])
-    cookies = MachineAuthProvider.get_auth_cookies(user)
-    headers = {"Cookie": f"session={cookies.get('session', '')}"}
-
-    results: Dict[str, List[str]] = {"scheduled": [], "errors": []}
-    for url in strategy.get_urls():
-        try:
-            logger.info("Scheduling %s", url)
-            fetch_url.delay(url, headers)
-            results["scheduled"].append(url)
-        except SchedulingError:
-            logger.exception("Error scheduling fetch_url: %s", url)
-            results["errors"].append(url)
-
+    # a chart can be targeted more than once, eg, when it's both tagged and in a
+    # tagged dashboard
+    targets = list(
+        dict.fromkeys(
+            (chart.id, dashboard.id if dashboard else None)
+            for chart, dashboard in strategy.get_targets()
+        )
+    )
+    statuses = run_concurrently(
+        [
+            partial(
+                warm_up_chart,
+                chart_id,
+                dashboard_id,
+                app.config["THUMBNAIL_SELENIUM_USER"],
+            )
+            for chart_id, dashboard_id in targets
+        ],
+        max_workers=app.config["CACHE_WARMUP_MAX_WORKERS"],
+    )
+
+    counts = Counter(statuses)
+    results = {status: counts[status] for status in ("warmed", "failed", "skipped")}
+    logger.info("Cache warm up results: %s", results)
     return results
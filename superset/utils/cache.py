@@ -18,9 +18,22 @@ from __future__ import annotations
 
 import inspect
 import logging
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 
 from flask import current_app as app, request
 from flask_caching import Cache
@@ -40,6 +53,8 @@ config = app.config
 stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def generate_cache_key(values_dict: Dict[str, Any], key_prefix: str = "") -> str:
     hash_str = md5_sha_from_dict(values_dict, default=json_int_dttm_ser)
@@ -94,6 +109,78 @@ def view_cache_key(*args: Any, **kwargs: Any) -> str:  # pylint: disable=unused-
     return "view/{}/{}".format(request.path, args_hash)
 
 
+def _acquire_single_flight(
+    cache: Cache, key: str, lock_key: str, load: Callable[[], Optional[T]]
+) -> Tuple[Optional[str], Optional[T]]:
+    """
+    Acquire the lock of a cache key, or wait for its value to be cached.
+
+    :returns: The token of the lock if it was acquired, and the cached value if
+        another worker computed it
+    """
+    token = uuid.uuid4().hex
+    lock_timeout = config["CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT"]
+    deadline = time.monotonic() + config["CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT"]
+    waited = False
+    while True:
+        if cache.add(lock_key, token, timeout=lock_timeout):
+            # the value may have been computed while waiting for the lock
+            value = load() if waited else None
+            if value is not None:
+                cache.delete(lock_key)
+            return token if value is None else None, value
+
+        if not waited:
+            stats_logger.incr("single_flight.wait")
+        waited = True
+        value = load()
+        if value is not None:
+            return None, value
+        if time.monotonic() >= deadline:
+            logger.warning("Timed out waiting for the value of cache key %s", key)
+            stats_logger.incr("single_flight.timeout")
+            return None, None
+        time.sleep(config["CACHE_SINGLE_FLIGHT_POLL_INTERVAL"])
+
+
+@contextmanager
+def single_flight(
+    cache: Cache, key: str, load: Callable[[], Optional[T]]
+) -> Iterator[Optional[T]]:
+    """
+    Make sure a single worker computes the missing value of a cache key at a time.
+
+    The first worker to get here acquires a lock on the key, stored in the cache
+    itself so that it is shared by all workers when the cache is distributed, and is
+    given ``None``: it should compute and cache the value, and the lock is released
+    at the end of the block. The other workers wait for the value to be cached,
+    polling ``load``, and are given the value. They are given ``None`` if the value
+    isn't cached within ``CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT`` seconds, in which case
+    they compute the value too.
+
+        with single_flight(cache, key, lambda: cache.get(key)) as value:
+            if value is None:
+                value = compute()
+                cache.set(key, value)
+
+    :param cache: The cache storing the value, and the lock
+    :param key: The cache key of the value
+    :param load: Returns the cached value, or ``None`` if it's not cached yet
+    """
+    if not config["CACHE_SINGLE_FLIGHT"] or isinstance(cache.cache, NullCache):
+        yield None
+        return
+
+    lock_key = f"{key}__single_flight"
+    token, value = _acquire_single_flight(cache, key, lock_key, load)
+    try:
+        yield value
+    finally:
+        # the lock may have expired and been acquired by another worker
+        if token and cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
 def memoized_func(
     key: Optional[str] = None,
     cache: Cache = cache_manager.cache,
@@ -139,11 +226,18 @@ def memoized_func(
             else:
                 cache_key = view_cache_key(*args, **kwargs)
 
+            if kwargs.get("force"):
+                obj = f(*args, **kwargs)
+                cache.set(cache_key, obj, timeout=kwargs.get("cache_timeout"))
+                return obj
+
             obj = cache.get(cache_key)
-            if not kwargs.get("force") and obj is not None:
+            if obj is not None:
                 return obj
-            obj = f(*args, **kwargs)
-            cache.set(cache_key, obj, timeout=kwargs.get("cache_timeout"))
+            with single_flight(cache, cache_key, lambda: cache.get(cache_key)) as obj:
+                if obj is None:
+                    obj = f(*args, **kwargs)
+                    cache.set(cache_key, obj, timeout=kwargs.get("cache_timeout"))
             return obj
 
         return wrapped_f
@@ -157,6 +251,7 @@ def etag_cache(
     max_age: Optional[Union[int, float]] = None,
     raise_for_access: Optional[Callable[..., Any]] = None,
     skip: Optional[Callable[..., bool]] = None,
+    get_cache_key_extra: Optional[Callable[..., str]] = None,
 ) -> Callable[..., Any]:
     """
     A decorator for caching views and handling etag conditional requests.
@@ -169,6 +264,10 @@ def etag_cache(
     dataframe serialization. POST requests will still benefit from the
     dataframe cache for requests that produce the same SQL.
 
+    Responses depending on more than the arguments of the view, e.g. on the
+    permissions of the user, are cached separately per value returned by
+    `get_cache_key_extra`.
+
     """
     if max_age is None:
         max_age = app.config["CACHE_DEFAULT_TIMEOUT"]
@@ -198,6 +297,8 @@ def etag_cache(
                 key_args = list(args)
                 key_kwargs = kwargs.copy()
                 key_kwargs.update(request.args)
+                if get_cache_key_extra:
+                    key_kwargs["cache_key_extra"] = get_cache_key_extra(*args, **kwargs)
                 cache_key = wrapper.make_cache_key(  # type: ignore
                     f, *key_args, **key_kwargs
                 )
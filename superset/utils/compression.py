@@ -0,0 +1,132 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compression of the payloads stored in the results backend.
+
+Payloads compressed with zlib are stored as bare zlib streams, as they always have
+been. Payloads compressed with any other codec, or stored uncompressed, are prefixed
+with a header naming the codec and the size of the uncompressed payload::
+
+    b"SPC" | codec id (1 byte) | uncompressed size (8 bytes, little endian) | data
+
+The first byte of a zlib stream always has 8 as its low nibble, which ``S`` doesn't,
+so that blobs of both formats can be told apart and all blobs stay readable whatever
+the configured codec. LZ4 and Zstandard are provided by the codecs bundled with
+PyArrow.
+"""
+import struct
+import zlib
+from typing import Dict, Optional, Union
+
+import pyarrow as pa
+
+MAGIC = b"SPC"
+_HEADER = struct.Struct("<3sBQ")
+
+CODEC_IDS: Dict[str, int] = {"none": 0, "zlib": 1, "lz4": 2, "zstd": 3}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+
+# PyArrow names the LZ4 frame format "lz4"
+_ARROW_CODECS = {"lz4": "lz4", "zstd": "zstd"}
+
+
+def _to_bytes(data: Union[bytes, str]) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _arrow_codec(name: str, level: Optional[int] = None) -> pa.Codec:
+    arrow_name = _ARROW_CODECS[name]
+    if not pa.Codec.is_available(arrow_name):
+        raise ValueError(f"The {name} compression codec isn't available")
+    # LZ4 doesn't have levels, the level configured for the other codecs is ignored
+    if level is not None and not pa.Codec.supports_compression_level(arrow_name):
+        level = None
+    return pa.Codec(arrow_name, compression_level=level)
+
+
+def compress(
+    data: Union[bytes, str],
+    codec: str = "zlib",
+    min_size: int = 0,
+    level: Optional[int] = None,
+) -> bytes:
+    """
+    Compress a payload.
+
+    :param data: The payload, strings are encoded in UTF-8
+    :param codec: The codec, one of "zlib", "lz4", "zstd" or "none"
+    :param min_size: Payloads smaller than this many bytes are stored uncompressed
+    :param level: The compression level, the default level of the codec if None,
+        ignored by the codecs without levels
+    :returns: The compressed payload
+    :raises ValueError: If the codec is unknown or unavailable
+    """
+    if codec not in CODEC_IDS:
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+    data = _to_bytes(data)
+    if len(data) < min_size:
+        codec = "none"
+
+    if codec == "zlib":
+        return zlib.compress(data) if level is None else zlib.compress(data, level)
+
+    if codec == "none":
+        compressed = data
+    else:
+        compressed = _arrow_codec(codec, level).compress(data, asbytes=True)
+    return _HEADER.pack(MAGIC, CODEC_IDS[codec], len(data)) + compressed
+
+
+def get_codec(blob: bytes) -> str:
+    """
+    Return the name of the codec a payload was compressed with.
+    """
+    if blob[: len(MAGIC)] == MAGIC:
+        _, codec_id, _ = _HEADER.unpack_from(blob)
+        return CODEC_NAMES[codec_id]
+    return "zlib"
+
+
+def decompress(
+    blob: Union[bytes, str], decode: Optional[bool] = True
+) -> Union[bytes, str]:
+    """
+    Decompress a payload compressed with any of the codecs.
+
+    :param blob: The compressed payload
+    :param decode: Whether to decode the payload as UTF-8
+    :returns: The payload
+    """
+    blob = _to_bytes(blob)
+    if blob[: len(MAGIC)] == MAGIC:
+        _, codec_id, size = _HEADER.unpack_from(blob)
+        codec = CODEC_NAMES.get(codec_id)
+        if codec is None:
+            raise ValueError(f"Unknown compression codec id: {codec_id}")
+        data = memoryview(blob)[_HEADER.size :]
+        if codec == "none":
+            decompressed = bytes(data)
+        elif codec == "zlib":
+            decompressed = zlib.decompress(data)
+        else:
+            decompressed = _arrow_codec(codec).decompress(
+                data, decompressed_size=size, asbytes=True
+            )
+    else:
+        decompressed = zlib.decompress(blob)
+    return decompressed.decode("utf-8") if decode else decompressed
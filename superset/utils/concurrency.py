@@ -0,0 +1,157 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Helpers to run independent units of work, typically database queries, on a pool of
+worker threads while preserving the Flask context they were issued in.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from flask import current_app, g, has_app_context
+from flask.globals import _request_ctx_stack
+
+from superset.extensions import db
+
+T = TypeVar("T")
+
+_local = threading.local()
+_database_semaphores: Dict[Tuple[Any, int], threading.BoundedSemaphore] = {}
+_database_semaphores_lock = threading.Lock()
+
+
+def in_worker() -> bool:
+    """
+    Whether the current thread is a worker started by ``run_concurrently``.
+    """
+    return getattr(_local, "in_worker", False)
+
+
+def runs_concurrently(count: int, max_workers: int) -> bool:
+    """
+    Whether ``run_concurrently`` runs ``count`` tasks on worker threads, rather than
+    one after another in the current thread.
+    """
+    return count > 1 and max_workers > 1 and not in_worker()
+
+
+@contextmanager
+def database_slot(database_id: Any, limit: int) -> Iterator[None]:
+    """
+    Hold one of the ``limit`` slots of a database for the duration of the block.
+
+    The slots are shared by all threads of the process, so that concurrent work
+    issued by different requests can't flood a database either. Slots are shared by
+    the callers passing the same limit: changing the limit creates a new set of slots.
+
+    :param database_id: The id of the database
+    :param limit: The number of slots of the database
+    """
+    key = (database_id, limit)
+    with _database_semaphores_lock:
+        semaphore = _database_semaphores.get(key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(max(limit, 1))
+            _database_semaphores[key] = semaphore
+    with semaphore:
+        yield
+
+
+def _copy_context(task: Callable[[], T]) -> Callable[[], T]:
+    """
+    Bind a task to copies of the current app and request contexts, including the
+    attributes of ``g`` and the logged in user the security manager relies on.
+    """
+    if not has_app_context():
+        return task
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    request_ctx = _request_ctx_stack.top
+    g_attributes = dict(vars(g))
+
+    def wrapper() -> T:
+        if request_ctx is not None:
+            ctx = request_ctx.copy()
+            if hasattr(request_ctx, "user"):
+                ctx.user = request_ctx.user
+        else:
+            ctx = app.app_context()
+        with ctx:
+            for key, value in g_attributes.items():
+                setattr(g, key, value)
+            try:
+                return task()
+            finally:
+                db.session.remove()
+
+    return wrapper
+
+
+def run_concurrently(
+    tasks: Sequence[Callable[[], T]],
+    max_workers: int,
+    database_id: Optional[Any] = None,
+    max_per_database: Optional[int] = None,
+) -> List[T]:
+    """
+    Run tasks on a bounded pool of worker threads and return their results in the
+    order of the tasks.
+
+    The tasks run in copies of the current app and request contexts, with their own
+    database session: ORM instances loaded by the caller must not be used by the
+    tasks, which should load their own instead. When a task
+    fails, the exception of the first failing task is raised once all tasks are done.
+    Tasks are run one after another when there's a single one, when ``max_workers``
+    is lower than 2, or when called from a worker, so that pools are never nested.
+
+    :param tasks: The tasks to run
+    :param max_workers: The maximum number of worker threads
+    :param database_id: The id of the database queried by the tasks
+    :param max_per_database: The maximum number of tasks of all pools of the process
+        running concurrently against the database
+    :returns: The results of the tasks
+    """
+    if not runs_concurrently(len(tasks), max_workers):
+        return [task() for task in tasks]
+
+    def wrap(task: Callable[[], T]) -> Callable[[], T]:
+        def run() -> T:
+            _local.in_worker = True
+            try:
+                if database_id is not None and max_per_database:
+                    with database_slot(database_id, max_per_database):
+                        return task()
+                return task()
+            finally:
+                _local.in_worker = False
+
+        return _copy_context(run)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(wrap(task)) for task in tasks]
+    return [future.result() for future in futures]
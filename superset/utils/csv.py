@@ -17,11 +17,13 @@
 import logging
 import re
 import urllib.request
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 from urllib.error import URLError
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import simplejson
 
 from superset.utils.core import GenericDataType
@@ -64,20 +66,85 @@ def escape_value(value: str) -> str:
     return value
 
 
-def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+def _escape_candidates(values: np.ndarray) -> np.ndarray:
+    """
+    Cheaply find the strings that may need escaping, using Arrow compute kernels.
+
+    Only strings starting with a non-alphanumeric character can match
+    ``problematic_chars_re``; those are then checked with ``escape_value``.
+    """
+    try:
+        first_chars = pc.utf8_slice_codeunits(
+            pa.array(values, type=pa.string()), start=0, stop=1
+        )
+    except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError):
+        # eg, strings that aren't valid UTF-8
+        return np.ones(len(values), dtype=bool)
+    return pc.invert(pc.utf8_is_alnum(first_chars)).to_numpy(zero_copy_only=False)
+
+
+def escape_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized version of ``escape_value``, escaping all the strings of a series
+    at once. Values that aren't strings are left untouched.
+    """
+    values = series.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        positions = np.arange(len(values))
+    else:
+        positions = np.flatnonzero([isinstance(value, str) for value in values])
+    if not positions.size:
+        return series
+
+    candidates = positions[_escape_candidates(values[positions])]
+    escaped = np.array(
+        [escape_value(value) for value in values[candidates]], dtype=object
+    )
+    changed = escaped != values[candidates]
+    if not changed.any():
+        return series
+
+    series = series.copy()
+    series.iloc[candidates[changed]] = escaped[changed]
+    return series
+
+
+def escape_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of the DataFrame with the headers and all string values
+    escaped against CSV injection, one column at a time.
+    """
     escape_values = lambda v: escape_value(v) if isinstance(v, str) else v
 
-    # Escape csv headers
+    # Escape headers
     df = df.rename(columns=escape_values)
 
-    # Escape csv values
-    for name, column in df.items():
-        if column.dtype == np.dtype(object):
-            for idx, value in enumerate(column.values):
-                if isinstance(value, str):
-                    df.at[idx, name] = escape_value(value)
+    # Escape values
+    for idx, dtype in enumerate(df.dtypes):
+        if dtype == np.dtype(object):
+            column = df.iloc[:, idx]
+            escaped = escape_series(column)
+            if escaped is not column:
+                df.iloc[:, idx] = escaped
+
+    return df
+
 
-    return df.to_csv(**kwargs)
+def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+    return escape_df(df).to_csv(**kwargs)
+
+
+def df_chunks_to_escaped_csv(
+    chunks: Iterable[pd.DataFrame], **kwargs: Any
+) -> Iterator[str]:
+    """
+    Lazily convert DataFrame chunks to escaped CSV, emitting the header (if any)
+    only for the first chunk.
+    """
+    header = kwargs.pop("header", True)
+    for chunk in chunks:
+        yield df_to_escaped_csv(chunk, header=header, **kwargs)
+        header = False
 
 
 def get_chart_csv_data(
@@ -0,0 +1,212 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A registry of SQLAlchemy engines, so that the engines of databases and their
+connection pools are reused across queries instead of being created for each query.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import URL
+
+from superset.utils.hashing import md5_sha_from_str
+
+if TYPE_CHECKING:
+    from superset.stats_logger import BaseStatsLogger
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedEngine:
+    engine: Engine
+    database_id: Optional[int]
+    last_used: float
+
+
+def _key_default(obj: Any) -> str:
+    """
+    Key the engine parameters that can't be serialized as JSON.
+
+    Classes, eg, ``poolclass``, are keyed by their qualified name. Any other object,
+    eg, a ``creator`` function or an SSL context in the connect args, is keyed by
+    its type and identity, so that engines are only shared by the callers passing
+    the very same object, rather than by whatever its ``repr`` happens to be.
+    """
+    if isinstance(obj, type):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    return f"{type(obj).__module__}.{type(obj).__qualname__}@{id(obj)}"
+
+
+def get_engine_key(
+    database_id: Optional[int],
+    url: URL,
+    params: Dict[str, Any],
+    schema: Optional[str] = None,
+    effective_username: Optional[str] = None,
+) -> str:
+    """
+    Return the key of the engine of a database, from everything the engine is
+    created with.
+
+    :param database_id: The id of the database
+    :param url: The URL of the engine, with its password
+    :param params: The parameters of the engine, including the connect args
+    :param schema: The schema the engine is created for
+    :param effective_username: The user impersonated by the engine
+    :returns: The key of the engine
+    """
+    return md5_sha_from_str(
+        json.dumps(
+            [
+                database_id,
+                url.render_as_string(hide_password=False),
+                params,
+                schema,
+                effective_username,
+            ],
+            default=_key_default,
+            sort_keys=True,
+        )
+    )
+
+
+class EngineCache:
+    """
+    A thread safe, least recently used cache of SQLAlchemy engines.
+
+    Engines are disposed of, closing the connections of their pool, when they're
+    evicted: beyond ``max_size`` engines, once unused for ``idle_timeout`` seconds,
+    or when the database they connect to is invalidated.
+    """
+
+    def __init__(self) -> None:
+        self._engines: "OrderedDict[str, _CachedEngine]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        key: str,
+        database_id: Optional[int],
+        create_engine: Callable[[], Engine],
+        max_size: int,
+        idle_timeout: Optional[int] = None,
+        stats_logger: Optional["BaseStatsLogger"] = None,
+    ) -> Engine:
+        """
+        Return the cached engine with the given key, creating it if needed.
+
+        :param key: The key of the engine, see ``get_engine_key``
+        :param database_id: The id of the database of the engine
+        :param create_engine: Creates the engine on a cache miss
+        :param max_size: The maximum number of cached engines
+        :param idle_timeout: The number of seconds after which unused engines are
+            evicted
+        :param stats_logger: Receives the metrics of the cache and its pools
+        :returns: The engine
+        """
+        now = time.monotonic()
+        evicted: List[Engine] = []
+        with self._lock:
+            if idle_timeout:
+                # engines are ordered from the least to the most recently used
+                while self._engines:
+                    oldest = next(iter(self._engines.values()))
+                    if now - oldest.last_used < idle_timeout:
+                        break
+                    evicted.append(self._engines.popitem(last=False)[1].engine)
+
+            cached = self._engines.get(key)
+            hit = cached is not None
+            if cached:
+                cached.last_used = now
+                self._engines.move_to_end(key)
+            else:
+                cached = _CachedEngine(create_engine(), database_id, now)
+                self._engines[key] = cached
+                while len(self._engines) > max(max_size, 1):
+                    evicted.append(self._engines.popitem(last=False)[1].engine)
+
+        self._dispose(evicted)
+        if stats_logger:
+            stats_logger.incr("engine_cache.hit" if hit else "engine_cache.miss")
+            for _ in evicted:
+                stats_logger.incr("engine_cache.evicted")
+            self.log_metrics(stats_logger)
+        return cached.engine
+
+    def invalidate(self, database_id: Optional[int] = None) -> None:
+        """
+        Evict the engines of a database, or all engines.
+
+        :param database_id: The id of the database, all engines are evicted if None
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, cached in self._engines.items()
+                if database_id is None or cached.database_id == database_id
+            ]
+            evicted = [self._engines.pop(key).engine for key in keys]
+        self._dispose(evicted)
+
+    def clear(self) -> None:
+        """
+        Forget the cached engines without disposing of them, e.g. in a forked process
+        where the connections of their pools belong to the parent process.
+        """
+        self._engines = OrderedDict()
+        self._lock = threading.RLock()
+
+    def log_metrics(self, stats_logger: "BaseStatsLogger") -> None:
+        """
+        Report the number of cached engines and of the connections of their pools.
+        """
+        with self._lock:
+            pools = [cached.engine.pool for cached in self._engines.values()]
+        checked_out = checked_in = 0
+        for pool in pools:
+            # not all pool classes keep track of their connections
+            checked_out += getattr(pool, "checkedout", lambda: 0)()
+            checked_in += getattr(pool, "checkedin", lambda: 0)()
+        stats_logger.gauge("engine_cache.size", len(pools))
+        stats_logger.gauge("engine_cache.connections.checked_out", checked_out)
+        stats_logger.gauge("engine_cache.connections.checked_in", checked_in)
+
+    @staticmethod
+    def _dispose(engines: List[Engine]) -> None:
+        for engine in engines:
+            try:
+                engine.dispose()
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Failed to dispose of engine", exc_info=True)
+
+
+engine_cache = EngineCache()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=engine_cache.clear)
@@ -16,27 +16,33 @@
 # under the License.
 from __future__ import annotations
 
+import atexit
 import functools
 import inspect
 import json
 import logging
+import os
 import textwrap
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import (
     Any,
     Callable,
     cast,
+    Deque,
     Dict,
     Iterator,
+    List,
     Optional,
     Type,
     TYPE_CHECKING,
     Union,
 )
 
-from flask import current_app, g, request
+from flask import current_app, Flask, g, has_app_context, request
 from flask_appbuilder.const import API_URI_RIS_KEY
 from sqlalchemy.exc import SQLAlchemyError
 from typing_extensions import Literal
@@ -44,6 +50,7 @@ from typing_extensions import Literal
 from superset.utils.core import get_user_id
 
 if TYPE_CHECKING:
+    from superset.models.core import Log
     from superset.stats_logger import BaseStatsLogger
 
 
@@ -313,7 +320,7 @@ def get_event_logger_from_cfg_value(cfg_value: Any) -> AbstractEventLogger:
 class DBEventLogger(AbstractEventLogger):
     """Event logger that commits logs to Superset DB"""
 
-    def log(  # pylint: disable=too-many-arguments,too-many-locals
+    def log(  # pylint: disable=too-many-arguments
         self,
         user_id: Optional[int],
         action: str,
@@ -324,10 +331,31 @@ class DBEventLogger(AbstractEventLogger):
         *args: Any,
         **kwargs: Any,
     ) -> None:
+        self.save_logs(
+            self.create_logs(
+                user_id=user_id,
+                action=action,
+                dashboard_id=dashboard_id,
+                duration_ms=duration_ms,
+                slice_id=slice_id,
+                referrer=referrer,
+                records=kwargs.get("records", []),
+            )
+        )
+
+    @staticmethod
+    def create_logs(  # pylint: disable=too-many-arguments
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        referrer: Optional[str],
+        records: List[Dict[str, Any]],
+    ) -> List[Log]:
         # pylint: disable=import-outside-toplevel
         from superset.models.core import Log
 
-        records = kwargs.get("records", [])
         logs = []
         for record in records:
             json_string: Optional[str]
@@ -345,6 +373,10 @@ class DBEventLogger(AbstractEventLogger):
                 user_id=user_id,
             )
             logs.append(log)
+        return logs
+
+    @staticmethod
+    def save_logs(logs: List[Log]) -> None:
         try:
             sesh = current_app.appbuilder.get_session
             sesh.bulk_save_objects(logs)
@@ -352,3 +384,131 @@ class DBEventLogger(AbstractEventLogger):
         except SQLAlchemyError as ex:
             logging.error("DBEventLogger failed to log event(s)")
             logging.exception(ex)
+
+
+class BufferedDBEventLogger(DBEventLogger):
+    """
+    Event logger that buffers logs in memory and commits them to Superset DB in
+    batches, from a background thread, so that requests don't wait for the commit.
+
+    Buffered logs are flushed once ``batch_size`` of them are pending, every
+    ``flush_interval`` seconds, and when the process exits. Events logged while
+    ``max_buffer_size`` logs are pending are dropped, and counted by the
+    ``event_logger.dropped`` metric of the stats logger.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5,
+        max_buffer_size: int = 10000,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.dropped = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._app: Optional[Flask] = None
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def buffer_size(self) -> int:
+        return len(self._buffer)
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        referrer: Optional[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if not has_app_context():
+            super().log(
+                user_id, action, dashboard_id, duration_ms, slice_id, referrer, **kwargs
+            )
+            return
+
+        if self._pid != os.getpid():
+            # the buffer and writer of a parent process aren't usable after a fork
+            self._reset()
+        self._start_writer()
+
+        event = {
+            "user_id": user_id,
+            "action": action,
+            "dashboard_id": dashboard_id,
+            "duration_ms": duration_ms,
+            "slice_id": slice_id,
+            "referrer": referrer,
+            "records": kwargs.get("records", []),
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_size:
+                self.dropped += 1
+                dropped = True
+            else:
+                self._buffer.append(event)
+                dropped = False
+            buffer_size = len(self._buffer)
+
+        if dropped:
+            self.stats_logger.incr("event_logger.dropped")
+        elif buffer_size >= self.batch_size:
+            self._flush_requested.set()
+
+    def flush(self) -> None:
+        """
+        Commit all the buffered logs, in batches of ``batch_size``.
+        """
+        if self._app is None:
+            return
+
+        with self._flush_lock, self._app.app_context():
+            while True:
+                with self._lock:
+                    events = [
+                        self._buffer.popleft()
+                        for _ in range(min(self.batch_size, len(self._buffer)))
+                    ]
+                    buffer_size = len(self._buffer)
+                self.stats_logger.gauge("event_logger.buffer_size", buffer_size)
+                if not events:
+                    break
+
+                logs = [log for event in events for log in self.create_logs(**event)]
+                self.save_logs(logs)
+                self.stats_logger.gauge("event_logger.flushed", len(logs))
+
+    def _start_writer(self) -> None:
+        if self._writer is not None:
+            return
+
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._app = current_app._get_current_object()  # pylint: disable=W0212
+            self._writer = threading.Thread(
+                target=self._write, name="BufferedDBEventLogger", daemon=True
+            )
+            self._writer.start()
+        atexit.register(self.flush)
+
+    def _write(self) -> None:
+        while True:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("BufferedDBEventLogger failed to flush event(s)")
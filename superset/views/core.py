@@ -21,14 +21,23 @@ import logging
 import re
 from contextlib import closing
 from datetime import datetime, timedelta
-from typing import Any, Callable, cast, Dict, List, Optional, Union
+from typing import Any, Callable, cast, Dict, Iterator, List, Optional, Tuple, Union
 from urllib import parse
 
 import backoff
 import humanize
 import pandas as pd
 import simplejson as json
-from flask import abort, flash, g, redirect, render_template, request, Response
+from flask import (
+    abort,
+    flash,
+    g,
+    redirect,
+    render_template,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder import expose
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.decorators import (
@@ -127,7 +136,7 @@ from superset.sqllab.utils import apply_display_max_row_configuration_if_require
 from superset.sqllab.validators import CanAccessQueryValidatorImpl
 from superset.superset_typing import FlaskResponse
 from superset.tasks.async_queries import load_explore_json_into_cache
-from superset.utils import core as utils, csv, excel
+from superset.utils import compression, core as utils, csv, excel
 from superset.utils.async_query_manager import AsyncQueryTokenException
 from superset.utils.cache import etag_cache
 from superset.utils.core import (
@@ -167,6 +176,7 @@ from superset.views.utils import (
     get_datasource_info,
     get_form_data,
     get_viz,
+    iter_results_pages,
     loads_request_json,
     sanitize_datasource_data,
 )
@@ -2219,7 +2229,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         """Serves a key off of the results backend
 
         It is possible to pass the `rows` query argument to limit the number
-        of rows returned.
+        of rows returned, and the `offset` query argument to skip rows.
         """
         if not results_backend:
             raise SupersetErrorException(
@@ -2278,10 +2288,35 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 status=403,
             ) from ex
 
-        payload = utils.zlib_decompress(blob, decode=not results_backend_use_msgpack)
+        rows: Optional[int] = None
+        offset = 0
+        for arg in ("rows", "offset"):
+            if arg not in request.args:
+                continue
+            try:
+                value = int(request.args[arg])
+            except ValueError as ex:
+                raise SupersetErrorException(
+                    SupersetError(
+                        message=__(
+                            "The provided `%(arg)s` argument is not a valid integer.",
+                            arg=arg,
+                        ),
+                        error_type=SupersetErrorType.INVALID_PAYLOAD_SCHEMA_ERROR,
+                        level=ErrorLevel.ERROR,
+                    ),
+                    status=400,
+                ) from ex
+            if arg == "rows":
+                rows = value
+            else:
+                offset = max(value, 0)
+
+        payload = compression.decompress(blob, decode=not results_backend_use_msgpack)
         try:
+            # only the pages of the requested rows are read from paged results
             obj = _deserialize_results_payload(
-                payload, query, cast(bool, results_backend_use_msgpack)
+                payload, query, cast(bool, results_backend_use_msgpack), offset, rows
             )
         except SerializationError as ex:
             raise SupersetErrorException(
@@ -2297,21 +2332,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 status=404,
             ) from ex
 
-        if "rows" in request.args:
-            try:
-                rows = int(request.args["rows"])
-            except ValueError as ex:
-                raise SupersetErrorException(
-                    SupersetError(
-                        message=__(
-                            "The provided `rows` argument is not a valid integer."
-                        ),
-                        error_type=SupersetErrorType.INVALID_PAYLOAD_SCHEMA_ERROR,
-                        level=ErrorLevel.ERROR,
-                    ),
-                    status=400,
-                ) from ex
-
+        if rows is not None:
             obj = apply_display_max_row_configuration_if_require(obj, rows)
 
         return json_success(
@@ -2523,13 +2544,16 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             flash(ex.error.message)
             return redirect("/")
 
+        if config["SQLLAB_CSV_EXPORT_STREAMING"]:
+            return self._stream_csv(query, client_id)
+
         blob = None
         if results_backend and query.results_key:
             logger.info("Fetching CSV from results backend [%s]", query.results_key)
             blob = results_backend.get(query.results_key)
         if blob:
             logger.info("Decompressing")
-            payload = utils.zlib_decompress(
+            payload = compression.decompress(
                 blob, decode=not results_backend_use_msgpack
             )
             obj = _deserialize_results_payload(
@@ -2545,19 +2569,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             logger.info("Using pandas to convert to CSV")
         else:
             logger.info("Running a query to turn into CSV")
-            if query.select_sql:
-                sql = query.select_sql
-                limit = None
-            else:
-                sql = query.executed_sql
-                limit = ParsedQuery(sql).limit
-            if limit is not None and query.limiting_factor in {
-                LimitingFactor.QUERY,
-                LimitingFactor.DROPDOWN,
-                LimitingFactor.QUERY_AND_DROPDOWN,
-            }:
-                # remove extra row from `increased_limit`
-                limit -= 1
+            sql, limit = self._get_export_sql(query)
             df = query.database.get_df(sql, query.schema)[:limit]
 
         csv_data = csv.df_to_escaped_csv(df, index=False, **config["CSV_EXPORT"])
@@ -2580,6 +2592,112 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         )
         return response
 
+    @staticmethod
+    def _get_export_sql(query: Query) -> Tuple[str, Optional[int]]:
+        """Return the SQL to rerun for exporting a query, and its row limit"""
+        if query.select_sql:
+            sql = query.select_sql
+            limit = None
+        else:
+            sql = query.executed_sql
+            limit = ParsedQuery(sql).limit
+        if limit is not None and query.limiting_factor in {
+            LimitingFactor.QUERY,
+            LimitingFactor.DROPDOWN,
+            LimitingFactor.QUERY_AND_DROPDOWN,
+        }:
+            # remove extra row from `increased_limit`
+            limit -= 1
+        return sql, limit
+
+    def _iter_export_chunks(self, query: Query) -> Iterator[pd.DataFrame]:
+        """
+        Yield the results of a query as DataFrames of at most
+        ``SQLLAB_CSV_EXPORT_CHUNK_SIZE`` rows, either from the results backend or
+        by rerunning the query and fetching from the cursor in batches.
+
+        Results stored as pages (see ``SQLLAB_RESULTS_PAGE_SIZE``) are read a page
+        at a time. Results stored as a single payload are decompressed and
+        deserialized as a whole first: only the CSV is built chunk by chunk.
+        """
+        chunk_size = config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"]
+        blob = None
+        if results_backend and query.results_key:
+            logger.info("Fetching CSV from results backend [%s]", query.results_key)
+            blob = results_backend.get(query.results_key)
+        if blob:
+            logger.info("Decompressing")
+            payload = compression.decompress(
+                blob, decode=not results_backend_use_msgpack
+            )
+            # results stored as pages are only read here, a page at a time
+            obj = _deserialize_results_payload(
+                payload, query, cast(bool, results_backend_use_msgpack), limit=0
+            )
+            del blob, payload
+
+            columns = [c["name"] for c in obj["columns"]]
+            if "pages" in obj:
+                db_engine_spec = query.database.db_engine_spec
+                empty = True
+                for data in iter_results_pages(obj, results_backend_use_msgpack):
+                    if results_backend_use_msgpack:
+                        data = db_engine_spec.expand_data(
+                            obj["selected_columns"], data
+                        )[1]
+                    empty = False
+                    yield pd.DataFrame(data=data, dtype=object, columns=columns)
+                if empty:
+                    yield pd.DataFrame(dtype=object, columns=columns)
+                return
+
+            data = obj["data"]
+            for start in range(0, max(len(data), 1), chunk_size):
+                yield pd.DataFrame(
+                    data=data[start : start + chunk_size],
+                    dtype=object,
+                    columns=columns,
+                )
+        else:
+            logger.info("Running a query to stream into CSV")
+            sql, limit = self._get_export_sql(query)
+            yield from query.database.get_df_chunks(
+                sql, query.schema, chunk_size=chunk_size, limit=limit
+            )
+
+    def _stream_csv(self, query: Query, client_id: str) -> FlaskResponse:
+        """Stream the query results as csv, holding one chunk in memory at a time"""
+        event_info: Dict[str, Any] = {
+            "event_type": "data_export",
+            "client_id": client_id,
+            "row_count": 0,
+            "database": query.database.name,
+            "schema": query.schema,
+            "sql": query.sql,
+            "exported_format": "csv",
+        }
+
+        def count_rows(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            for chunk in chunks:
+                event_info["row_count"] += len(chunk.index)
+                yield chunk
+
+            event_rep = repr(event_info)
+            logger.debug(
+                "CSV exported: %s", event_rep, extra={"superset_event": event_info}
+            )
+
+        csv_chunks = csv.df_chunks_to_escaped_csv(
+            count_rows(self._iter_export_chunks(query)),
+            index=False,
+            **config["CSV_EXPORT"],
+        )
+        quoted_csv_name = parse.quote(query.name)
+        return CsvResponse(
+            stream_with_context(csv_chunks),
+            headers=generate_download_headers("csv", quoted_csv_name),
+        )
+
     @has_access
     @event_logger.log_this
     @expose("/excel/<client_id>")
@@ -2600,7 +2718,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             blob = results_backend.get(query.results_key)
         if blob:
             logger.info("Decompressing")
-            payload = utils.zlib_decompress(
+            payload = compression.decompress(
                 blob, decode=not results_backend_use_msgpack
             )
             obj = _deserialize_results_payload(
@@ -2616,19 +2734,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             logger.info("Using pandas to convert to Excel")
         else:
             logger.info("Running a query to turn into Excel")
-            if query.select_sql:
-                sql = query.select_sql
-                limit = None
-            else:
-                sql = query.executed_sql
-                limit = ParsedQuery(sql).limit
-            if limit is not None and query.limiting_factor in {
-                LimitingFactor.QUERY,
-                LimitingFactor.DROPDOWN,
-                LimitingFactor.QUERY_AND_DROPDOWN,
-            }:
-                # remove extra row from `increased_limit`
-                limit -= 1
+            sql, limit = self._get_export_sql(query)
             df = query.database.get_df(sql, query.schema)[:limit]
 
         logger.info("Excel DF", df)
@@ -25,16 +25,21 @@ from flask import g
 
 from superset import db
 from superset.connectors.base.models import BaseDatasource
-from superset.databases.dao import DatabaseDAO
+from superset.connectors.sqla.join_plan import (
+    Join,
+    JOIN_PLAN_CHECKSUM_KEY,
+    JOIN_PLAN_KEY,
+    JoinedTable,
+    JoinPlan,
+    qualify_expression,
+)
+from superset.connectors.sqla.models import MULTI_DATASET_TABLE_PREFIX
 from superset.datasets.commands.update import UpdateDatasetCommand
 from superset.datasource.dao import Datasource, DatasourceDAO
 from superset.exceptions import SupersetGenericDBErrorException
+from superset.utils.hashing import md5_sha_from_str
 from superset.views.multi_dataset import CreateMultiDatasetCommand
 
-tmp_table_name_prefix = "tmp__"
-
-special_characters = {"$": "", "-": "_"}
-
 smallcase_a_ascii_code = 97
 sql_postfix_schema = "WHERE 1=2"
 
@@ -78,198 +83,78 @@ class ExploreResponse:
         """
         Creates a Table name by combining all dataset names along with a Unique ID
         """
-        tmp_table_name = tmp_table_name_prefix
+        tmp_table_name = MULTI_DATASET_TABLE_PREFIX
         for datasource in datasources:
-            table_name = datasource.data["table_name"]
-            tmp_table_name += table_name + "__"
+            tmp_table_name += datasource.table_name + "__"
         tmp_table_name += str(uuid4())[:4]
         return tmp_table_name
 
     @staticmethod
-    def replace_special_characters(column: str) -> str:
-        for char, replaced_char in special_characters.items():
-            column.replace(char, replaced_char)
-        return column
-
-    @staticmethod
-    def get_calculated_columnexpression(
-        columns: List[Dict[str, Any]], column_expression: str, alias: str
-    ) -> str:
-        changed_expression = column_expression
-        for column in columns:
-            column_name = column["column_name"]
-            changed_expression = changed_expression.replace(
-                column_name, "{}.{}".format(alias, column_name)
-            )
-        return changed_expression
+    def get_table_alias(index: int) -> str:
+        return chr(smallcase_a_ascii_code + index)
 
     @staticmethod
-    def get_column_aliases(
-        columns: List[Dict[str, Any]], alias: str
-    ) -> Tuple[List[str], Dict[str, str]]:
+    def get_joined_table(datasource: BaseDatasource, alias: str) -> JoinedTable:
         """
-        Returns a list of Column names as Aliases for a SELECT Query
+        Returns a Dataset taking part in the join, along with its Columns labeled
+        by the Dataset alias
         """
-        renamed_columns: List[str] = []
-        column_expressions: Dict[str, str] = {}
-        for column in columns:
-            column_name = column["column_name"]
-            expression = column["expression"]
-            if expression:
-                column_name_exp = ExploreResponse.get_calculated_columnexpression(
-                    columns, expression, alias
-                )
-                column_expressions[column_name] = column_name_exp
-            else:
-                column_name_exp = "{}.{}".format(alias, column_name)
-            column_alias = "{}_{}".format(
-                alias, ExploreResponse.replace_special_characters(column_name)
+        column_names = [column.column_name for column in datasource.columns]
+        columns: Dict[str, str] = {}
+        for column in datasource.columns:
+            columns["{}_{}".format(alias, column.column_name)] = (
+                qualify_expression(column.expression, column_names, alias)
+                if column.expression
+                else "{}.{}".format(alias, column.column_name)
             )
-            renamed_columns.append("{} {}".format(column_name_exp, column_alias))
-        return renamed_columns, column_expressions
+        return JoinedTable(
+            alias=alias,
+            table_name=datasource.table_name,
+            schema=datasource.schema,
+            sql=datasource.sql,
+            columns=columns,
+        )
 
     @staticmethod
-    def map_and_get_column_names(
+    def get_join_plan(
         datasources: List[BaseDatasource],
-    ) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        joins: List[str],
+        dataset_joins: List[List[Dict[str, str]]],
+    ) -> JoinPlan:
         """
-        Iterates through Datasets and returns Column Aliases for each Dataset
+        Returns the plan joining each Dataset to the preceding one on the given
+        Column pairs
         """
-        table_column_expressions: Dict[str, Dict[str, str]] = {}
-        mapped_columns: List[str] = []  # pylint: disable=unsubscriptable-object
-        for index, datasource in enumerate(datasources):
-            table_name = datasource.data["table_name"]
-            columns: List[  # pylint: disable=unsubscriptable-object
-                Dict[str, Any]
-            ] = datasource.data["columns"]
-            renamed_columns, expression_columns = ExploreResponse.get_column_aliases(
-                columns, chr(smallcase_a_ascii_code + index)
+        tables = [
+            ExploreResponse.get_joined_table(
+                datasource, ExploreResponse.get_table_alias(index)
             )
-            column_aliases = ",".join(renamed_columns)
-            mapped_columns.append(column_aliases)
-            table_column_expressions[table_name] = expression_columns
-        return mapped_columns, table_column_expressions
-
-    @staticmethod
-    def column_joinfunc(
-        table_expressions: Dict[str, str], column_join: str, table: str
-    ) -> str:
-        return (
-            table_expressions[column_join]
-            if column_join in table_expressions
-            else "{}.{}".format(table, column_join)
-        )
-
-    @staticmethod
-    def get_single_column_join(
-        first_table: str,
-        second_table: str,
-        column_joins: List[Dict[str, str]],
-        first_table_expressions: Dict[str, str],
-        second_table_expressions: Dict[str, str],
-    ) -> str:
-        join = column_joins.pop()
-        first_column_join = join["first_column"]
-        second_column_join = join["second_column"]
-        left_join = ExploreResponse.column_joinfunc(
-            first_table_expressions, first_column_join, first_table
-        )
-        right_join = ExploreResponse.column_joinfunc(
-            second_table_expressions, second_column_join, second_table
-        )
-        return "{}={}".format(left_join, right_join)
-
-    @staticmethod
-    def get_multiple_column_join(  # pylint: disable=too-many-locals
-        first_table: str,
-        second_table: str,
-        column_joins: List[Dict[str, str]],
-        first_table_expressions: Dict[str, str],
-        second_table_expressions: Dict[str, str],
-    ) -> str:
-        join_statement = ""
-        last_join = column_joins.pop()
-        last_join_first_column = last_join["first_column"]
-        last_join_second_column = last_join["second_column"]
-        last_left_join = ExploreResponse.column_joinfunc(
-            first_table_expressions, last_join_first_column, first_table
-        )
-        last_right_join = ExploreResponse.column_joinfunc(
-            second_table_expressions, last_join_second_column, second_table
-        )
+            for index, datasource in enumerate(datasources)
+        ]
 
-        for count, join in enumerate(column_joins):
-            first_column_join = join["first_column"]
-            second_column_join = join["second_column"]
-            left_join = ExploreResponse.column_joinfunc(
-                first_table_expressions, first_column_join, first_table
-            )
-            right_join = ExploreResponse.column_joinfunc(
-                second_table_expressions, second_column_join, second_table
+        def column_expression(joined_table: JoinedTable, column_name: str) -> str:
+            return joined_table.columns.get(
+                "{}_{}".format(joined_table.alias, column_name),
+                "{}.{}".format(joined_table.alias, column_name),
             )
-            join_string = (
-                "{}={}".format(left_join, right_join)
-                if count == len(column_joins) - 1
-                else "{}={}, ".format(left_join, right_join)
-            )
-            join_statement += join_string
-        join_statement += " AND " + "{}={}".format(last_left_join, last_right_join)
-
-        return join_statement
 
-    @staticmethod
-    def get_join_query(
-        dataset_joins: List[List[Dict[str, str]]],
-        joins: List[str],
-        datasources: List[BaseDatasource],
-        table_column_expressions: Dict[str, Dict[str, str]],
-    ) -> str:
-        join_statement = ""
-        for index, column_joins in enumerate(dataset_joins):
-            table_join = ""
-            first_dataset = datasources[index]
-            second_dataset = datasources[index + 1]
-            first_table_name_alias = chr(smallcase_a_ascii_code + index)
-            second_table_name_alias = chr(smallcase_a_ascii_code + index + 1)
-            first_table_expressions = table_column_expressions[
-                datasources[index].data["table_name"]
-            ]
-            second_table_expressions = table_column_expressions[
-                datasources[index].data["table_name"]
-            ]
-            if len(column_joins) == 1:
-                table_join += ExploreResponse.get_single_column_join(
-                    first_table_name_alias,
-                    second_table_name_alias,
-                    column_joins,
-                    first_table_expressions,
-                    second_table_expressions,
+        return JoinPlan(
+            table=tables[0],
+            joins=[
+                Join(
+                    join_type=joins[index],
+                    table=tables[index + 1],
+                    on=[
+                        (
+                            column_expression(tables[index], join["first_column"]),
+                            column_expression(tables[index + 1], join["second_column"]),
+                        )
+                        for join in column_joins
+                    ],
                 )
-            else:
-                table_join += ExploreResponse.get_multiple_column_join(
-                    first_table_name_alias,
-                    second_table_name_alias,
-                    column_joins,
-                    first_table_expressions,
-                    second_table_expressions,
-                )
-            if index == 0:
-                join_statement += "{} {} {} {} {} ON {} ".format(
-                    first_dataset.name,
-                    first_table_name_alias,
-                    joins[index],
-                    second_dataset.name,
-                    second_table_name_alias,
-                    table_join,
-                )
-            else:
-                join_statement += "{} {} {} ON {} ".format(
-                    joins[index],
-                    second_dataset.name,
-                    second_table_name_alias,
-                    table_join,
-                )
-        return join_statement
+                for index, column_joins in enumerate(dataset_joins)
+            ],
+        )
 
     def multiple_dataset(  # pylint: disable=too-many-locals
         self,
@@ -287,19 +172,13 @@ class ExploreResponse:
         datasources = self.get_base_datasources(datasource_ids, datasource_types)
 
         table_name = self.get_table_name(datasources)
-        mapped_columns, table_column_expressions = self.map_and_get_column_names(
-            datasources
-        )
+        join_plan = self.get_join_plan(datasources, joins, dataset_joins)
 
-        column_aliases = ",".join(mapped_columns)
-        join_statement = self.get_join_query(
-            dataset_joins, joins, datasources, table_column_expressions
-        )
-
-        sql_query = "SELECT {} FROM {} ".format(column_aliases, join_statement)
-
-        presto_database = DatabaseDAO.get_database_by_name(
-            datasources[0].data["database"]["name"]
+        presto_database = datasources[0].database
+        sql_query = presto_database.compile_sqla_query(
+            join_plan.get_select(
+                text_clause=presto_database.db_engine_spec.get_text_clause
+            )
         )
 
         try:
@@ -319,7 +198,16 @@ class ExploreResponse:
 
         changed_model = UpdateDatasetCommand(
             new_model.id,
-            {"sql": sql_query, "extra": json.dumps({"multi_table_name": table_name})},
+            {
+                "sql": sql_query,
+                "extra": json.dumps(
+                    {
+                        "multi_table_name": table_name,
+                        JOIN_PLAN_KEY: join_plan.to_dict(),
+                        JOIN_PLAN_CHECKSUM_KEY: md5_sha_from_str(sql_query),
+                    }
+                ),
+            },
         ).run()
 
         datasource = DatasourceDAO.get_datasource(
@@ -17,7 +17,19 @@
 import logging
 from collections import defaultdict
 from functools import wraps
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Union
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    cast,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib import parse
 
 import msgpack
@@ -30,7 +42,7 @@ from flask_babel import _
 from sqlalchemy.orm.exc import NoResultFound
 
 import superset.models.core as models
-from superset import app, dataframe, db, result_set, viz
+from superset import app, dataframe, db, result_set, results_backend, viz
 from superset.common.db_query_status import QueryStatus
 from superset.datasource.dao import DatasourceDAO
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
@@ -47,6 +59,7 @@ from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
 from superset.superset_typing import FormData
+from superset.utils.compression import decompress
 from superset.utils.core import DatasourceType
 from superset.utils.decorators import stats_timing
 from superset.viz import BaseViz
@@ -553,9 +566,79 @@ def check_slice_perms(_self: Any, slice_id: int) -> None:
         viz_obj.raise_for_access()
 
 
+def _deserialize_pa_table(data: bytes) -> List[Dict[str, Any]]:
+    with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+        try:
+            pa_table = pa.deserialize(data)
+        except pa.ArrowSerializationError as ex:
+            raise SerializationError("Unable to deserialize table") from ex
+
+    df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
+    return dataframe.df_to_records(df) or []
+
+
+def iter_results_pages(
+    ds_payload: Dict[str, Any],
+    use_msgpack: Optional[bool] = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read the pages of results stored as pages in the results backend.
+
+    Only the pages holding the ``limit`` rows starting at row ``offset`` are read.
+
+    :param ds_payload: The deserialized manifest of the results
+    :param use_msgpack: Whether the pages hold Arrow tables rather than JSON
+    :param offset: The first row to read
+    :param limit: The maximum number of rows to read
+    :returns: The rows of each page, without expanding their nested fields
+    """
+    pages = ds_payload["pages"]
+    page_size = pages["page_size"]
+    end = pages["rows"] if limit is None else min(offset + limit, pages["rows"])
+    for number in range(offset // page_size, (end + page_size - 1) // page_size):
+        blob = results_backend.get(pages["keys"][number])
+        if not blob:
+            raise SerializationError("Unable to read page of results")
+        page = decompress(blob, decode=not use_msgpack)
+        if use_msgpack:
+            data = _deserialize_pa_table(cast(bytes, page))
+        else:
+            data = json.loads(page)
+        start = number * page_size
+        yield data[max(offset - start, 0) : end - start]
+
+
+def _read_results_rows(
+    ds_payload: Dict[str, Any],
+    use_msgpack: Optional[bool],
+    offset: int,
+    limit: Optional[int],
+) -> None:
+    if "pages" in ds_payload:
+        ds_payload["data"] = list(
+            chain.from_iterable(
+                iter_results_pages(ds_payload, use_msgpack, offset, limit)
+            )
+        )
+    elif offset:
+        ds_payload["data"] = ds_payload["data"][offset:]
+
+
 def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
 ) -> Dict[str, Any]:
+    """
+    Deserialize results read from the results backend.
+
+    When the results are stored as pages, only the pages holding the ``limit`` rows
+    starting at row ``offset`` are read, and ``pages`` describes the pages.
+    """
     logger.debug("Deserializing from msgpack: %r", use_msgpack)
     if use_msgpack:
         with stats_timing(
@@ -563,14 +646,9 @@ def _deserialize_results_payload(
         ):
             ds_payload = msgpack.loads(payload, raw=False)
 
-        with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
-            try:
-                pa_table = pa.deserialize(ds_payload["data"])
-            except pa.ArrowSerializationError as ex:
-                raise SerializationError("Unable to deserialize table") from ex
-
-        df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
-        ds_payload["data"] = dataframe.df_to_records(df) or []
+        if "pages" not in ds_payload:
+            ds_payload["data"] = _deserialize_pa_table(ds_payload["data"])
+        _read_results_rows(ds_payload, use_msgpack, offset, limit)
 
         db_engine_spec = query.database.db_engine_spec
         all_columns, data, expanded_columns = db_engine_spec.expand_data(
@@ -583,7 +661,10 @@ def _deserialize_results_payload(
         return ds_payload
 
     with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+        ds_payload = json.loads(payload)
+
+    _read_results_rows(ds_payload, use_msgpack, offset, limit)
+    return ds_payload
 
 
 def get_cta_schema_name(
@@ -292,6 +292,59 @@ class TestPostChartDataApi(BaseTestChartDataApi):
         rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
         assert rv.status_code == 403
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_json_columnar_result_format(self):
+        """
+        Chart data API: Test chart data with columnar JSON result format
+        """
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        records = rv.json["result"][0]["data"]
+
+        self.query_context_payload["result_format"] = "json_columnar"
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 200
+        result = rv.json["result"][0]
+        assert result["result_format"] == "json_columnar"
+        assert result["data"] == {
+            column: [record[column] for record in records]
+            for column in result["colnames"]
+        }
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_arrow_result_format(self):
+        """
+        Chart data API: Test chart data with Arrow result format
+        """
+        import pyarrow as pa
+
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        records = rv.json["result"][0]["data"]
+
+        self.query_context_payload["result_format"] = "arrow"
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 200
+        assert rv.mimetype == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(rv.data).read_all()
+        assert table.to_pydict() == {
+            column: [record[column] for record in records]
+            for column in table.column_names
+        }
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_multi_query_arrow_result_format(self):
+        """
+        Chart data API: Test chart data with multi-query Arrow result format
+        """
+        self.query_context_payload["result_format"] = "arrow"
+        self.query_context_payload["queries"].append(
+            self.query_context_payload["queries"][0]
+        )
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 200
+        assert rv.mimetype == "application/zip"
+        zipfile = ZipFile(BytesIO(rv.data), "r")
+        assert zipfile.namelist() == ["query_1.arrow", "query_2.arrow"]
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_with_row_limit_and_offset__row_limit_and_offset_were_applied(self):
         """
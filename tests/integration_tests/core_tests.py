@@ -733,6 +733,30 @@ class TestCore(SupersetTestCase):
         self.assertEqual(list(expected_data), list(data))
         self.logout()
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.views.core.config",
+        SQLLAB_CSV_EXPORT_STREAMING=True,
+        SQLLAB_CSV_EXPORT_CHUNK_SIZE=2,
+    )
+    def test_csv_endpoint_streaming(self):
+        self.login()
+        sql = """
+            SELECT name
+            FROM birth_names
+            ORDER BY name
+            LIMIT 5
+        """
+        client_id = "{}".format(random.getrandbits(64))[:10]
+        resp = self.run_sql(sql, client_id, raise_on_error=True)
+        names = [row["name"] for row in resp["data"]]
+
+        resp = self.get_resp("/superset/csv/{}".format(client_id))
+        data = csv.reader(io.StringIO(resp))
+
+        self.assertEqual([["name"]] + [[name] for name in names], list(data))
+        self.logout()
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_extra_table_metadata(self):
         self.login()
@@ -17,6 +17,7 @@
 # isort:skip_file
 """Unit tests for Superset"""
 import json
+from copy import deepcopy
 from io import BytesIO
 from time import sleep
 from typing import List, Optional
@@ -32,6 +33,8 @@ import yaml
 from freezegun import freeze_time
 from sqlalchemy import and_
 from superset import db, security_manager
+from superset.dashboards.dao import DashboardDAO
+from superset.extensions import cache_manager
 from superset.models.dashboard import Dashboard
 from superset.models.core import FavStar, FavStarClassName
 from superset.reports.models import ReportSchedule, ReportScheduleType
@@ -218,6 +221,46 @@ class TestDashboardApi(SupersetTestCase, ApiOwnersTestCaseMixin, InsertChartMixi
         expected_values = [0, 1] if backend() == "presto" else [0, 1, 2]
         self.assertEqual(result[0]["column_types"], expected_values)
 
+    @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
+    def test_get_dashboard_datasets_cache(self):
+        """
+        Dashboard API: Test the datasets of a dashboard are cached per roles
+        """
+        uri = "api/v1/dashboard/world_health/datasets"
+        responses = {}
+        with patch.object(
+            DashboardDAO,
+            "get_datasets_for_dashboard",
+            wraps=DashboardDAO.get_datasets_for_dashboard,
+        ) as get_datasets_for_dashboard, patch.object(
+            cache_manager.cache,
+            "get",
+            side_effect=lambda key: deepcopy(responses.get(key)),
+        ), patch.object(
+            cache_manager.cache,
+            "set",
+            side_effect=lambda key, value, timeout: responses.update({key: value}),
+        ):
+            self.login(username="admin")
+            response = self.client.get(uri)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("Last-Modified", response.headers)
+            etag = response.headers["ETag"]
+
+            response = self.client.get(uri)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["ETag"], etag)
+            response = self.client.get(uri, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(get_datasets_for_dashboard.call_count, 1)
+
+            # users with other roles don't share the cached response
+            self.logout()
+            self.login(username="gamma")
+            response = self.client.get(uri)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(get_datasets_for_dashboard.call_count, 2)
+
     @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
     def test_get_dashboard_datasets_not_found(self):
         self.login(username="alpha")
@@ -27,6 +27,7 @@ from freezegun import freeze_time
 from superset import security_manager
 from superset.utils.log import (
     AbstractEventLogger,
+    BufferedDBEventLogger,
     DBEventLogger,
     get_event_logger_from_cfg_value,
 )
@@ -230,3 +231,50 @@ class TestEventLogger(unittest.TestCase):
             )
 
         assert logger.records[0]["user_id"] == None
+
+    @patch.object(DBEventLogger, "save_logs")
+    def test_buffered_logger(self, mock_save_logs):
+        logger = BufferedDBEventLogger(
+            batch_size=10, flush_interval=3600, max_buffer_size=3
+        )
+
+        with app.app_context():
+            logger.log(1, "foo", None, 10, None, None, records=[{"a": 1}])
+            assert logger.buffer_size == 1
+            mock_save_logs.assert_not_called()
+
+            logger.log(1, "bar", 2, 20, 3, None, records=[{"b": 1}, {"b": 2}])
+            logger.log(1, "baz", None, 30, None, None, records=[{"c": 1}])
+            # the buffer is full
+            logger.log(1, "qux", None, 40, None, None, records=[{"d": 1}])
+            assert logger.dropped == 1
+            logger.flush()
+
+        assert logger.buffer_size == 0
+        logs = mock_save_logs.call_args[0][0]
+        assert [log.action for log in logs] == ["foo", "bar", "bar", "baz"]
+        assert [log.json for log in logs] == [
+            '{"a": 1}',
+            '{"b": 1}',
+            '{"b": 2}',
+            '{"c": 1}',
+        ]
+        assert logs[1].dashboard_id == 2
+        assert logs[1].slice_id == 3
+
+    @patch.object(DBEventLogger, "save_logs")
+    def test_buffered_logger_flushes_full_batches(self, mock_save_logs):
+        logger = BufferedDBEventLogger(batch_size=2, flush_interval=3600)
+
+        with app.app_context():
+            logger.log(1, "foo", None, 10, None, None, records=[{}])
+            logger.log(1, "bar", None, 10, None, None, records=[{}])
+
+        for _ in range(50):
+            if mock_save_logs.called:
+                break
+            time.sleep(0.1)
+        assert [log.action for log in mock_save_logs.call_args[0][0]] == [
+            "foo",
+            "bar",
+        ]
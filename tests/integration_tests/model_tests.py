@@ -600,6 +600,67 @@ class TestSqlaTableModel(SupersetTestCase):
             "state",
         }
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_datasets_trimmed_for_slices(self):
+        dashboard = self.get_dash_by_slug("births")
+        tbl = self.get_table(name="birth_names")
+        slices = [slc for slc in dashboard.slices if slc.datasource_id == tbl.id]
+
+        # the trimmed payload is the full payload restricted to the used fields
+        full_data = tbl.data
+        data_for_slices = tbl.data_for_slices(slices)
+        column_names = {column["column_name"] for column in data_for_slices["columns"]}
+        metric_names = {metric["metric_name"] for metric in data_for_slices["metrics"]}
+        assert data_for_slices["columns"] == [
+            column
+            for column in full_data["columns"]
+            if column["column_name"] in column_names
+        ]
+        assert data_for_slices["metrics"] == [
+            metric
+            for metric in full_data["metrics"]
+            if metric["metric_name"] in metric_names
+        ]
+        assert {
+            key: value
+            for key, value in full_data.items()
+            if key not in {"columns", "metrics", "verbose_map", "description"}
+        } == {
+            key: value
+            for key, value in data_for_slices.items()
+            if key not in {"columns", "metrics", "verbose_map", "column_types"}
+        }
+
+        cached = {}
+        cache = mock.MagicMock()
+        cache.get_many.side_effect = lambda *keys: [cached.get(key) for key in keys]
+        cache.set.side_effect = cached.__setitem__
+        with mock.patch("superset.models.dashboard.cache_manager") as cache_manager:
+            cache_manager.cache = cache
+            datasets = dashboard.datasets_trimmed_for_slices()
+            assert len(cached) == len(datasets)
+            assert data_for_slices in datasets
+
+            # payloads are served from the cache
+            with mock.patch.object(SqlaTable, "data_for_fields") as data_for_fields:
+                assert dashboard.datasets_trimmed_for_slices() == datasets
+                data_for_fields.assert_not_called()
+
+            # editing a column doesn't change its table, but invalidates its payload
+            column = tbl.columns[0]
+            verbose_name = column.verbose_name
+            column.verbose_name = "edited"
+            metadata_db.session.commit()
+            try:
+                with mock.patch.object(
+                    SqlaTable, "data_for_fields", return_value={}
+                ) as data_for_fields:
+                    dashboard.datasets_trimmed_for_slices()
+                    data_for_fields.assert_called()
+            finally:
+                column.verbose_name = verbose_name
+                metadata_db.session.commit()
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_data_for_slices_with_adhoc_column(self):
         # should perform sqla.model.BaseDatasource.data_for_slices() with adhoc
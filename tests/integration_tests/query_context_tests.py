@@ -17,6 +17,7 @@
 import re
 import time
 from typing import Any, Dict
+from unittest import mock
 
 import numpy as np
 import pandas as pd
@@ -29,7 +30,7 @@ from superset.common.chart_data import ChartDataResultFormat, ChartDataResultTyp
 from superset.common.query_context import QueryContext
 from superset.common.query_context_factory import QueryContextFactory
 from superset.common.query_object import QueryObject
-from superset.connectors.sqla.models import SqlMetric
+from superset.connectors.sqla.models import SqlaTable, SqlMetric
 from superset.datasource.dao import DatasourceDAO
 from superset.extensions import cache_manager
 from superset.superset_typing import AdhocColumn
@@ -133,6 +134,111 @@ class TestQueryContext(SupersetTestCase):
         self.assertEqual(rehydrated_qc.result_format, query_context.result_format)
         self.assertFalse(rehydrated_qc.force)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.common.utils.query_cache_manager.config",
+        {"DATA_CACHE_STALE_TIMEOUT": 600},
+    )
+    @mock.patch("superset.tasks.async_queries.load_chart_data_into_cache.delay")
+    def test_stale_while_revalidate(self, mock_delay):
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        ChartDataQueryContextSchema().load(payload).get_payload()
+
+        payload["force"] = False
+        query_context = ChartDataQueryContextSchema().load(payload)
+        query_object = query_context.queries[0]
+        cache_key = query_context.query_cache_key(query_object)
+        result = query_context.get_df_payload(query_object)
+        assert result["is_cached"]
+        assert not result["is_stale"]
+        mock_delay.assert_not_called()
+
+        # past the cache timeout, the stale result is served and refreshed once
+        stale_time = time.time() + query_context.get_cache_timeout() + 1
+        with mock.patch(
+            "superset.common.utils.query_cache_manager.time.time",
+            return_value=stale_time,
+        ):
+            for _ in range(2):
+                result = query_context.get_df_payload(query_object)
+                assert result["is_cached"]
+                assert result["is_stale"]
+                assert not result["df"].empty
+
+        mock_delay.assert_called_once()
+        job_metadata, form_data = mock_delay.call_args[0]
+        assert job_metadata["refresh_key"] == f"{cache_key}__refresh"
+        assert form_data["force"]
+        refreshed_context = ChartDataQueryContextSchema().load(form_data)
+        assert refreshed_context.query_cache_key(query_object) == cache_key
+        cache_manager.data_cache.delete(job_metadata["refresh_key"])
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.common.utils.query_cache_manager.config",
+        {"DATA_CACHE_STALE_TIMEOUT": 600},
+    )
+    @mock.patch("superset.tasks.async_queries.load_chart_data_into_cache.delay")
+    def test_stale_while_revalidate_enqueue_failure(self, mock_delay):
+        mock_delay.side_effect = Exception("Broker unavailable")
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        ChartDataQueryContextSchema().load(payload).get_payload()
+
+        payload["force"] = False
+        query_context = ChartDataQueryContextSchema().load(payload)
+        query_object = query_context.queries[0]
+        cache_key = query_context.query_cache_key(query_object)
+
+        # the stale result is still served, and the refresh retried next time
+        stale_time = time.time() + query_context.get_cache_timeout() + 1
+        with mock.patch(
+            "superset.common.utils.query_cache_manager.time.time",
+            return_value=stale_time,
+        ):
+            for _ in range(2):
+                result = query_context.get_df_payload(query_object)
+                assert result["is_stale"]
+                assert not result["df"].empty
+
+        assert mock_delay.call_count == 2
+        assert not cache_manager.data_cache.get(f"{cache_key}__refresh")
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.common.utils.query_cache_manager.config",
+        {"DATA_CACHE_STALE_TIMEOUT": 600},
+    )
+    @mock.patch("superset.tasks.async_queries.load_chart_data_into_cache.delay")
+    def test_stale_while_revalidate_guest_user(self, mock_delay):
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        ChartDataQueryContextSchema().load(payload).get_payload()
+
+        payload["force"] = False
+        query_context = ChartDataQueryContextSchema().load(payload)
+        query_object = query_context.queries[0]
+
+        # stale results of guest users are refreshed in the request
+        stale_time = time.time() + query_context.get_cache_timeout() + 1
+        with mock.patch(
+            "superset.common.utils.query_cache_manager.time.time",
+            return_value=stale_time,
+        ), mock.patch(
+            "superset.common.query_context_processor.security_manager.is_guest_user",
+            return_value=True,
+        ), mock.patch(
+            "superset.common.query_context_processor.security_manager.get_rls_cache_key",
+            return_value=[],
+        ):
+            result = query_context.get_df_payload(query_object)
+            assert not result["is_cached"]
+            assert not result["is_stale"]
+            assert not result["df"].empty
+
+        mock_delay.assert_not_called()
+
     def test_query_cache_key_changes_when_datasource_is_updated(self):
         self.login(username="admin")
         payload = get_query_context("birth_names")
@@ -538,6 +644,107 @@ class TestQueryContext(SupersetTestCase):
         assert re.search(r"1991-01-01.+1992-01-01", sqls[2], re.S)
         assert re.search(r"1990-01-01.+1991-01-01", sqls[2], re.S)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_concurrent_time_offsets(self):
+        """
+        Ensure that time offsets queried concurrently return the same results as
+        when queried one after another, each on its own copy of the datasource
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["queries"][0]["metrics"] = ["sum__num"]
+        payload["queries"][0]["groupby"] = ["name"]
+        payload["queries"][0]["is_timeseries"] = True
+        payload["queries"][0]["time_offsets"] = ["1 year ago", "1 year later"]
+        payload["queries"][0]["time_range"] = "1990 : 1991"
+        payload["force"] = True
+        serial = ChartDataQueryContextSchema().load(payload).get_payload()
+
+        datasources = []
+        query = SqlaTable.query
+
+        def query_datasource(datasource, query_obj, **kwargs):
+            datasources.append(datasource)
+            return query(datasource, query_obj, **kwargs)
+
+        with mock.patch.dict(
+            "superset.common.query_context_processor.config",
+            {"TIME_OFFSETS_MAX_WORKERS": 2},
+        ), mock.patch.object(
+            SqlaTable, "query", autospec=True, side_effect=query_datasource
+        ):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            concurrent = query_context.get_payload()
+
+        expected, result = serial["queries"][0], concurrent["queries"][0]
+        assert result["colnames"] == expected["colnames"]
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(result["data"]), pd.DataFrame(expected["data"])
+        )
+        assert len(datasources) == 3
+        assert datasources[0] is query_context.datasource
+        assert all(
+            datasource is not query_context.datasource
+            and datasource.id == query_context.datasource.id
+            for datasource in datasources[1:]
+        )
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_concurrent_query_objects(self):
+        """
+        Ensure that query objects run concurrently return the same results, in the
+        same order, as when they run one after another
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        query = payload["queries"][0]
+        query["time_offsets"] = ["1 year ago"]
+        query["time_range"] = "1990 : 1991"
+        query["is_timeseries"] = True
+        query["metrics"] = ["sum__num"]
+        payload["queries"] = [
+            {**query, "groupby": ["name"]},
+            {**query, "groupby": ["gender"]},
+            {**query, "groupby": []},
+        ]
+        payload["force"] = True
+
+        serial = ChartDataQueryContextSchema().load(payload).get_payload()
+        # queries run one after another aren't queued
+        assert all(result["timing"]["queued_ms"] == 0 for result in serial["queries"])
+
+        datasources = []
+        query = SqlaTable.query
+
+        def query_datasource(datasource, query_obj, **kwargs):
+            datasources.append(datasource)
+            return query(datasource, query_obj, **kwargs)
+
+        with mock.patch.dict(
+            "superset.common.query_context_processor.config",
+            {"CHART_DATA_QUERIES_MAX_WORKERS": 3},
+        ), mock.patch.object(
+            SqlaTable, "query", autospec=True, side_effect=query_datasource
+        ):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            concurrent = query_context.get_payload()
+
+        assert len(concurrent["queries"]) == 3
+        for expected, result in zip(serial["queries"], concurrent["queries"]):
+            assert result["status"] == QueryStatus.SUCCESS
+            assert result["colnames"] == expected["colnames"]
+            pd.testing.assert_frame_equal(
+                pd.DataFrame(result["data"]), pd.DataFrame(expected["data"])
+            )
+            assert set(result["timing"]) == {"queued_ms", "duration_ms"}
+        # the workers query their own copies of the datasource
+        assert len(datasources) == 6
+        assert all(
+            datasource is not query_context.datasource
+            and datasource.id == query_context.datasource.id
+            for datasource in datasources
+        )
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_processing_time_offsets_cache(self):
         """
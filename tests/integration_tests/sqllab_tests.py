@@ -758,6 +758,7 @@ class TestSqlLab(SupersetTestCase):
                     mock_cursor,
                     None,
                     False,
+                    None,
                 ),
                 mock.call(
                     "SELECT @value AS foo",
@@ -766,6 +767,7 @@ class TestSqlLab(SupersetTestCase):
                     mock_cursor,
                     None,
                     False,
+                    None,
                 ),
             ]
         )
@@ -865,6 +867,7 @@ class TestSqlLab(SupersetTestCase):
                     mock_cursor,
                     None,
                     False,
+                    None,
                 ),
                 mock.call(
                     "SELECT @value AS foo",
@@ -873,6 +876,7 @@ class TestSqlLab(SupersetTestCase):
                     mock_cursor,
                     None,
                     True,  # apply_ctas
+                    None,
                 ),
             ]
         )
@@ -18,7 +18,7 @@
 """Unit tests for Superset cache warmup"""
 import datetime
 import json
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from tests.integration_tests.fixtures.birth_names_dashboard import (
     load_birth_names_dashboard_with_slices,
     load_birth_names_data,
@@ -29,6 +29,8 @@ from sqlalchemy import String, Date, Float
 import pytest
 import pandas as pd
 
+from superset.charts.commands.exceptions import ChartDataQueryFailedError
+from superset.charts.data.commands.get_data_command import ChartDataCommand
 from superset.models.slice import Slice
 from superset.utils.database import get_example_database
 
@@ -37,13 +39,16 @@ from superset import db
 from superset.models.core import Log
 from superset.tags.models import get_tag, ObjectTypes, TaggedObject, TagTypes
 from superset.tasks.cache import (
+    cache_warmup,
     DashboardTagsStrategy,
     TopNDashboardsStrategy,
+    warm_up_chart,
 )
 from superset.utils.urls import get_url_host
 
 from .base_tests import SupersetTestCase
 from .dashboard_utils import create_dashboard, create_slice, create_table_metadata
+from .fixtures.query_context import get_query_context
 from .fixtures.unicode_dashboard import (
     load_unicode_dashboard_with_slice,
     load_unicode_data,
@@ -151,3 +156,49 @@ class TestCacheWarmUp(SupersetTestCase):
         result = sorted(strategy.get_urls())
         expected = sorted(tag1_urls + tag2_urls)
         self.assertEqual(result, expected)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_warm_up_chart(self):
+        dash = self.get_dash_by_slug("births")
+        slc = dash.slices[0]
+        self.assertEqual(warm_up_chart(slc.id, dash.id, "admin"), "warmed")
+        self.assertEqual(warm_up_chart(0, None, "admin"), "skipped")
+
+        # charts whose query context is saved run through the chart data API, without
+        # the default filters of the dashboard
+        query_context = slc.query_context
+        slc.query_context = json.dumps(get_query_context("birth_names"))
+        db.session.commit()
+        try:
+            with patch.object(ChartDataCommand, "run") as mock_run, patch(
+                "superset.tasks.cache.get_dashboard_extra_filters"
+            ) as mock_get_dashboard_extra_filters:
+                self.assertEqual(warm_up_chart(slc.id, dash.id, "admin"), "warmed")
+                mock_run.assert_called_once()
+                mock_get_dashboard_extra_filters.assert_not_called()
+                mock_run.side_effect = ChartDataQueryFailedError("Error: foo")
+                self.assertEqual(warm_up_chart(slc.id, dash.id, "admin"), "failed")
+        finally:
+            slc.query_context = query_context
+            db.session.commit()
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_cache_warmup(self):
+        chart_ids = [slc.id for slc in db.session.query(Slice).all()]
+        statuses = ["warmed", "failed", "skipped"]
+        with patch(
+            "superset.tasks.cache.warm_up_chart",
+            side_effect=lambda chart_id, dashboard_id, username: statuses[chart_id % 3],
+        ) as mock_warm_up_chart:
+            result = cache_warmup("dummy")
+
+        self.assertEqual(
+            result,
+            {
+                status: sum(statuses[chart_id % 3] == status for chart_id in chart_ids)
+                for status in statuses
+            },
+        )
+        self.assertEqual(mock_warm_up_chart.call_count, len(chart_ids))
+        # the user is loaded by each worker
+        mock_warm_up_chart.assert_any_call(chart_ids[0], None, "admin")
@@ -25,7 +25,7 @@ from flask import g
 from superset.charts.commands.exceptions import ChartDataQueryFailedError
 from superset.charts.data.commands.get_data_command import ChartDataCommand
 from superset.exceptions import SupersetException
-from superset.extensions import async_query_manager, security_manager
+from superset.extensions import async_query_manager, cache_manager, security_manager
 from superset.tasks import async_queries
 from superset.tasks.async_queries import (
     load_chart_data_into_cache,
@@ -85,6 +85,24 @@ class TestAsyncQueries(SupersetTestCase):
         errors = [{"message": "Error: foo"}]
         mock_update_job.assert_called_once_with(job_metadata, "error", errors=errors)
 
+    @mock.patch.object(ChartDataCommand, "run")
+    @mock.patch.object(async_query_manager, "update_job")
+    @mock.patch.object(async_queries, "set_form_data")
+    def test_load_chart_data_into_cache_refresh(
+        self, mock_set_form_data, mock_update_job, mock_run_command
+    ):
+        query_context = get_query_context("birth_names")
+        user = security_manager.find_user("gamma")
+        refresh_key = f"{uuid4()}__refresh"
+        cache_manager.data_cache.set(refresh_key, True)
+        job_metadata = {"user_id": user.id, "refresh_key": refresh_key}
+
+        load_chart_data_into_cache(job_metadata, query_context)
+        mock_run_command.assert_called_once_with(cache=True)
+        # refreshes aren't async query jobs
+        mock_update_job.assert_not_called()
+        assert cache_manager.data_cache.get(refresh_key) is None
+
     @mock.patch.object(ChartDataCommand, "run")
     @mock.patch.object(async_query_manager, "update_job")
     def test_soft_timeout_load_chart_data_into_cache(
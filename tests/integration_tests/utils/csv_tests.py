@@ -81,3 +81,66 @@ def test_df_to_escaped_csv():
 
     df = pa.array([1, None]).to_pandas(integer_object_nulls=True).to_frame()
     assert csv.df_to_escaped_csv(df, encoding="utf8", index=False) == '0\n1\n""\n'
+
+
+def test_df_chunks_to_escaped_csv():
+    chunks = [
+        pd.DataFrame({"a": ["=x", "y"], "b": [1, 2]}),
+        pd.DataFrame({"a": ["z"], "b": [3]}),
+    ]
+    escaped_csv_str = "".join(
+        csv.df_chunks_to_escaped_csv(chunks, encoding="utf8", index=False)
+    )
+    assert escaped_csv_str == "a,b\n'=x,1\ny,2\nz,3\n"
+
+
+def _legacy_df_to_escaped_csv(df, **kwargs):
+    """The original cell-by-cell implementation of ``df_to_escaped_csv``"""
+    escape_values = lambda v: csv.escape_value(v) if isinstance(v, str) else v
+    df = df.rename(columns=escape_values)
+    for name, column in df.items():
+        if column.dtype == object:
+            for idx, value in enumerate(column.values):
+                if isinstance(value, str):
+                    df.at[idx, name] = csv.escape_value(value)
+    return df.to_csv(**kwargs)
+
+
+def test_df_to_escaped_csv_matches_legacy():
+    values = [
+        "value",
+        "-10",
+        "-10.5",
+        "@value",
+        "+value",
+        "-value",
+        "=value",
+        "|value",
+        "%value",
+        "=cmd|' /C calc'!A0",
+        '""=10+2',
+        " =10+2",
+        "a|b",
+        "",
+        None,
+        1,
+        2.5,
+        b"=bytes",
+    ]
+    df = pd.DataFrame(
+        {
+            "=col": values,
+            "str": [str(v) for v in values],
+            "int": range(len(values)),
+        }
+    )
+    assert csv.df_to_escaped_csv(
+        df, encoding="utf8", index=False
+    ) == _legacy_df_to_escaped_csv(df, encoding="utf8", index=False)
+    # the input DataFrame is not modified
+    assert df["=col"][3] == "@value"
+
+
+def test_escape_df_non_range_index():
+    df = pd.DataFrame({"a": ["=x", "y"]}, index=[10, 10])
+    assert csv.escape_df(df)["a"].tolist() == ["'=x", "y"]
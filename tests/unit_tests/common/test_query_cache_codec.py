@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+from datetime import datetime
+
+import pandas as pd
+from pytest_mock import MockFixture
+
+
+def test_arrow_roundtrip() -> None:
+    from superset.common.utils.query_cache_codec import (
+        deserialize_df,
+        is_arrow_envelope,
+        serialize_df,
+    )
+
+    df = pd.DataFrame(
+        {
+            "__timestamp": [datetime(2022, 1, 1), datetime(2022, 1, 2)],
+            "name": ["foo", None],
+            "SUM(num)": [1.5, 2.0],
+            "cnt": [1, 2],
+        }
+    )
+    envelope = serialize_df(df)
+    assert is_arrow_envelope(envelope)
+    assert envelope["rowcount"] == 2
+    assert envelope["colnames"] == ["__timestamp", "name", "SUM(num)", "cnt"]
+    pd.testing.assert_frame_equal(deserialize_df(envelope), df)
+
+
+def test_serialize_unsupported_df() -> None:
+    from superset.common.utils.query_cache_codec import serialize_df
+
+    df = pd.DataFrame({"mixed": [1, "a", {"b": 2}]})
+    assert serialize_df(df) is None
+
+
+def test_encode_cache_value(mocker: MockFixture) -> None:
+    from superset.common.utils import query_cache_codec
+
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    value = {"df": df, "query": "SELECT a FROM t"}
+
+    mocker.patch.dict(query_cache_codec.config, {"DATA_CACHE_USE_ARROW": False})
+    assert query_cache_codec.encode_cache_value(value) is value
+
+    mocker.patch.dict(query_cache_codec.config, {"DATA_CACHE_USE_ARROW": True})
+    encoded = query_cache_codec.encode_cache_value(value)
+    assert encoded["query"] == "SELECT a FROM t"
+    assert query_cache_codec.is_arrow_envelope(encoded["df"])
+
+
+def test_query_cache_manager_lazy_df(mocker: MockFixture) -> None:
+    from superset.common.utils.query_cache_codec import serialize_df
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    deserialize_df = mocker.patch(
+        "superset.common.utils.query_cache_manager.deserialize_df",
+        return_value=df,
+    )
+    cache = QueryCacheManager(df=serialize_df(df))
+    assert cache.rowcount == 3
+    assert cache.colnames == ["a", "b"]
+    deserialize_df.assert_not_called()
+
+    assert cache.df is df
+    assert cache.df is df
+    deserialize_df.assert_called_once()
@@ -0,0 +1,114 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, invalid-name, protected-access
+from pytest_mock import MockFixture
+
+
+def test_has_uses_backend_existence_check(mocker: MockFixture) -> None:
+    from superset.common.utils import query_cache_manager
+    from superset.constants import CacheRegion
+
+    cache = mocker.MagicMock()
+    cache.has.return_value = True
+    mocker.patch.dict(query_cache_manager._cache, {CacheRegion.DATA: cache})
+
+    assert query_cache_manager.QueryCacheManager.has("key", CacheRegion.DATA)
+    cache.has.assert_called_once_with("key")
+    cache.get.assert_not_called()
+
+    assert not query_cache_manager.QueryCacheManager.has(None, CacheRegion.DATA)
+
+
+def test_has_falls_back_to_get(mocker: MockFixture) -> None:
+    from superset.common.utils import query_cache_manager
+    from superset.constants import CacheRegion
+
+    cache = mocker.MagicMock()
+    cache.has.side_effect = NotImplementedError()
+    cache.get.return_value = {"df": None}
+    mocker.patch.dict(query_cache_manager._cache, {CacheRegion.DATA: cache})
+
+    assert query_cache_manager.QueryCacheManager.has("key", CacheRegion.DATA)
+    cache.get.assert_called_once_with("key")
+
+
+def test_single_flight(mocker: MockFixture) -> None:
+    from flask import current_app
+    from flask_caching import Cache
+    from pandas import DataFrame
+
+    from superset.common.utils import query_cache_manager
+    from superset.constants import CacheRegion
+
+    mocker.patch.dict(
+        "superset.utils.cache.config",
+        {"CACHE_SINGLE_FLIGHT": True, "CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0.01},
+    )
+    cache = Cache(
+        current_app._get_current_object(), config={"CACHE_TYPE": "SimpleCache"}
+    )
+    mocker.patch.dict(query_cache_manager._cache, {CacheRegion.DATA: cache})
+    QueryCacheManager = query_cache_manager.QueryCacheManager
+
+    with QueryCacheManager.single_flight("key", CacheRegion.DATA) as loaded:
+        assert loaded is None
+        # a forced query doesn't wait for the result
+        with QueryCacheManager.single_flight(
+            "key", CacheRegion.DATA, force_query=True
+        ) as loaded:
+            assert loaded is None
+        cache.set("key", {"df": DataFrame({"a": [1]}), "query": "", "dttm": None})
+        # other workers get the result loaded by the worker holding the lock
+        with QueryCacheManager.single_flight("key", CacheRegion.DATA) as loaded:
+            assert loaded is not None
+            assert loaded.is_loaded
+            assert loaded.df["a"].tolist() == [1]
+
+
+def test_stale_timeout(mocker: MockFixture) -> None:
+    from pandas import DataFrame
+
+    from superset.common.db_query_status import QueryStatus
+    from superset.common.utils import query_cache_manager
+    from superset.constants import CacheRegion
+    from superset.models.helpers import QueryResult
+
+    mocker.patch.dict(query_cache_manager.config, {"DATA_CACHE_STALE_TIMEOUT": 60})
+    mock_time = mocker.patch.object(query_cache_manager.time, "time")
+    mock_time.return_value = 1000.0
+    set_and_log_cache = mocker.patch.object(query_cache_manager, "set_and_log_cache")
+    QueryCacheManager = query_cache_manager.QueryCacheManager
+
+    QueryCacheManager().set_query_result(
+        key="key",
+        query_result=QueryResult(
+            df=DataFrame({"a": [1]}), query="", duration=0, status=QueryStatus.SUCCESS
+        ),
+        timeout=30,
+        region=CacheRegion.DATA,
+    )
+    _, _, value, timeout, _ = set_and_log_cache.call_args[0]
+    # the result is kept past its timeout
+    assert timeout == 90
+    assert value["stale_after"] == 1030.0
+
+    cache = mocker.MagicMock()
+    cache.get.return_value = {**value, "dttm": None}
+    mocker.patch.dict(query_cache_manager._cache, {CacheRegion.DATA: cache})
+    assert not QueryCacheManager.get("key", CacheRegion.DATA).is_stale
+    mock_time.return_value = 1030.0
+    assert QueryCacheManager.get("key", CacheRegion.DATA).is_stale
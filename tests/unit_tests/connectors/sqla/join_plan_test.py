@@ -0,0 +1,140 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, redefined-outer-name
+import json
+from typing import Any, TYPE_CHECKING
+
+import pytest
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql import literal_column
+
+if TYPE_CHECKING:
+    from superset.connectors.sqla.join_plan import JoinPlan
+
+
+def compile_(qry: Any) -> str:
+    return " ".join(
+        str(
+            qry.compile(
+                dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        ).split()
+    )
+
+
+@pytest.fixture
+def join_plan() -> "JoinPlan":
+    from superset.connectors.sqla.join_plan import Join, JoinedTable, JoinPlan
+
+    return JoinPlan(
+        table=JoinedTable(
+            alias="a",
+            table_name="orders",
+            schema="sales",
+            columns={"a_id": "a.id", "a_user_id": "a.user_id"},
+        ),
+        joins=[
+            Join(
+                join_type="LEFT JOIN",
+                table=JoinedTable(
+                    alias="b",
+                    table_name="users",
+                    sql="SELECT id, name, country FROM users",
+                    columns={"b_name": "b.name", "b_country": "b.country"},
+                ),
+                on=[("a.user_id", "b.id"), ("a.country", "b.country")],
+            ),
+        ],
+    )
+
+
+def test_join_plan_select(join_plan: "JoinPlan") -> None:
+    assert compile_(join_plan.get_select([literal_column("b.name") == "foo"])) == (
+        "SELECT a.id AS a_id, a.user_id AS a_user_id, b.name AS b_name, "
+        "b.country AS b_country "
+        "FROM sales.orders AS a LEFT OUTER JOIN "
+        "(SELECT id, name, country FROM users) AS b "
+        "ON a.user_id = b.id AND a.country = b.country "
+        "WHERE b.name = 'foo'"
+    )
+
+
+def test_join_plan_right_join(join_plan: "JoinPlan") -> None:
+    join_plan.joins[0].join_type = "RIGHT JOIN"
+    assert "FROM (SELECT id, name, country FROM users) AS b LEFT OUTER JOIN " in (
+        compile_(join_plan.get_select())
+    )
+
+
+def test_join_plan_roundtrip(join_plan: "JoinPlan") -> None:
+    from superset.connectors.sqla.join_plan import JoinPlan
+
+    data = json.loads(json.dumps(join_plan.to_dict()))
+    assert JoinPlan.from_dict(data) == join_plan
+
+
+def test_qualify_expression() -> None:
+    from superset.connectors.sqla.join_plan import qualify_expression
+
+    assert (
+        qualify_expression(
+            "CASE WHEN id > 0 THEN user_id ELSE b.id END", ["id", "user_id"], "a"
+        )
+        == "CASE WHEN a.id > 0 THEN a.user_id ELSE b.id END"
+    )
+    assert qualify_expression("1 + 1", [], "a") == "1 + 1"
+    assert (
+        qualify_expression("name = 'name' OR name = 'it''s name'", ["name"], "a")
+        == "a.name = 'name' OR a.name = 'it''s name'"
+    )
+    assert qualify_expression('"name" || name', ["name"], "a") == '"name" || a.name'
+
+
+def test_join_plan_prune(join_plan: "JoinPlan") -> None:
+    pruned = join_plan.prune({"a_id"})
+    assert pruned.columns == {"a_id": "a.id"}
+    assert len(pruned.joins) == 1
+
+    pruned = join_plan.prune({"a_id"}, prune_joins=True)
+    assert pruned.columns == {"a_id": "a.id"}
+    assert compile_(pruned.get_select()) == "SELECT a.id AS a_id FROM sales.orders AS a"
+
+    # inner joins filter rows, so they're never removed
+    join_plan.joins[0].join_type = "INNER JOIN"
+    assert len(join_plan.prune({"a_id"}, prune_joins=True).joins) == 1
+
+    # the joining query selects at least one column
+    assert join_plan.prune(set()).columns == {"a_id": "a.id"}
+
+
+def test_get_referenced_columns() -> None:
+    from sqlalchemy import func, select, text
+    from sqlalchemy.sql import column
+
+    from superset.connectors.sqla.join_plan import get_referenced_columns
+
+    labels = ["a_id", "a_amount", "b_name", "b_country"]
+    qry = (
+        select([column("b_name"), func.sum(literal_column("a_amount * 2"))])
+        .where(text("b_country = 'FR'"))
+        .group_by(column("b_name"))
+    )
+    assert get_referenced_columns([qry], labels) == {
+        "a_amount",
+        "b_country",
+        "b_name",
+    }
@@ -60,6 +60,80 @@ def test_js_max_int() -> None:
     ]
 
 
+def test_js_max_int_dtypes() -> None:
+    import numpy as np
+    import pandas as pd
+
+    big = 1239162456494753670
+    df = pd.DataFrame(
+        {
+            "int64": np.array([-big, 1], dtype="int64"),
+            "uint64": np.array([2**64 - 1, 1], dtype="uint64"),
+            "nullable": pd.array([big, None], dtype="Int64"),
+            "object": [big, "foo"],
+            "float": [float(big), 1.5],
+        }
+    )
+
+    assert df_to_records(df) == [
+        {
+            "int64": str(-big),
+            "uint64": str(2**64 - 1),
+            "nullable": str(big),
+            "object": str(big),
+            "float": float(big),
+        },
+        {"int64": 1, "uint64": 1, "nullable": pd.NA, "object": "foo", "float": 1.5},
+    ]
+
+
+def test_df_to_columns() -> None:
+    import numpy as np
+    import pandas as pd
+
+    from superset.dataframe import df_to_columns
+    from superset.utils.core import json_int_dttm_ser
+
+    df = pd.DataFrame(
+        {
+            "a": ["a1", None],
+            "b": [1.5, np.nan],
+            "dttm": [Timestamp("2022-01-01 12:34:56.789"), None],
+            "dttm_tz": pd.to_datetime(["2022-01-01", None]).tz_localize("Asia/Tokyo"),
+        }
+    )
+    columns = df_to_columns(df)
+
+    assert columns["a"] == ["a1", None]
+    assert columns["b"][0] == 1.5 and np.isnan(columns["b"][1])
+    assert columns["dttm"][0] == json_int_dttm_ser(df["dttm"][0])
+    assert columns["dttm_tz"][0] == json_int_dttm_ser(df["dttm_tz"][0])
+    assert np.isnan(columns["dttm"][1]) and np.isnan(columns["dttm_tz"][1])
+
+
+def test_df_to_arrow_stream() -> None:
+    import pandas as pd
+    import pyarrow as pa
+
+    from superset.dataframe import df_to_arrow_stream
+
+    df = pd.DataFrame(
+        {
+            "a": ["a1", "a2", None],
+            "b": [1, 2, 3],
+            "mixed": [{"foo": 1}, 2, None],
+        }
+    )
+    table = pa.ipc.open_stream(df_to_arrow_stream(df)).read_all()
+
+    assert table.schema.types[:2] == [pa.string(), pa.int64()]
+    assert table.to_pydict() == {
+        "a": ["a1", "a2", None],
+        "b": [1, 2, 3],
+        "mixed": ["{'foo': 1}", "2", None],
+    }
+
+
 @pytest.mark.parametrize(
     "input_, expected",
     [
@@ -1151,3 +1151,274 @@ def test_quote_expressions(session: Session) -> None:
     assert dataset.expression == '"old dataset"'
     assert dataset.columns[0].expression == '"has space"'
     assert dataset.columns[1].expression == "no_need"
+
+
+def test_multi_dataset_filters_pushed_down(
+    mocker: MockFixture, session: Session
+) -> None:
+    """
+    Test that filters on multi dataset tables are applied before the join.
+    """
+    from superset.connectors.sqla.models import SqlaTable, TableColumn
+    from superset.models.core import Database
+
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+
+    sqla_table = SqlaTable(
+        table_name="tmp__orders__users__1234",
+        sql="SELECT a.id a_id, a.amount AS a_amount, b.name b_name "
+        "FROM orders a LEFT JOIN users b ON a.user_id=b.id",
+        columns=[
+            TableColumn(column_name="a_id", type="INTEGER"),
+            TableColumn(column_name="a_amount", type="INTEGER"),
+            TableColumn(column_name="b_name", type="TEXT"),
+        ],
+        metrics=[],
+        database=Database(database_name="my_database", sqlalchemy_uri="sqlite://"),
+    )
+    sql = sqla_table.get_query_str_extended(
+        {
+            "columns": ["b_name"],
+            "filter": [
+                {"col": "a_amount", "op": ">", "val": 10},
+                {"col": "b_name", "op": "IN", "val": ["foo", "bar"]},
+            ],
+            "extras": {"where": "a_id <> 0"},
+            "is_timeseries": False,
+            "metrics": [],
+            "row_limit": 100,
+        }
+    ).sql
+
+    inner_sql, _, outer_sql = sql.partition(") AS virtual_table")
+    assert "WHERE a.amount > 10 AND b.name IN ('foo', 'bar')" in inner_sql
+    assert "WHERE (a_id <> 0)" in outer_sql
+    assert "a_amount" not in outer_sql
+
+
+def test_multi_dataset_join_plan(mocker: MockFixture, session: Session) -> None:
+    """
+    Test that multi dataset tables with a join plan build the joining query from it.
+    """
+    from superset.connectors.sqla.join_plan import Join, JoinedTable, JoinPlan
+    from superset.connectors.sqla.models import SqlaTable, TableColumn
+    from superset.models.core import Database
+    from superset.utils.hashing import md5_sha_from_str
+
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+
+    join_plan = JoinPlan(
+        table=JoinedTable(
+            alias="a",
+            table_name="orders",
+            columns={"a_amount": "a.amount", "a_user_id": "a.user_id"},
+        ),
+        joins=[
+            Join(
+                join_type="INNER JOIN",
+                table=JoinedTable(
+                    alias="b", table_name="users", columns={"b_name": "b.name"}
+                ),
+                on=[("a.user_id", "b.id")],
+            )
+        ],
+    )
+    sql = "SELECT a.amount a_amount, a.user_id a_user_id, b.name b_name FROM orders a"
+    sqla_table = SqlaTable(
+        table_name="tmp__orders__users__1234",
+        sql=sql,
+        extra=json.dumps(
+            {
+                "join_plan": join_plan.to_dict(),
+                "join_plan_checksum": md5_sha_from_str(sql),
+            }
+        ),
+        columns=[
+            TableColumn(column_name="a_amount", type="INTEGER"),
+            TableColumn(column_name="a_user_id", type="INTEGER"),
+            TableColumn(column_name="b_name", type="TEXT"),
+        ],
+        metrics=[],
+        database=Database(database_name="my_database", sqlalchemy_uri="sqlite://"),
+    )
+    assert sqla_table.join_plan == join_plan
+    query_obj = {
+        "columns": ["b_name"],
+        "filter": [{"col": "a_amount", "op": ">", "val": 10}],
+        "is_timeseries": False,
+        "metrics": [],
+        "row_limit": 100,
+    }
+    sql = " ".join(sqla_table.get_query_str_extended(query_obj).sql.split())
+    assert (
+        "FROM orders AS a JOIN users AS b ON a.user_id = b.id "
+        "WHERE a.amount > 10) AS virtual_table"
+    ) in sql
+    # columns the chart doesn't reference aren't selected
+    assert "a_user_id" not in sql
+
+    # the join plan is ignored once the query of the table is edited
+    sqla_table.sql = f"{sqla_table.sql} JOIN users b ON a.user_id = b.id"
+    assert sqla_table.join_plan is None
+
+
+def test_multi_dataset_join_plan_series_limit(
+    mocker: MockFixture, session: Session
+) -> None:
+    """
+    Test that the series limit subquery is still joined once the joining query
+    of a multi dataset table is pruned.
+    """
+    from superset.connectors.sqla.join_plan import Join, JoinedTable, JoinPlan
+    from superset.connectors.sqla.models import SqlaTable, TableColumn
+    from superset.models.core import Database
+    from superset.utils.hashing import md5_sha_from_str
+
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+
+    join_plan = JoinPlan(
+        table=JoinedTable(
+            alias="a",
+            table_name="orders",
+            columns={"a_amount": "a.amount", "a_user_id": "a.user_id"},
+        ),
+        joins=[
+            Join(
+                join_type="LEFT JOIN",
+                table=JoinedTable(
+                    alias="b", table_name="users", columns={"b_name": "b.name"}
+                ),
+                on=[("a.user_id", "b.id")],
+            )
+        ],
+    )
+    sql = "SELECT a.amount a_amount, a.user_id a_user_id, b.name b_name FROM orders a"
+    sqla_table = SqlaTable(
+        table_name="tmp__orders__users__1234",
+        sql=sql,
+        extra=json.dumps(
+            {
+                "join_plan": join_plan.to_dict(),
+                "join_plan_checksum": md5_sha_from_str(sql),
+            }
+        ),
+        columns=[
+            TableColumn(column_name="a_amount", type="INTEGER"),
+            TableColumn(column_name="a_user_id", type="INTEGER"),
+            TableColumn(column_name="b_name", type="TEXT"),
+        ],
+        metrics=[],
+        database=Database(database_name="my_database", sqlalchemy_uri="sqlite://"),
+    )
+    query_obj = {
+        "columns": ["b_name"],
+        "filter": [],
+        "metrics": [
+            {
+                "expressionType": "SQL",
+                "sqlExpression": "SUM(a_amount)",
+                "label": "total",
+            }
+        ],
+        "is_timeseries": False,
+        "row_limit": 100,
+        "series_columns": ["b_name"],
+        "series_limit": 5,
+    }
+    sql = " ".join(sqla_table.get_query_str_extended(query_obj).sql.split())
+    assert (
+        "FROM orders AS a LEFT OUTER JOIN users AS b ON a.user_id = b.id) "
+        "AS virtual_table JOIN (SELECT b_name AS b_name__, SUM(a_amount) AS "
+        "mme_inner__"
+    ) in sql
+    assert "LIMIT 5" in sql
+    # the outer query is still pruned to the columns it references
+    outer_sql = sql.partition(") AS virtual_table JOIN")[0]
+    assert "a_user_id" not in outer_sql
+
+
+def test_multi_dataset_join_plan_virtual_dataset(
+    mocker: MockFixture, session: Session
+) -> None:
+    """
+    Test that the queries of the virtual datasets of a join plan are rendered
+    with the template processor.
+    """
+    from superset.connectors.sqla.join_plan import Join, JoinedTable, JoinPlan
+    from superset.connectors.sqla.models import SqlaTable, TableColumn
+    from superset.models.core import Database
+    from superset.utils.hashing import md5_sha_from_str
+
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    mocker.patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        {"ENABLE_TEMPLATE_PROCESSING": True},
+    )
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+
+    join_plan = JoinPlan(
+        table=JoinedTable(
+            alias="a",
+            table_name="orders",
+            columns={"a_amount": "a.amount", "a_user_id": "a.user_id"},
+        ),
+        joins=[
+            Join(
+                join_type="LEFT JOIN",
+                table=JoinedTable(
+                    alias="b",
+                    table_name="active_users",
+                    sql="SELECT * FROM users WHERE active = {{ 1 + 0 }}",
+                    columns={"b_name": "b.name"},
+                ),
+                on=[("a.user_id", "b.id")],
+            )
+        ],
+    )
+    sql = "SELECT a.amount a_amount, a.user_id a_user_id, b.name b_name FROM orders a"
+    sqla_table = SqlaTable(
+        table_name="tmp__orders__active_users__1234",
+        sql=sql,
+        extra=json.dumps(
+            {
+                "join_plan": join_plan.to_dict(),
+                "join_plan_checksum": md5_sha_from_str(sql),
+            }
+        ),
+        columns=[
+            TableColumn(column_name="a_amount", type="INTEGER"),
+            TableColumn(column_name="a_user_id", type="INTEGER"),
+            TableColumn(column_name="b_name", type="TEXT"),
+        ],
+        metrics=[],
+        database=Database(database_name="my_database", sqlalchemy_uri="sqlite://"),
+    )
+    query_obj = {
+        "columns": ["b_name"],
+        "filter": [{"col": "a_amount", "op": ">", "val": 10}],
+        "metrics": [],
+        "is_timeseries": False,
+        "row_limit": 100,
+    }
+    sql = " ".join(sqla_table.get_query_str_extended(query_obj).sql.split())
+    assert "(SELECT * FROM users WHERE active = 1) AS b" in sql
+    assert "{{" not in sql
@@ -17,8 +17,10 @@
 # pylint: disable=unused-argument, import-outside-toplevel, protected-access
 
 from textwrap import dedent
+from typing import Any, List, Optional
 
 import pytest
+from pytest_mock import MockFixture
 from sqlalchemy.types import TypeEngine
 
 
@@ -99,3 +101,45 @@ def test_cte_query_parsing(original: TypeEngine, expected: str) -> None:
 
     actual = BaseEngineSpec.get_cte_query(original)
     assert actual == expected
+
+
+def test_fetch_data_in_batches(mocker: MockFixture) -> None:
+    """
+    `fetch_data_in_batches` should fetch at most `batch_size` rows at a time and
+    stop when the cursor is exhausted or the limit is reached
+    """
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    rows = [(i,) for i in range(5)]
+    cursor = mocker.MagicMock()
+    cursor.fetchmany.side_effect = lambda size: [
+        rows.pop(0) for _ in range(min(size, len(rows)))
+    ]
+
+    assert list(BaseEngineSpec.fetch_data_in_batches(cursor, 2, limit=4)) == [
+        [(0,), (1,)],
+        [(2,), (3,)],
+    ]
+    assert list(BaseEngineSpec.fetch_data_in_batches(cursor, 2)) == [[(4,)]]
+
+
+def test_fetch_data_in_batches_fetch_data_override(mocker: MockFixture) -> None:
+    """
+    `fetch_data_in_batches` should fetch the rows with `fetch_data` when an engine
+    spec overrides it
+    """
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    class OverridingEngineSpec(BaseEngineSpec):
+        @classmethod
+        def fetch_data(cls, cursor: Any, limit: Optional[int] = None) -> List[Any]:
+            return [(row,) for row in cursor.rows[:limit]]
+
+    cursor = mocker.MagicMock(rows=list(range(5)))
+    assert list(OverridingEngineSpec.fetch_data_in_batches(cursor, 2, limit=3)) == [
+        [(0,), (1,)],
+        [(2,)],
+    ]
+    cursor.fetchmany.assert_not_called()
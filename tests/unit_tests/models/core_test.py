@@ -145,3 +145,36 @@ def test_get_db_engine_spec(mocker: MockFixture) -> None:
         ).db_engine_spec
         == OldDBEngineSpec
     )
+
+
+def test_get_sqla_engine_cache(mocker: MockFixture) -> None:
+    """
+    Tests that engines are cached, per schema, when the engine cache is enabled.
+    """
+    from sqlalchemy.pool import NullPool, QueuePool
+
+    from superset.models.core import Database
+    from superset.utils.engine_cache import engine_cache
+
+    mocker.patch(
+        "superset.db_engine_specs.sqlite.SqliteEngineSpec.allows_connection_pooling",
+        True,
+    )
+    database = Database(id=1, database_name="my_database", sqlalchemy_uri="sqlite://")
+
+    engine = database.get_sqla_engine()
+    assert isinstance(engine.pool, NullPool)
+    assert database.get_sqla_engine() is not engine
+
+    mocker.patch.dict(
+        "superset.models.core.config", {"SQLALCHEMY_ENGINE_CACHE_ENABLED": True}
+    )
+    engine = database.get_sqla_engine()
+    assert isinstance(engine.pool, QueuePool)
+    assert database.get_sqla_engine() is engine
+    assert database.get_sqla_engine(schema="other") is not engine
+
+    Database.invalidate_engine_cache(None, None, database)  # type: ignore
+    assert len(engine_cache) == 0
+    assert database.get_sqla_engine() is not engine
+    engine_cache.invalidate()
@@ -17,6 +17,8 @@
 
 # pylint: disable=import-outside-toplevel, unused-argument
 
+from pytest_mock import MockerFixture
+
 
 def test_column_names_as_bytes() -> None:
     """
@@ -65,3 +67,56 @@ def test_column_names_as_bytes() -> None:
 |  1 | 2016-01-27 | 392.444 | 396.843 | 391.782 | 394.972 |     394.972 | 47424400 |
     """.strip()
     )
+
+
+def test_rows_converted_in_batches(mocker: MockerFixture) -> None:
+    """
+    Test that rows are converted to Arrow a batch at a time.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+
+    mocker.patch.object(SupersetResultSet, "batch_size", 2)
+    data = [
+        (1, None, 1, {"foo": 1}),
+        (2, None, 2, None),
+        (3, "a", 2.5, "bar"),
+        (4, "b", 3, 4),
+        (5, None, None, None),
+    ]
+    description = [(name,) for name in ("int", "str", "num", "mixed")]
+    result_set = SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.table.column("int").num_chunks == 3
+    assert result_set.table.schema.types == [
+        pa.int64(),
+        pa.string(),
+        pa.float64(),
+        pa.string(),
+    ]
+    assert result_set.table.to_pydict() == {
+        "int": [1, 2, 3, 4, 5],
+        "str": [None, None, "a", "b", None],
+        "num": [1.0, 2.0, 2.5, 3.0, None],
+        "mixed": ['{"foo": 1}', "null", '"bar"', "4", "null"],
+    }
+
+
+def test_arrow_table() -> None:
+    """
+    Test that results fetched as an Arrow table are used as they are.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+
+    table = pa.table({"a": [1, 2], "b": [[1], [2, 3]]})
+    result_set = SupersetResultSet(table, None, BaseEngineSpec)  # type: ignore
+
+    assert result_set.table.column_names == ["a", "b"]
+    assert result_set.table.column("a") == table.column("a")
+    assert result_set.table.column("b").to_pylist() == ["[1]", "[2, 3]"]
+    assert result_set.columns[0]["type"] == "INT"
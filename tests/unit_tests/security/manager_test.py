@@ -0,0 +1,270 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, redefined-outer-name
+from typing import Any, Iterator
+
+import pytest
+from flask import current_app, g
+from flask_caching import Cache
+from pytest_mock import MockFixture
+from sqlalchemy.orm.session import Session
+
+
+@pytest.fixture
+def cache(mocker: MockFixture, app: Any) -> Iterator[Cache]:
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch("superset.extensions.cache_manager._cache", cache)
+    yield cache
+
+
+@pytest.fixture
+def query_rls_filters(mocker: MockFixture) -> Any:
+    from superset import security_manager
+
+    mocker.patch.object(
+        security_manager,
+        "get_user_roles",
+        return_value=[mocker.MagicMock(id=2), mocker.MagicMock(id=1)],
+    )
+    g.user = mocker.MagicMock()
+    g.pop("rls_filters_memo", None)
+    yield mocker.patch.object(
+        security_manager,
+        "_query_rls_filters",
+        return_value=[(1, None, "a = 1"), (2, "group", "b = 2")],
+    )
+    g.pop("rls_filters_memo", None)
+
+
+def test_get_rls_filters_memoized(
+    mocker: MockFixture, cache: Cache, query_rls_filters: Any
+) -> None:
+    """
+    RLS filters are fetched from the metadata database once per role set and table.
+    """
+    from superset import security_manager
+
+    table = mocker.MagicMock(id=10)
+    filters = security_manager.get_rls_filters(table)
+    assert [(f.id, f.group_key, f.clause) for f in filters] == [
+        (1, None, "a = 1"),
+        (2, "group", "b = 2"),
+    ]
+    assert security_manager.get_rls_filters(table) == filters
+    query_rls_filters.assert_called_once_with([1, 2], 10)
+
+    # a new request reads the filters from the cache
+    g.pop("rls_filters_memo")
+    assert security_manager.get_rls_filters(table) == filters
+    query_rls_filters.assert_called_once()
+
+    security_manager.get_rls_filters(mocker.MagicMock(id=11))
+    assert query_rls_filters.call_count == 2
+
+
+def test_get_rls_filters_invalidated(
+    mocker: MockFixture, session: Session, cache: Cache, query_rls_filters: Any
+) -> None:
+    """
+    Changing any RLS filter invalidates the cached filters once committed.
+    """
+    from superset import security_manager
+
+    table = mocker.MagicMock(id=10)
+    security_manager.get_rls_filters(table)
+    security_manager.on_rls_filter_after_change(
+        mocker.MagicMock(), mocker.MagicMock(), object()
+    )
+    # not committed yet, the cached filters are still used
+    security_manager.get_rls_filters(table)
+    assert query_rls_filters.call_count == 1
+
+    session.commit()
+    security_manager.get_rls_filters(table)
+    assert query_rls_filters.call_count == 2
+
+
+def test_get_rls_filters_rolled_back(
+    mocker: MockFixture, session: Session, cache: Cache, query_rls_filters: Any
+) -> None:
+    """
+    Changes that are rolled back don't invalidate the cached filters.
+    """
+    from superset import security_manager
+
+    table = mocker.MagicMock(id=10)
+    security_manager.get_rls_filters(table)
+    session.begin()
+    security_manager.on_rls_filter_after_change(
+        mocker.MagicMock(), mocker.MagicMock(), object()
+    )
+    session.rollback()
+    session.commit()
+    security_manager.get_rls_filters(table)
+    assert query_rls_filters.call_count == 1
+
+
+def test_get_rls_filters_version_evicted(
+    mocker: MockFixture, cache: Cache, query_rls_filters: Any
+) -> None:
+    """
+    A missing version is initialized rather than becoming part of the key.
+    """
+    from superset import security_manager
+
+    table = mocker.MagicMock(id=10)
+    security_manager.get_rls_filters(table)
+    version = cache.get("rls_filters/version")
+    assert version is not None
+    assert cache.get(f"rls_filters/{version}/10/1,2") is not None
+    assert cache.get("rls_filters/None/10/1,2") is None
+
+    # the filters aren't cached if the backend doesn't keep the version
+    mocker.patch.object(cache, "add")
+    cache.delete("rls_filters/version")
+    g.pop("rls_filters_memo")
+    security_manager.get_rls_filters(table)
+    assert query_rls_filters.call_count == 2
+    assert cache.get("rls_filters/None/10/1,2") is None
+
+
+@pytest.fixture
+def query_permissions(mocker: MockFixture) -> Any:
+    from superset import security_manager
+
+    mocker.patch.dict(current_app.config, {"PERMISSIONS_CACHE_TIMEOUT": 600})
+    g.pop("permissions_memo", None)
+    yield mocker.patch.object(
+        security_manager,
+        "_query_permissions",
+        return_value=[
+            mocker.MagicMock(permission_name="can_read", view_menu_name="Chart"),
+            mocker.MagicMock(
+                permission_name="datasource_access", view_menu_name="[db].[t](id:1)"
+            ),
+        ],
+    )
+    g.pop("permissions_memo", None)
+
+
+def test_has_view_access_snapshot(
+    mocker: MockFixture, cache: Cache, query_permissions: Any
+) -> None:
+    """
+    Access checks are served from a single permission snapshot per role set.
+    """
+    from superset import security_manager
+
+    user = mocker.MagicMock(
+        roles=[mocker.MagicMock(id=2), mocker.MagicMock(id=1)],
+    )
+    assert security_manager._has_view_access(user, "can_read", "Chart")
+    assert not security_manager._has_view_access(user, "can_write", "Chart")
+    query_permissions.assert_called_once_with([1, 2])
+
+    # a new request reads the snapshot from the cache
+    g.pop("permissions_memo")
+    assert security_manager._has_view_access(user, "can_read", "Chart")
+    query_permissions.assert_called_once()
+
+    assert not security_manager._has_view_access(
+        mocker.MagicMock(roles=[]), "can_read", "Chart"
+    )
+    query_permissions.assert_called_once()
+
+
+def test_has_view_access_snapshot_not_cached(
+    mocker: MockFixture, cache: Cache, query_permissions: Any
+) -> None:
+    """
+    Snapshots are only cached across requests if a timeout is set.
+    """
+    from superset import security_manager
+
+    mocker.patch.dict(current_app.config, {"PERMISSIONS_CACHE_TIMEOUT": None})
+    user = mocker.MagicMock(roles=[mocker.MagicMock(id=1)])
+    assert security_manager._has_view_access(user, "can_read", "Chart")
+    assert security_manager._has_view_access(user, "can_read", "Chart")
+    query_permissions.assert_called_once_with([1])
+
+    g.pop("permissions_memo")
+    assert security_manager._has_view_access(user, "can_read", "Chart")
+    assert query_permissions.call_count == 2
+    assert cache.get("permissions/version") is None
+
+
+def test_user_view_menu_names_snapshot(
+    mocker: MockFixture, cache: Cache, query_permissions: Any
+) -> None:
+    from superset import security_manager
+
+    mocker.patch("superset.security.manager.get_user_id", return_value=1)
+    g.user = mocker.MagicMock(is_anonymous=False, roles=[mocker.MagicMock(id=1)])
+    assert security_manager.user_view_menu_names("datasource_access") == {
+        "[db].[t](id:1)"
+    }
+    assert security_manager.user_view_menu_names("schema_access") == set()
+    query_permissions.assert_called_once_with([1])
+
+
+def test_permissions_snapshot_invalidated(
+    mocker: MockFixture, session: Session, cache: Cache, query_permissions: Any
+) -> None:
+    """
+    Changing a role invalidates the permission snapshots once committed.
+    """
+    from flask_appbuilder.security.sqla.models import Role
+
+    from superset import security_manager
+
+    Role.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    role = Role(name="role")
+    session.add(role)
+    session.commit()
+
+    security_manager.get_permissions_snapshot([1])
+    role.name = "renamed"
+    session.flush()
+    security_manager.get_permissions_snapshot([1])
+    assert query_permissions.call_count == 1
+
+    session.commit()
+    security_manager.get_permissions_snapshot([1])
+    assert query_permissions.call_count == 2
+
+
+def test_permissions_snapshot_hooks(
+    mocker: MockFixture, session: Session, cache: Cache, query_permissions: Any
+) -> None:
+    """
+    The hooks of the security manager, which custom security managers override,
+    don't take part in the invalidation of the permission snapshots.
+    """
+    from superset import security_manager
+
+    security_manager.get_permissions_snapshot([1])
+    for hook in (
+        security_manager.on_role_after_update,
+        security_manager.on_permission_view_after_insert,
+        security_manager.on_permission_view_after_delete,
+    ):
+        hook(mocker.MagicMock(), mocker.MagicMock(), object())
+        session.commit()
+        g.pop("permissions_memo")
+        security_manager.get_permissions_snapshot([1])
+
+    query_permissions.assert_called_once()
@@ -16,6 +16,10 @@
 # under the License.
 # pylint: disable=import-outside-toplevel, invalid-name, unused-argument, too-many-locals
 
+import json
+from typing import Any, Dict, Optional
+
+import pytest
 import sqlparse
 from pytest_mock import MockerFixture
 from sqlalchemy.orm.session import Session
@@ -64,6 +68,294 @@ def test_execute_sql_statement(mocker: MockerFixture, app: None) -> None:
     SupersetResultSet.assert_called_with([(42,)], cursor.description, db_engine_spec)
 
 
+def test_execute_sql_statement_first_batch(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that `execute_sql_statement` hands over the first batch of rows early.
+    """
+    from superset.sql_lab import execute_sql_statement
+
+    query = mocker.MagicMock()
+    query.limit = 3
+    query.select_as_cta_used = False
+    database = query.database
+    database.allow_dml = False
+    db_engine_spec = database.db_engine_spec
+    db_engine_spec.is_select_query.return_value = True
+    db_engine_spec.fetch_data_in_batches.return_value = iter(
+        [[(1,), (2,)], [(3,), (4,)]]
+    )
+
+    cursor = mocker.MagicMock()
+    SupersetResultSet = mocker.patch("superset.sql_lab.SupersetResultSet")
+    mocker.patch("superset.sql_lab.SQL_QUERY_MUTATOR", return_value="SELECT 1")
+    mocker.patch.dict("superset.sql_lab.config", {"SQLLAB_RESULTS_FETCH_BATCH_SIZE": 2})
+    on_first_batch = mocker.MagicMock()
+
+    execute_sql_statement(
+        "SELECT 1",
+        query,
+        session=mocker.MagicMock(),
+        cursor=cursor,
+        log_params={},
+        apply_ctas=False,
+        on_first_batch=on_first_batch,
+    )
+
+    db_engine_spec.fetch_data_in_batches.assert_called_with(cursor, 2, 4)
+    db_engine_spec.fetch_data.assert_not_called()
+    assert SupersetResultSet.call_args_list == [
+        mocker.call([(1,), (2,)], cursor.description, db_engine_spec),
+        mocker.call([(1,), (2,), (3,)], cursor.description, db_engine_spec),
+    ]
+    on_first_batch.assert_called_once_with(SupersetResultSet.return_value)
+
+
+@pytest.mark.parametrize("use_msgpack", [True, False])
+def test_paged_results(mocker: MockerFixture, app: None, use_msgpack: bool) -> None:
+    """
+    Test that results stored as pages are read a page at a time.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sql_lab import _serialize_and_expand_data, _store_paged_results
+    from superset.utils.core import zlib_decompress
+    from superset.views.utils import _deserialize_results_payload, iter_results_pages
+
+    blobs = {}
+    results_backend = mocker.MagicMock()
+    results_backend.set.side_effect = lambda key, value, _: blobs.update({key: value})
+    results_backend.get.side_effect = blobs.get
+    mocker.patch("superset.sql_lab.results_backend", results_backend)
+    mocker.patch("superset.views.utils.results_backend", results_backend)
+    mocker.patch("superset.sql_lab.results_backend_use_msgpack", use_msgpack)
+
+    result_set = SupersetResultSet(
+        [(i, f"name{i}") for i in range(10)],
+        [("id",), ("name",)],  # type: ignore
+        BaseEngineSpec,
+    )
+    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
+        result_set, BaseEngineSpec, use_msgpack  # type: ignore
+    )
+    payload = {
+        "status": "success",
+        "data": data,
+        "columns": all_columns,
+        "selected_columns": selected_columns,
+        "expanded_columns": expanded_columns,
+    }
+    _store_paged_results("key", payload, result_set, mocker.MagicMock(), 4)
+    assert sorted(blobs) == ["key", "key-0", "key-1", "key-2"]
+
+    query = mocker.MagicMock()
+    query.database.db_engine_spec = BaseEngineSpec
+    manifest = zlib_decompress(blobs["key"], decode=not use_msgpack)
+    results_backend.get.reset_mock()
+    obj = _deserialize_results_payload(manifest, query, use_msgpack, 5, 2)
+    assert obj["data"] == [{"id": 5, "name": "name5"}, {"id": 6, "name": "name6"}]
+    assert obj["pages"]["rows"] == 10
+    results_backend.get.assert_called_once_with("key-1")
+
+    obj = _deserialize_results_payload(manifest, query, use_msgpack)
+    assert [row["id"] for row in obj["data"]] == list(range(10))
+    assert [len(page) for page in iter_results_pages(obj, use_msgpack, 3)] == [1, 4, 2]
+
+
+def mock_results_backend(
+    mocker: MockerFixture, use_msgpack: bool = False
+) -> Dict[str, Any]:
+    """
+    Mock the results backend with a dictionary.
+    """
+    blobs: Dict[str, Any] = {}
+    results_backend = mocker.MagicMock()
+    results_backend.set.side_effect = lambda key, value, _: blobs.update({key: value})
+    results_backend.get.side_effect = blobs.get
+    results_backend.delete.side_effect = blobs.pop
+    mocker.patch("superset.sql_lab.results_backend", results_backend)
+    mocker.patch("superset.views.utils.results_backend", results_backend)
+    mocker.patch("superset.sql_lab.results_backend_use_msgpack", use_msgpack)
+    return blobs
+
+
+def mock_query(mocker: MockerFixture) -> Any:
+    """
+    Mock a SQL Lab query on a database using ``BaseEngineSpec``.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    query = mocker.MagicMock()
+    query.id = 1
+    query.results_key = None
+    query.select_as_cta = False
+    query.to_dict.side_effect = lambda: {"id": 1}
+    query.database.allow_run_async = True
+    query.database.db_engine_spec = BaseEngineSpec
+    mocker.patch("superset.sql_lab.get_query", return_value=query)
+    return query
+
+
+def execute_first_batch(
+    mocker: MockerFixture, side_effect: Optional[Exception] = None
+) -> Any:
+    """
+    Mock ``execute_sql_statement`` to store a first batch of rows before returning
+    the results, or raising ``side_effect``.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+
+    description = [("id", "INTEGER")]
+    first_batch = SupersetResultSet([(1,)], description, BaseEngineSpec)  # type: ignore
+    result_set = SupersetResultSet(
+        [(1,), (2,)], description, BaseEngineSpec  # type: ignore
+    )
+
+    def execute_sql_statement(*args: Any) -> SupersetResultSet:
+        on_first_batch = args[-1]
+        on_first_batch(first_batch)
+        if side_effect:
+            raise side_effect
+        return result_set
+
+    return mocker.patch(
+        "superset.sql_lab.execute_sql_statement", side_effect=execute_sql_statement
+    )
+
+
+def test_store_first_batch(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that `_store_first_batch` stores the rows of a running query.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sql_lab import _store_first_batch
+    from superset.utils.core import QueryStatus, zlib_decompress
+
+    blobs = mock_results_backend(mocker)
+    query = mock_query(mocker)
+    session = mocker.MagicMock()
+    result_set = SupersetResultSet(
+        [(1,), (2,)], [("id", "INTEGER")], BaseEngineSpec  # type: ignore
+    )
+
+    _store_first_batch(query, session, False, result_set)
+
+    assert list(blobs) == [query.results_key]
+    payload = json.loads(zlib_decompress(blobs[query.results_key]))
+    assert payload["status"] == QueryStatus.RUNNING
+    assert payload["data"] == [{"id": 1}, {"id": 2}]
+    assert payload["query"]["resultsKey"] == query.results_key
+    session.commit.assert_called_once()
+
+
+def test_execute_sql_statements_first_batch(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that the results of a query replace its first batch of rows.
+    """
+    from superset.sql_lab import execute_sql_statements
+    from superset.utils.core import QueryStatus, zlib_decompress
+
+    blobs = mock_results_backend(mocker)
+    query = mock_query(mocker)
+    mocker.patch.dict("superset.sql_lab.config", {"SQLLAB_RESULTS_PAGE_SIZE": None})
+    execute_sql_statement = execute_first_batch(mocker)
+
+    execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT id FROM users",
+        return_results=False,
+        store_results=True,
+        session=mocker.MagicMock(),
+        start_time=None,
+        expand_data=False,
+        log_params=None,
+    )
+
+    execute_sql_statement.assert_called_once()
+    assert list(blobs) == [query.results_key]
+    payload = json.loads(zlib_decompress(blobs[query.results_key]))
+    assert payload["status"] == QueryStatus.SUCCESS
+    assert payload["data"] == [{"id": 1}, {"id": 2}]
+    assert payload["query"]["resultsKey"] == query.results_key
+
+
+@pytest.mark.parametrize("stopped", [True, False])
+def test_execute_sql_statements_discard_first_batch(
+    mocker: MockerFixture, app: None, stopped: bool
+) -> None:
+    """
+    Test that the first batch of rows of a query that doesn't complete is removed.
+    """
+    from superset.sql_lab import execute_sql_statements, SqlLabQueryStoppedException
+    from superset.utils.core import QueryStatus
+
+    blobs = mock_results_backend(mocker)
+    query = mock_query(mocker)
+    execute_first_batch(
+        mocker, SqlLabQueryStoppedException() if stopped else Exception("Error")
+    )
+
+    payload = execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT id FROM users",
+        return_results=False,
+        store_results=True,
+        session=mocker.MagicMock(),
+        start_time=None,
+        expand_data=False,
+        log_params=None,
+    )
+
+    assert payload["status"] == (  # type: ignore
+        QueryStatus.STOPPED if stopped else QueryStatus.FAILED
+    )
+    assert blobs == {}
+    assert query.results_key is None
+
+
+def test_execute_sql_statements_discard_first_batch_store_failure(
+    mocker: MockerFixture, app: None
+) -> None:
+    """
+    Test that the first batch of rows is removed when the results can't be stored.
+    """
+    from superset.sql_lab import _store_results, execute_sql_statements
+    from superset.utils.core import QueryStatus
+
+    blobs = mock_results_backend(mocker)
+    query = mock_query(mocker)
+    mocker.patch.dict("superset.sql_lab.config", {"SQLLAB_RESULTS_PAGE_SIZE": None})
+    execute_first_batch(mocker)
+
+    def store_first_batch_only(
+        key: str, payload: Dict[str, Any], database: Any
+    ) -> None:
+        if payload["status"] == QueryStatus.SUCCESS:
+            raise Exception("Results backend is full")
+        _store_results(key, payload, database)
+
+    store_results = mocker.patch(
+        "superset.sql_lab._store_results", side_effect=store_first_batch_only
+    )
+
+    with pytest.raises(Exception, match="Results backend is full"):
+        execute_sql_statements(
+            query_id=1,
+            rendered_query="SELECT id FROM users",
+            return_results=False,
+            store_results=True,
+            session=mocker.MagicMock(),
+            start_time=None,
+            expand_data=False,
+            log_params=None,
+        )
+
+    assert store_results.call_count == 2
+    assert blobs == {}
+    assert query.results_key is None
+
+
 def test_execute_sql_statement_with_rls(
     mocker: MockerFixture,
 ) -> None:
@@ -231,3 +523,47 @@ def test_sql_lab_insert_rls(
         sqlparse.format(query.executed_sql, strip_comments=True).strip()
         == "SELECT c FROM t WHERE (t.c > 5)\nLIMIT 6"
     )
+
+
+def test_execute_sql_statements_paged_arrow_results(
+    mocker: MockerFixture, app: None
+) -> None:
+    """
+    Test that the arrow table of results stored as pages is only serialized a page
+    at a time.
+    """
+    from superset import sql_lab
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sql_lab import execute_sql_statements
+    from superset.utils.core import zlib_decompress
+    from superset.views.utils import _deserialize_results_payload
+
+    blobs = mock_results_backend(mocker, use_msgpack=True)
+    query = mock_query(mocker)
+    mocker.patch.dict("superset.sql_lab.config", {"SQLLAB_RESULTS_PAGE_SIZE": 2})
+    mocker.patch(
+        "superset.sql_lab.execute_sql_statement",
+        return_value=SupersetResultSet(
+            [(1,), (2,), (3,)], [("id", "INTEGER")], BaseEngineSpec  # type: ignore
+        ),
+    )
+    serialize_and_expand_data = mocker.spy(sql_lab, "_serialize_and_expand_data")
+
+    execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT id FROM users",
+        return_results=False,
+        store_results=True,
+        session=mocker.MagicMock(),
+        start_time=None,
+        expand_data=False,
+        log_params=None,
+    )
+
+    serialize_and_expand_data.assert_not_called()
+    key = query.results_key
+    assert sorted(blobs) == [key, f"{key}-0", f"{key}-1"]
+    manifest = zlib_decompress(blobs[key], decode=False)
+    obj = _deserialize_results_payload(manifest, query, True)
+    assert obj["data"] == [{"id": 1}, {"id": 2}, {"id": 3}]
@@ -29,6 +29,7 @@ from sqlparse.tokens import Name
 from superset.exceptions import QueryClauseValidationException
 from superset.sql_parse import (
     add_table_name,
+    extract_column_aliases,
     extract_table_references,
     get_rls_for_table,
     has_table_query,
@@ -1065,6 +1066,49 @@ def test_get_query_with_new_limit_upper() -> None:
     )
 
 
+def test_get_query_with_new_limit_shared_parse() -> None:
+    """
+    Test that updating the limit doesn't change the cached parsed statement.
+    """
+    sql = "SELECT * FROM birth_names LIMIT 2000"
+    assert ParsedQuery(sql).set_or_update_query_limit(1000) == (
+        "SELECT * FROM birth_names LIMIT 1000"
+    )
+    query = ParsedQuery(sql)
+    assert query.limit == 2000
+    assert query.set_or_update_query_limit(3000) == sql
+
+
+def test_parse_cache(mocker: MockerFixture) -> None:
+    """
+    Test that a statement is parsed once across instances.
+    """
+    parse = mocker.patch("superset.sql_parse.sqlparse.parse", wraps=sqlparse.parse)
+    sql = "SELECT * FROM parse_cache_table LIMIT 10"
+    assert ParsedQuery(sql).limit == 10
+    assert ParsedQuery(sql).tables == {Table("parse_cache_table")}
+    assert ParsedQuery(f"{sql};").is_select()
+    parse.assert_called_once_with(sql)
+
+
+def test_extract_column_aliases() -> None:
+    """
+    Test the extraction of the aliased column expressions of a statement.
+    """
+    assert extract_column_aliases(
+        "SELECT a.id a_id, a.amount AS a_amount, CASE WHEN b.x = 1 THEN 2 END b_x, "
+        "b.y FROM a LEFT JOIN b ON a.id=b.id"
+    ) == {
+        "a_id": "a.id",
+        "a_amount": "a.amount",
+        "b_x": "CASE WHEN b.x = 1 THEN 2 END",
+    }
+    assert extract_column_aliases("SELECT a.id a_id FROM a WHERE 1=2") is None
+    assert extract_column_aliases("SELECT a.id a_id FROM a GROUP BY a.id") is None
+    assert extract_column_aliases("SELECT 1 a; SELECT 2 b") is None
+    assert extract_column_aliases("UPDATE a SET x = 1") is None
+
+
 def test_basic_breakdown_statements() -> None:
     """
     Test that multiple statements are parsed correctly.
@@ -16,7 +16,11 @@
 # specific language governing permissions and limitations
 # under the License.
 
-# pylint: disable=import-outside-toplevel, unused-argument
+# pylint: disable=import-outside-toplevel, protected-access, unused-argument
+
+import threading
+import time
+from typing import List
 
 from pytest_mock import MockerFixture
 
@@ -50,3 +54,103 @@ def test_memoized_func(mocker: MockerFixture) -> None:
     cache.get.return_value = 43
     result = decorated(self, "public", cache=True)
     assert result == 43
+
+
+def test_memoized_func_single_flight(mocker: MockerFixture) -> None:
+    """
+    Test that concurrent cache misses of ``memoized_func`` compute the value once.
+    """
+    from flask import current_app
+    from flask_caching import Cache
+
+    from superset.utils.cache import memoized_func
+
+    mocker.patch.dict(
+        "superset.utils.cache.config",
+        {"CACHE_SINGLE_FLIGHT": True, "CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0.01},
+    )
+    cache = Cache(
+        current_app._get_current_object(), config={"CACHE_TYPE": "SimpleCache"}
+    )
+    calls = []
+
+    def get_tables(schema: str, cache: bool = False) -> List[str]:
+        calls.append(schema)
+        time.sleep(0.1)
+        return ["table"]
+
+    decorated = memoized_func("schema:{schema}:table_list", cache)(get_tables)
+    threads = [
+        threading.Thread(target=decorated, args=("public",), kwargs={"cache": True})
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["public"]
+    assert cache.get("schema:public:table_list") == ["table"]
+    # the lock is released
+    assert cache.get("schema:public:table_list__single_flight") is None
+
+
+def test_single_flight_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that workers stop waiting for a value that isn't cached in time.
+    """
+    from flask import current_app
+    from flask_caching import Cache
+
+    from superset.utils.cache import single_flight
+
+    mocker.patch.dict(
+        "superset.utils.cache.config",
+        {
+            "CACHE_SINGLE_FLIGHT": True,
+            "CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT": 0.05,
+            "CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0.01,
+        },
+    )
+    cache = Cache(
+        current_app._get_current_object(), config={"CACHE_TYPE": "SimpleCache"}
+    )
+
+    # the lock is held by another worker
+    with single_flight(cache, "key", lambda: cache.get("key")) as value:
+        assert value is None
+        with single_flight(cache, "key", lambda: cache.get("key")) as value:
+            assert value is None
+        cache.set("key", 42)
+
+    # the value is cached while waiting
+    cache.delete("key")
+    cache.add("key__single_flight", "token")
+    threading.Timer(0.02, lambda: cache.set("key", 42)).start()
+    with single_flight(cache, "key", lambda: cache.get("key")) as value:
+        assert value == 42
+
+
+def test_single_flight_lock_not_deleted_while_waiting(mocker: MockerFixture) -> None:
+    """
+    Test that waiting workers don't delete a lock that may be held by another worker.
+    """
+    from superset.utils.cache import single_flight
+
+    mocker.patch.dict(
+        "superset.utils.cache.config",
+        {
+            "CACHE_SINGLE_FLIGHT": True,
+            "CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT": 0.05,
+            "CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0.01,
+        },
+    )
+    # the lock is released, then acquired by another worker, between polls
+    cache = mocker.MagicMock()
+    cache.add.return_value = False
+    cache.get.return_value = None
+
+    with single_flight(cache, "key", lambda: None) as value:
+        assert value is None
+
+    cache.delete.assert_not_called()
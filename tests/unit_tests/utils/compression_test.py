@@ -0,0 +1,60 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import zlib
+
+import pytest
+
+from superset.utils.compression import compress, decompress, get_codec
+from superset.utils.core import zlib_compress
+
+PAYLOAD = '{"data": [' + ", ".join(f'{{"id": {i}}}' for i in range(1000)) + "]}"
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lz4", "zstd", "none"])
+def test_compress_roundtrip(codec: str) -> None:
+    blob = compress(PAYLOAD, codec=codec)
+    assert get_codec(blob) == codec
+    assert decompress(blob) == PAYLOAD
+    assert decompress(blob, decode=False) == PAYLOAD.encode("utf-8")
+    if codec != "none":
+        assert len(blob) < len(PAYLOAD)
+
+
+def test_compress_zlib_is_backward_compatible() -> None:
+    # zlib payloads are bare zlib streams, readable by older versions
+    assert zlib.decompress(compress(PAYLOAD)) == PAYLOAD.encode("utf-8")
+    # and payloads written by older versions are still readable
+    assert decompress(zlib_compress(PAYLOAD)) == PAYLOAD
+
+
+def test_compress_min_size() -> None:
+    blob = compress("tiny", codec="zstd", min_size=16)
+    assert get_codec(blob) == "none"
+    assert decompress(blob) == "tiny"
+    assert get_codec(compress(PAYLOAD, codec="zstd", min_size=16)) == "zstd"
+
+
+def test_compress_level() -> None:
+    assert decompress(compress(PAYLOAD, codec="zstd", level=19)) == PAYLOAD
+    assert decompress(compress(PAYLOAD, codec="zlib", level=1)) == PAYLOAD
+    # LZ4 doesn't have levels
+    assert compress(PAYLOAD, codec="lz4", level=9) == compress(PAYLOAD, codec="lz4")
+
+
+def test_compress_unknown_codec() -> None:
+    with pytest.raises(ValueError, match="Unknown compression codec"):
+        compress(PAYLOAD, codec="brotli")
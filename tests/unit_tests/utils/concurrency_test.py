@@ -0,0 +1,125 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=protected-access
+import threading
+import time
+from typing import List
+
+import pytest
+from flask import current_app, g
+
+from superset.utils.concurrency import (
+    database_slot,
+    in_worker,
+    run_concurrently,
+    runs_concurrently,
+)
+
+
+def test_run_concurrently_keeps_order() -> None:
+    def task(i: int) -> int:
+        time.sleep(0.01 * (5 - i))
+        return i
+
+    assert run_concurrently(
+        [lambda i=i: task(i) for i in range(5)], max_workers=5
+    ) == list(range(5))
+
+
+def test_run_concurrently_copies_context() -> None:
+    g.user = "admin"
+    app = current_app._get_current_object()
+
+    def task() -> str:
+        assert in_worker()
+        assert current_app._get_current_object() is app
+        return g.user
+
+    assert run_concurrently([task, task], max_workers=2) == ["admin", "admin"]
+    assert not in_worker()
+
+
+def test_run_concurrently_raises_first_error() -> None:
+    done: List[int] = []
+
+    def fail(message: str) -> None:
+        raise ValueError(message)
+
+    def succeed() -> None:
+        time.sleep(0.05)
+        done.append(1)
+
+    with pytest.raises(ValueError, match="first"):
+        run_concurrently(
+            [succeed, lambda: fail("first"), lambda: fail("second")], max_workers=3
+        )
+    # all the tasks ran to completion before raising
+    assert done == [1]
+
+
+def test_run_concurrently_database_limit() -> None:
+    lock = threading.Lock()
+    running: List[int] = [0]
+    peak: List[int] = [0]
+
+    def task() -> None:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    run_concurrently(
+        [task] * 6, max_workers=6, database_id="limit_test", max_per_database=2
+    )
+    assert peak[0] == 2
+
+
+def test_run_concurrently_nested_runs_serially() -> None:
+    def outer() -> List[str]:
+        return run_concurrently(
+            [lambda: threading.current_thread().name] * 3, max_workers=3
+        )
+
+    for names in run_concurrently([outer, outer], max_workers=2):
+        assert len(set(names)) == 1
+
+
+def test_runs_concurrently() -> None:
+    assert runs_concurrently(2, max_workers=2)
+    assert not runs_concurrently(1, max_workers=2)
+    assert not runs_concurrently(2, max_workers=1)
+    # workers never start a pool of their own
+    results = run_concurrently([lambda: runs_concurrently(2, max_workers=2)] * 2, 2)
+    assert results == [False, False]
+
+
+def test_database_slot_limit_change() -> None:
+    # the slots of a database are sized by the limit they're used with
+    with database_slot("limit_change_test", 1):
+        with database_slot("limit_change_test", 2):
+            acquired = threading.Event()
+
+            def task() -> None:
+                with database_slot("limit_change_test", 2):
+                    acquired.set()
+
+            thread = threading.Thread(target=task)
+            thread.start()
+            assert acquired.wait(timeout=1)
+            thread.join()